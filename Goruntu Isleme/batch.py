@@ -0,0 +1,173 @@
+# Toplu görüntü işleme komut satırı aracı
+#
+# Bir dosya desenine uyan tüm görüntülere sıralı bir işlem zinciri uygular ve
+# sonuçları çıktı klasörüne yazar. Her dosya bir süreç havuzunda okunur,
+# işlenir ve kodlanır; farklı dosyaların okuma, işleme ve kodlama aşamaları
+# böylece birbiriyle örtüşür.
+#
+# Örnek:
+#   python batch.py "taramalar/**/*.jpg" -o cikti \
+#       -s grayscale -s "gaussian_filter:ksize=5" \
+#       -s "frequency_filter:filter_type=hpf,color_mode=rgb"
+#   python batch.py "taramalar/*.tif" -o cikti --recipe tarif.json
+import argparse
+import ast
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+STAGES = ("decode", "process", "encode")
+
+
+def parse_step(spec):
+    # "isim:anahtar=değer,anahtar=değer" -> ("isim", {anahtar: değer})
+    name, _, args = spec.partition(":")
+    params = {}
+    for item in filter(None, (a.strip() for a in args.split(","))):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Geçersiz parametre '{item}' (anahtar=değer bekleniyor)")
+        try:
+            params[key.strip()] = ast.literal_eval(value.strip())
+        except (ValueError, SyntaxError):
+            params[key.strip()] = value.strip()
+    return name.strip(), params
+
+
+def _init_worker(convolution_model):
+    # Süreçler zaten paralel çalışır; kütüphane içi iş parçacıkları çekirdekleri
+    # gereksiz yere paylaşmasın. Evrişim maliyet modeli ana süreçte bir kez
+    # bulunur; süreçler kendi ölçümlerini yapıp birbirini yavaşlatmasın
+    import cv2
+    import convolution
+    import frequency
+    cv2.setNumThreads(1)
+    frequency.FFT_WORKERS = 1
+    convolution.CALIBRATE = False
+    convolution.use_model(convolution_model)
+
+
+def process_file(job):
+    src, dst, recipe, grayscale = job
+    from image_io import read_image, write_image
+
+    timings = dict.fromkeys(STAGES, 0.0)
+    try:
+        start = time.perf_counter()
+        image = read_image(src, grayscale)
+        timings["decode"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        image, _ = recipe.replay(image)
+        timings["process"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+        # Görüntü bu süreçte başka yerde kullanılmıyor; kanallar yerinde değişir
+        write_image(dst, image, gray=recipe.is_gray(grayscale), owned=True)
+        timings["encode"] = time.perf_counter() - start
+        return src, timings, None
+    except Exception as e:
+        return src, timings, str(e)
+
+
+def build_jobs(pattern, output_dir, recipe, ext=None, grayscale=False):
+    files = sorted(f for f in glob.glob(pattern, recursive=True) if os.path.isfile(f))
+    if not files:
+        return []
+    # Alt klasör yapısını koru; farklı klasörlerdeki aynı isimli dosyalar çakışmasın
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in files])
+    jobs = []
+    for f in files:
+        rel = os.path.relpath(os.path.abspath(f), root)
+        if ext:
+            rel = os.path.splitext(rel)[0] + "." + ext.lstrip(".")
+        jobs.append((f, os.path.join(output_dir, rel), recipe, grayscale))
+    return jobs
+
+
+def run(jobs, workers=None, progress=True):
+    import convolution
+
+    totals = dict.fromkeys(STAGES, 0.0)
+    failures = []
+    done = 0
+    start = time.perf_counter()
+    chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 8))
+    # Kayıtlı model yoksa ölçüm burada, süreçler başlamadan bir kez yapılır
+    convolution_model = convolution.model()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(convolution_model,)) as pool:
+        for src, timings, error in pool.map(process_file, jobs, chunksize=chunksize):
+            done += 1
+            for stage in STAGES:
+                totals[stage] += timings[stage]
+            if error:
+                failures.append((src, error))
+            if progress and (done % 50 == 0 or done == len(jobs)):
+                print(f"\r{done}/{len(jobs)} görüntü", end="", file=sys.stderr, flush=True)
+    if progress:
+        print(file=sys.stderr)
+    return time.perf_counter() - start, totals, failures
+
+
+def print_report(count, elapsed, totals, failures):
+    succeeded = count - len(failures)
+    print(f"{succeeded}/{count} görüntü {elapsed:.2f} sn içinde işlendi "
+          f"({succeeded / elapsed if elapsed else 0:.1f} görüntü/sn)")
+    for stage in STAGES:
+        mean = totals[stage] / count * 1000 if count else 0
+        print(f"  {stage:<8} toplam {totals[stage]:8.2f} sn   görüntü başına {mean:8.1f} ms")
+    for src, error in failures:
+        print(f"  HATA {src}: {error}")
+
+
+def main(argv=None):
+    import operations
+    from recipe import Recipe
+
+    parser = argparse.ArgumentParser(
+        description="Bir görüntü klasörüne sıralı işlem zinciri uygular.")
+    parser.add_argument("pattern", nargs="?",
+                        help="girdi dosya deseni, ör. 'resimler/**/*.png'")
+    parser.add_argument("-o", "--output", default="cikti", help="çıktı klasörü")
+    parser.add_argument("-s", "--step", action="append", default=[], dest="steps",
+                        help="işlem adımı 'isim:anahtar=değer,...' (sırayla uygulanır)")
+    parser.add_argument("--recipe", help="arayüzde kaydedilmiş JSON tarif "
+                                         "(-s adımları tariften sonra uygulanır)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--ext", help="çıktı uzantısı (varsayılan: girdiyle aynı)")
+    parser.add_argument("--grayscale", action="store_true", help="görüntüleri gri tonda oku")
+    parser.add_argument("--list", action="store_true", help="kullanılabilir işlemleri listele")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(sorted(operations.OPERATIONS)))
+        return 0
+    if not args.pattern:
+        parser.error("girdi deseni gerekli")
+
+    try:
+        recipe = Recipe.load(args.recipe) if args.recipe else Recipe()
+        steps = [parse_step(s) for s in args.steps]
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    for name, params in steps:
+        if name not in operations.OPERATIONS:
+            parser.error(f"Bilinmeyen işlem: {name} (liste için --list)")
+        recipe.add(name, **params)
+
+    jobs = build_jobs(args.pattern, args.output, recipe, args.ext, args.grayscale)
+    if not jobs:
+        print(f"Desene uyan dosya bulunamadı: {args.pattern}", file=sys.stderr)
+        return 1
+    elapsed, totals, failures = run(jobs, args.jobs)
+    print_report(len(jobs), elapsed, totals, failures)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,387 @@
+# Performans ölçümleri
+#
+# Kullanım:
+#   python benchmarks.py                 # tüm ölçümler
+#   python benchmarks.py color_filtering # yalnızca seçilenler
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+
+def measure(func, repeat=3):
+    # İlk çağrı ısınma içindir (maske önbelleği, FFT planları); en iyi süre döner
+    func()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# Renkli frekans filtrelemenin gri ton yoluna göre izin verilen maliyeti.
+# Yalnızca parlaklık (luminance) modu bu sınırın içindedir: "rgb" modu üç
+# kanalın FFT'sini yapar ve tek çekirdekte gri yolun ~3 katı (complex64 ile ~2
+# katı) sürer; FFT_WORKERS çekirdek sayısıyla bu oranı düşürür.
+COLOR_FILTERING_LIMIT = 1.5
+
+
+def bench_color_filtering(shape=(2000, 3000), repeat=3, limit=COLOR_FILTERING_LIMIT):
+    from frequency import filter_image, to_filter_input, from_filter_output
+
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, shape + (3,), dtype=np.uint8)
+
+    def run(mode, precision=None):
+        data, ycrcb = to_filter_input(image, mode)
+        img_back = np.abs(filter_image(data, "gaussian", precision, sigma=30))
+        img_back = cv2.normalize(img_back, None, 0, 255, cv2.NORM_MINMAX)
+        return from_filter_output(img_back.astype(np.uint8), mode, ycrcb)
+
+    # Oranlar gri ton yoluna göredir; "rgb" modunda üç kanal tek toplu FFT
+    # çağrısında FFT_WORKERS iş parçacığına dağıtılır
+    print(f"Renkli frekans filtreleme, {shape[1]}x{shape[0]} Gaussian LPF")
+    base = measure(lambda: run("gray"), repeat)
+    ratios = {}
+    for mode, precision in (("gray", None), ("rgb", None), ("rgb", "single"),
+                            ("luminance", None)):
+        if mode == "gray":
+            elapsed = base
+        else:
+            elapsed = measure(lambda: run(mode, precision), repeat)
+        label = mode + (f" ({precision})" if precision else "")
+        ratios[label] = elapsed / base
+        print(f"  {label:<16} {elapsed * 1000:8.1f} ms  {elapsed / base:5.2f}x")
+    if ratios["luminance"] > limit:
+        sys.exit(f"Parlaklık modu gri yolun {ratios['luminance']:.2f} katı, sınır {limit}x")
+    print(f"  parlaklık modu {limit}x sınırı içinde (rgb modu sınıra tabi değil)")
+
+
+def bench_point_chain(shape=(3000, 4000), repeat=3):
+    import point_ops
+
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, shape + (3,), dtype=np.uint8)
+    chain = [("brightness", {"value": 20}), ("contrast", {"value": 30}),
+             ("negative", {}), ("equalize_histogram", {}),
+             ("brightness", {"value": -10})]
+
+    def separate():
+        # Her işlem ayrı bir tam boyutlu geçiş ve ara görüntü
+        result = image
+        for name, params in chain:
+            result = point_ops.apply_chain(result, [(name, params)])
+        return result
+
+    print(f"Nokta işlemleri zinciri, {shape[1]}x{shape[0]}, {len(chain)} işlem")
+    base = measure(separate, repeat)
+    fused = measure(lambda: point_ops.apply_chain(image, chain), repeat)
+    print(f"  {'ayrı ayrı':<16} {base * 1000:8.1f} ms")
+    print(f"  {'birleşik LUT':<16} {fused * 1000:8.1f} ms  {base / fused:5.2f}x hızlı")
+
+
+def bench_crimmins(megapixels=(0.5, 1, 2, 4), repeat=3):
+    import operations
+
+    # Süre piksel sayısıyla doğrusal artmalı: piksel başına süre sabit kalır
+    rng = np.random.default_rng(0)
+    print("Crimmins benek filtresi, 1 yineleme, RGB")
+    for mp in megapixels:
+        height = int((mp * 1e6 / 1.5) ** 0.5)
+        width = int(height * 1.5)
+        image = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        elapsed = measure(lambda: operations.crimmins(image), repeat)
+        size = f"{width}x{height}"
+        print(f"  {size:<16} {elapsed * 1000:8.1f} ms  "
+              f"{elapsed * 1e9 / (height * width):6.1f} ns/piksel")
+
+
+def bench_conservative(shape=(2000, 3000), sizes=(3, 5, 9, 15), repeat=3):
+    import operations
+
+    # Karşılaştırma için aynı boyutta tek bir medyan filtre
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, shape + (3,), dtype=np.uint8)
+    print(f"Konservatif filtre, {shape[1]}x{shape[0]} RGB")
+    for ksize in sizes:
+        elapsed = measure(lambda: operations.conservative_filter(image, ksize), repeat)
+        median = measure(lambda: cv2.medianBlur(image, ksize), repeat)
+        print(f"  {ksize:2d}x{ksize:<2d} {elapsed * 1000:8.1f} ms  medyan {median * 1000:8.1f} ms")
+
+
+def bench_compass(shape=(2000, 3000), repeat=3):
+    import compass_ops
+
+    rng = np.random.default_rng(0)
+    gray = rng.integers(0, 256, shape, dtype=np.uint8)
+
+    def separate(family):
+        # Her yön için ayrı float32 filtre, en büyük değer ve yön maskeyle
+        data = gray.astype(np.float32)
+        best = direction = None
+        for d, kernel in enumerate(compass_ops.kernels(family)):
+            response = cv2.filter2D(data, cv2.CV_32F, kernel)
+            if best is None:
+                best, direction = response, np.zeros(shape, np.uint8)
+                continue
+            better = response > best
+            best = np.where(better, response, best)
+            direction[better] = d
+        return best, direction
+
+    print(f"Pusula kenar bulucu (şiddet + yön), {shape[1]}x{shape[0]}")
+    for family in compass_ops.FAMILIES:
+        base = measure(lambda: separate(family), repeat)
+        fused = measure(lambda: compass_ops.edges(gray, family), repeat)
+        print(f"  {family:<10} 8 geçiş {base * 1000:8.1f} ms  birleşik {fused * 1000:8.1f} ms"
+              f"  {base / fused:5.2f}x hızlı")
+
+
+def bench_kmeans(shape=(1000, 1500), large_shape=(4000, 6000), k=6, repeat=1):
+    import segmentation
+
+    # Eski yöntem: tüm piksellerde cv2.kmeans, 10 rastgele başlangıç
+    rng = np.random.default_rng(0)
+    palette = rng.integers(0, 256, (k, 3))
+    labels = rng.integers(0, k, (shape[0] // 50 + 1, shape[1] // 50 + 1))
+    labels = np.kron(labels, np.ones((50, 50), int))[:shape[0], :shape[1]]
+    image = np.clip(palette[labels] + rng.normal(0, 10, shape + (3,)), 0, 255).astype(np.uint8)
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 10, 1.0)
+    pixels = np.float32(image.reshape(-1, 3))
+
+    print(f"K-means renk segmentasyonu, K={k}")
+    base = measure(lambda: cv2.kmeans(pixels, k, None, criteria, 10,
+                                      cv2.KMEANS_RANDOM_CENTERS), repeat)
+    fast = measure(lambda: segmentation.segment(image, k), repeat)
+    print(f"  {shape[1]}x{shape[0]}  cv2.kmeans {base * 1000:8.1f} ms  "
+          f"örnek + küp tablosu {fast * 1000:8.1f} ms  {base / fast:5.1f}x hızlı")
+
+    large = cv2.resize(image, (large_shape[1], large_shape[0]), interpolation=cv2.INTER_NEAREST)
+    elapsed = measure(lambda: segmentation.segment(large, k), repeat)
+    segmentation.segment(large, k, warm_start=True)
+    warm = measure(lambda: segmentation.segment(large, k, warm_start=True), repeat)
+    segmentation.reset_warm_start()
+    print(f"  {large_shape[1]}x{large_shape[0]}  {elapsed * 1000:8.1f} ms  "
+          f"önceki merkezlerden {warm * 1000:8.1f} ms")
+
+
+def bench_hough(shape=(4000, 6000), repeat=3):
+    import hough_ops
+
+    # Rastgele doğrular ve çemberler; oylama tam ve küçültülmüş kenar haritasında
+    rng = np.random.default_rng(0)
+    image = np.zeros(shape + (3,), np.uint8)
+    height, width = shape
+    for _ in range(30):
+        x1, x2 = rng.integers(0, width, 2)
+        y1, y2 = rng.integers(0, height, 2)
+        cv2.line(image, (int(x1), int(y1)), (int(x2), int(y2)), (255, 255, 255), 3)
+    for _ in range(10):
+        center = (int(rng.integers(500, width - 500)), int(rng.integers(500, height - 500)))
+        cv2.circle(image, center, int(rng.integers(80, 400)), (255, 255, 255), 4)
+
+    print(f"Hough dönüşümü, {width}x{height}")
+    for mode, params in (("standard", {}),
+                         ("probabilistic", {"min_length": 200}),
+                         ("circles", {"min_radius": 50, "max_radius": 450, "min_distance": 100})):
+        cells = []
+        for factor in (1.0, 0.5, 0.25):
+            found = len(hough_ops.detect(image, mode, downscale=factor,
+                                         threshold=hough_ops.DEFAULT_THRESHOLDS[mode], **params))
+            elapsed = measure(lambda: hough_ops.detect(
+                image, mode, downscale=factor,
+                threshold=hough_ops.DEFAULT_THRESHOLDS[mode], **params), repeat)
+            cells.append(f"{factor:<4} {elapsed * 1000:7.1f} ms ({found:3d})")
+        print(f"  {mode:<14} " + "  ".join(cells))
+
+
+def bench_smoothing(shape=(2000, 3000), radii=(1, 5, 10, 25, 50, 100), repeat=2):
+    import smooth_ops
+
+    # Yarıçap büyüdükçe süre sabit kalmalı; karşılaştırma için yoğun çekirdekli
+    # ortalama (cv2.filter2D) ve tam Gauss çekirdeği de ölçülür
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, shape + (3,), dtype=np.uint8)
+    print(f"Yumuşatma filtreleri, {shape[1]}x{shape[0]} RGB (ms)")
+    print(f"  {'r':>4} {'kutu':>8} {'yoğun':>8} {'medyan':>8} {'Gauss':>8} {'tam Gauss':>10}")
+    for radius in radii:
+        ksize = 2 * radius + 1
+        kernel = np.full((ksize, ksize), 1 / (ksize * ksize), np.float32)
+        cells = [measure(lambda: smooth_ops.box(image, ksize), repeat),
+                 measure(lambda: cv2.filter2D(image, -1, kernel), repeat),
+                 measure(lambda: smooth_ops.median(image, ksize), repeat),
+                 measure(lambda: smooth_ops.gaussian(image, ksize), repeat),
+                 measure(lambda: smooth_ops.gaussian(image, ksize, approximate=False), repeat)]
+        print(f"  {radius:4d} " + " ".join(f"{t * 1000:8.1f}" for t in cells[:4])
+              + f" {cells[4] * 1000:10.1f}")
+
+
+def bench_convolution(shapes=((512, 512), (2000, 3000)), sizes=(3, 7, 15, 31, 61),
+                      repeat=2):
+    import convolution
+
+    # Her yol ayrı ölçülür; "seçilen" maliyet modelinin seçimi, "+" en hızlı
+    # yolla aynı olduğunu gösterir. Gauss çekirdeği rank-1, rastgele çekirdek değil.
+    calibration = convolution.model()
+    print(f"Evrişim seçimi ({calibration['machine']})")
+    taps, seconds = calibration["direct"]
+    print("  direct    " + "  ".join(f"{t}: {s * 1e9:.2f} ns" for t, s in zip(taps, seconds)))
+    for method in ("separable", "fft"):
+        a, b = calibration[method]
+        print(f"  {method:<9} a={a * 1e9:7.3f} ns  b={b * 1e9:7.3f} ns")
+    rng = np.random.default_rng(0)
+    for shape in shapes:
+        image = rng.integers(0, 256, shape + (3,), dtype=np.uint8)
+        print(f"  {shape[1]}x{shape[0]} RGB")
+        for size in sizes:
+            gaussian = cv2.getGaussianKernel(size, 0)
+            for name, kernel in (("gauss", gaussian @ gaussian.T),
+                                 ("rastgele", rng.random((size, size), dtype=np.float32) / size ** 2)):
+                vectors = convolution.separate(kernel)
+                chosen, _ = convolution.choose(image.shape, kernel.shape, vectors)
+                times = {}
+                for method in convolution.METHODS:
+                    if method == "separable" and vectors is None:
+                        continue
+                    times[method] = measure(lambda: convolution.convolve(
+                        image, kernel, method=method), repeat)
+                fastest = min(times, key=times.get)
+                cells = "  ".join(f"{m} {t * 1000:8.1f}" for m, t in times.items())
+                mark = "+" if chosen == fastest else " "
+                print(f"    {size:2d}x{size:<2d} {name:<8} {cells:<58} seçilen {chosen:<9}{mark}")
+
+
+def bench_morphology(shape=(4000, 6000), radii=(1, 3, 7, 15, 25, 50, 75, 100), repeat=3):
+    import morph_ops
+
+    # Dikdörtgen genişletme: OpenCV'nin satır/sütun yolu çekirdekle doğrusal
+    # büyür, van Herk/Gil-Werman yolu sabit kalır
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, shape + (3,), dtype=np.uint8)
+    print(f"Morfolojik genişletme, {shape[1]}x{shape[0]} RGB, dikdörtgen çekirdek "
+          f"(otomatik seçim {morph_ops.SEPARABLE_MIN_SIZE} pikselden itibaren ayrıştırılmış)")
+    for radius in radii:
+        ksize = 2 * radius + 1
+        naive = measure(lambda: morph_ops.morphology(image, "dilate", "rect", ksize,
+                                                     separable=False), repeat)
+        fast = measure(lambda: morph_ops.morphology(image, "dilate", "rect", ksize,
+                                                    separable=True), repeat)
+        print(f"  r={radius:<3d} OpenCV {naive * 1000:8.1f} ms  ayrıştırılmış {fast * 1000:8.1f} ms"
+              f"  {naive / fast:5.2f}x")
+
+
+def bench_decode(shape=(4000, 6000), sizes=(None, 1024, 400), repeat=3):
+    import tempfile
+
+    import image_io
+
+    # Fotoğraf benzeri (düzgün + gürültü) bir JPEG tam ve DCT ölçekli çözülür
+    rng = np.random.default_rng(0)
+    small = rng.integers(0, 256, (40, 60, 3), dtype=np.uint8)
+    image = cv2.resize(small, (shape[1], shape[0]), interpolation=cv2.INTER_CUBIC)
+    image = cv2.add(image, rng.integers(0, 20, shape + (3,), dtype=np.uint8))
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "decode.jpg")
+        image_io.write_image(path, image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        print(f"JPEG çözme, {shape[1]}x{shape[0]} RGB")
+        for max_size in sizes:
+            elapsed = measure(lambda: image_io.decode(path, max_size=max_size), repeat)
+            decoded = image_io.decode(path, max_size=max_size)
+            print(f"  en az {max_size or 'tam'} px: {elapsed * 1000:7.1f} ms  "
+                  f"({decoded.summary()})")
+
+
+def bench_encode(shape=(2000, 3000), repeat=2):
+    import tempfile
+
+    import image_io
+
+    # Biçim ve ayarlara göre kodlama süresi ile dosya boyutu
+    rng = np.random.default_rng(0)
+    small = rng.integers(0, 256, (40, 60, 3), dtype=np.uint8)
+    image = cv2.resize(small, (shape[1], shape[0]), interpolation=cv2.INTER_CUBIC)
+    image = cv2.add(image, rng.integers(0, 20, shape + (3,), dtype=np.uint8))
+    cases = [(".png", {"png_compression": level}) for level in (0, 1, 3, 6, 9)]
+    cases += [(".jpg", {"jpeg_quality": 95}), (".jpg", {"jpeg_quality": 80}),
+              (".jpg", {"jpeg_quality": 95, "jpeg_progressive": True}),
+              (".webp", {"webp_quality": 90}), (".webp", {"webp_lossless": True}),
+              (".tif", {"tiff_compression": "lzw"}), (".tif", {"tiff_compression": "deflate"}),
+              (".bmp", {})]
+    print(f"Kodlama, {shape[1]}x{shape[0]} RGB")
+    with tempfile.TemporaryDirectory() as folder:
+        for ext, options in cases:
+            path = os.path.join(folder, "encode" + ext)
+            params = image_io.write_params(ext, **options)
+            elapsed = measure(lambda: image_io.encode(path, image, params), repeat)
+            size = os.path.getsize(path)
+            settings = ", ".join(f"{k}={v}" for k, v in options.items())
+            print(f"  {ext:6} {settings:42} {elapsed * 1000:8.1f} ms {size / 2**20:7.2f} MB")
+
+
+# İlk pencerenin açılış süresi bu sınırı aşarsa ölçüm başarısız sayılır
+STARTUP_LIMIT_MS = 300
+
+
+def bench_startup(repeat=3, limit_ms=STARTUP_LIMIT_MS):
+    # Uygulamayı --startup-report ile ayrı süreçte açar; ilk pencerenin
+    # (içe aktarmalardan ilk çizime kadar) en iyi süresi sınırı aşarsa hata
+    # koduyla çıkar. Açılışta OpenCV/NumPy'nin yeniden yüklenmeye başlaması
+    # gibi gerilemeleri yakalamak içindir.
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    best = float("inf")
+    report = ""
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, os.path.join(here, "goruntu isleme odev.py"), "--startup-report"],
+            cwd=here, env=env, capture_output=True, text=True, encoding="utf-8", check=True)
+        match = re.search(r"ilk pencere \(toplam\)\s+([\d.]+) ms", result.stdout)
+        if match is None:
+            sys.exit("Açılış raporu okunamadı:\n" + result.stdout + result.stderr)
+        total = float(match.group(1))
+        if total < best:
+            best, report = total, result.stdout
+    print(report.rstrip())
+    if best > limit_ms:
+        sys.exit(f"Açılış süresi {best:.1f} ms, sınır {limit_ms} ms")
+    loaded = re.search(r"ilk sekme öncesi yüklü\s+(.+)", report)
+    if loaded is None or loaded.group(1).strip() != "yok":
+        sys.exit("İlk sekmeden önce ağır modüller yüklendi")
+    print(f"  sınır {limit_ms} ms içinde")
+
+
+BENCHMARKS = {
+    "color_filtering": bench_color_filtering,
+    "point_chain": bench_point_chain,
+    "crimmins": bench_crimmins,
+    "conservative": bench_conservative,
+    "compass": bench_compass,
+    "kmeans": bench_kmeans,
+    "hough": bench_hough,
+    "smoothing": bench_smoothing,
+    "convolution": bench_convolution,
+    "morphology": bench_morphology,
+    "decode": bench_decode,
+    "encode": bench_encode,
+    "startup": bench_startup,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Görüntü işleme performans ölçümleri")
+    parser.add_argument("names", nargs="*",
+                        help="çalıştırılacak ölçümler (varsayılan: hepsi): "
+                             + ", ".join(BENCHMARKS))
+    args = parser.parse_args()
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error(f"Bilinmeyen ölçüm: {name}")
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name]()
@@ -0,0 +1,149 @@
+# Pusula (compass) kenar bulucuları için birleşik motor
+#
+# Pusula operatörü aynı 3x3 çekirdeğin 45 derecelik sekiz dönüşünü uygular;
+# kenar şiddeti en büyük yanıt, kenar yönü de bu yanıtı veren çekirdeğin
+# indisidir (0 = doğu, saat yönünün tersine 45'er derece: 1 = kuzeydoğu,
+# 2 = kuzey, ... 7 = güneydoğu).
+#
+# Çekirdeklerin birbirinin dönüşü olması iki şekilde kullanılır:
+#   - Halka ağırlıkları iki değerli olan aileler (Kirsch, Prewitt pusula)
+#     için yanıt = (p - q) * R + q * S + merkez_ağırlığı * merkez'dir.
+#     S sekiz komşunun toplamı, R ise p ağırlıklı ardışık komşuların
+#     toplamıdır. S yönden bağımsız olduğu için yalnızca R'nin en büyüğü
+#     (ya da en küçüğü) izlenir. Bir sonraki yönün R'si bir komşu ekleyip
+#     bir komşu çıkararak bulunur.
+#   - Ters simetrik aileler (Robinson) için karşı yöndeki çekirdek aynı
+#     çekirdeğin eksilisidir; dört filtre geçişi sekiz yönü verir.
+# Hesaplar float32'de yapılır; en büyük değer ve yön tek bir dizide yerinde
+# biriktirilir (bkz. edges).
+import cv2
+import numpy as np
+
+# Halka konumları (satır, sütun kayması), doğudan başlayıp saat yönünün tersine
+RING = ((0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0), (1, 1))
+
+# Aile -> doğuya bakan (0 numaralı) çekirdek
+FAMILIES = {
+    "kirsch": np.array([[-3, -3, 5], [-3, 0, 5], [-3, -3, 5]], np.float32),
+    "robinson": np.array([[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]], np.float32),
+    "prewitt": np.array([[-1, 1, 1], [-1, -2, 1], [-1, 1, 1]], np.float32),
+}
+
+
+def _ring_weights(kernel):
+    return np.array([kernel[1 + dy, 1 + dx] for dy, dx in RING], np.float32)
+
+
+def kernels(family="kirsch"):
+    # Ailenin sekiz çekirdeği, yön sırasıyla
+    base = FAMILIES.get(family)
+    if base is None:
+        raise ValueError(f"Bilinmeyen pusula ailesi: {family}")
+    weights = _ring_weights(base)
+    result = []
+    for d in range(8):
+        kernel = np.zeros((3, 3), np.float32)
+        kernel[1, 1] = base[1, 1]
+        for i, (dy, dx) in enumerate(RING):
+            kernel[1 + dy, 1 + dx] = weights[(i - d) % 8]
+        result.append(kernel)
+    return result
+
+
+def _two_valued_run(weights):
+    # Halka iki değerliyse ve azınlıktaki değer dairesel olarak ardışıksa
+    # (p, q, başlangıç, uzunluk); değilse None
+    values = np.unique(weights)
+    if len(values) != 2:
+        return None
+    p, q = sorted(values, key=lambda v: np.count_nonzero(weights == v))
+    run = weights == p
+    starts = [i for i in range(8) if run[i] and not run[i - 1]]
+    if len(starts) != 1:
+        return None
+    return float(p), float(q), starts[0], int(np.count_nonzero(run))
+
+
+def _decode(keys):
+    # anahtar = 8 * değer + (7 - yön); eşitlikte küçük yön indisi kazanır
+    value = np.floor(keys * np.float32(1 / 8))
+    direction = (7 - (keys - 8 * value)).astype(np.uint8)
+    return value, direction
+
+
+def edges(gray, family="kirsch"):
+    # Tamsayı (uint8) gri görüntüden (kenar şiddeti float32, yön indisi
+    # uint8). Kenar davranışı cv2.filter2D ile aynıdır (BORDER_REFLECT_101).
+    #
+    # Yanıtlar tamsayı olduğundan float32'de tam olarak temsil edilir; her
+    # yönün yanıtı "8 * yanıt + (7 - yön)" anahtarına gömülür. Böylece en
+    # büyük değer ve yönü tek bir np.maximum ile birlikte biriktirilir.
+    base = FAMILIES.get(family)
+    if base is None:
+        raise ValueError(f"Bilinmeyen pusula ailesi: {family}")
+    if not np.issubdtype(gray.dtype, np.integer):
+        raise ValueError("Pusula operatörü tamsayı gri görüntü bekler")
+    data = gray.astype(np.float32)
+    height, width = data.shape
+    weights = _ring_weights(base)
+
+    shape = _two_valued_run(weights)
+    if shape is not None:
+        p, q, start, length = shape
+        # p > q ise en büyük R, değilse en küçük R (işaretle çevrilmiş en
+        # büyük) en büyük yanıtı verir
+        sign = 1 if p > q else -1
+        scaled = cv2.copyMakeBorder(data * np.float32(8 * sign), 1, 1, 1, 1,
+                                    cv2.BORDER_REFLECT_101)
+        # Bir sonraki yöne geçerken çıkan komşu ve anahtardaki (7 - yön)
+        # azalışı tek çıkarmada: çıkan komşu için scaled + 1 kullanılır
+        leaving = scaled + np.float32(1)
+        planes = [scaled[1 + dy:1 + dy + height, 1 + dx:1 + dx + width] for dy, dx in RING]
+        leaving_planes = [leaving[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+                          for dy, dx in RING]
+        keys = planes[start] + np.float32(7)
+        for j in range(1, length):
+            keys += planes[(start + j) % 8]
+        best = keys.copy()
+        for d in range(1, 8):
+            keys += planes[(start + d + length - 1) % 8]
+            keys -= leaving_planes[(start + d - 1) % 8]
+            np.maximum(best, keys, out=best)
+        run, direction = _decode(best)
+        # yanıt = (p - q) * R + q * S + merkez_ağırlığı * merkez
+        total = cv2.boxFilter(data, -1, (3, 3), normalize=False,
+                              borderType=cv2.BORDER_REFLECT_101)
+        total -= data
+        magnitude = run
+        magnitude *= np.float32(sign * (p - q))
+        magnitude += np.float32(q) * total
+        if base[1, 1]:
+            magnitude += base[1, 1] * data
+        return magnitude, direction
+
+    if not (np.array_equal(np.roll(weights, 4), -weights) and base[1, 1] == 0):
+        raise ValueError(f"Pusula ailesi desteklenmiyor: {family}")
+    # Ters simetrik aile: d yönünün anahtarı 8r + (7 - d), karşı yönün
+    # (d + 4) anahtarı -8r + (3 - d) = (10 - 2d) - (8r + 7 - d)
+    best = None
+    keys = np.empty((height, width), np.float32)
+    opposite = np.empty((height, width), np.float32)
+    for d, kernel in enumerate(kernels(family)[:4]):
+        cv2.filter2D(data, cv2.CV_32F, kernel * 8, dst=keys, delta=7 - d,
+                     borderType=cv2.BORDER_REFLECT_101)
+        np.subtract(np.float32(10 - 2 * d), keys, out=opposite)
+        if best is None:
+            best = np.maximum(keys, opposite)
+        else:
+            np.maximum(best, keys, out=best)
+            np.maximum(best, opposite, out=best)
+    return _decode(best)
+
+
+def direction_image(magnitude, direction):
+    # Yön renk tonuna (0-180 HSV tonunda 45 derece = 22.5), şiddet parlaklığa
+    # eşlenmiş RGB görüntü
+    value = cv2.normalize(magnitude, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+    hue = (direction.astype(np.uint16) * 180 // 8).astype(np.uint8)
+    hsv = cv2.merge([hue, np.full_like(hue, 255), value])
+    return cv2.cvtColor(hsv, cv2.COLOR_HSV2RGB)
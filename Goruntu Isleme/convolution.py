@@ -0,0 +1,342 @@
+# Uzamsal ve FFT evrişimi arasında otomatik seçim
+#
+# Filtre ve kenar işlemleri çekirdeklerini bu modüle verir; her çağrıda üç
+# yoldan tahmini en hızlısı seçilir:
+#   - direct: cv2.filter2D, piksel başına maliyet çekirdek alanıyla artar,
+#   - separable: cv2.sepFilter2D, yalnızca bir satır ve bir sütun vektörünün
+#     çarpımı olan (rank-1) çekirdeklerde; maliyet kh + kw ile artar,
+#   - fft: frequency.correlate (tek hassasiyet), maliyet çekirdekten
+#     bağımsız ama dönüşüm boyutunun N log N'i kadardır.
+# Maliyet modeli makine başına bir kez küçük bir ölçümle bulunur ve
+# CALIBRATION_PATH'e yazılır; OpenCV/NumPy sürümü ya da işlemci sayısı
+# değişince yeniden ölçülür. Ölçüm "python convolution.py --calibrate" ile
+# önceden de yapılabilir. CALIBRATE False ise (ör. toplu işlem süreçleri
+# birbirinin ölçümünü bozmasın diye) ölçüm yapılmaz, geçerli bir kayıt
+# yoksa STATIC_MODEL kullanılır. Sonuçlar cv2.filter2D ile aynı anlamdadır
+# (korelasyon, merkez çapa, BORDER_REFLECT_101).
+#
+# Her çağrının seçilen yolu, tahmini ve gerçek süresi CALLS'a (son LOG_SIZE
+# çağrı) ve recording() bloğu içindeyse o iş parçacığının listesine yazılır.
+import argparse
+import importlib
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+
+METHODS = ("direct", "separable", "fft")
+CALIBRATION_PATH = os.path.join(os.path.expanduser("~"), ".goruntu_isleme", "convolution.json")
+CALIBRATION_VERSION = 1
+# En küçük ve en büyük tekil değer oranı bundan küçükse çekirdek rank-1 sayılır
+SEPARABLE_TOLERANCE = 1e-6
+LOG_SIZE = 200
+# False ise model() ölçüm yapmaz; kayıt yoksa STATIC_MODEL'e düşer
+CALIBRATE = True
+# Ölçüm yapılamayan süreçler için sabit katsayılar (tek çekirdekli bir x86_64
+# makinede ölçülmüş, yuvarlanmış değerler)
+STATIC_MODEL = {
+    "version": CALIBRATION_VERSION,
+    "machine": "static",
+    "direct": [[9, 25, 49, 121, 225, 961, 3721],
+               [1.3e-09, 3.2e-09, 6.2e-09, 1.5e-08, 3.7e-08, 4.3e-08, 6.8e-08]],
+    "separable": [1.1e-10, 8.4e-11],
+    "fft": [3.9e-09, 1.5e-09],
+}
+
+# cv2 derinliği -> NumPy tipi (ddepth=-1: girişin tipi)
+_DEPTHS = {
+    cv2.CV_8U: np.uint8,
+    cv2.CV_16U: np.uint16,
+    cv2.CV_16S: np.int16,
+    cv2.CV_32F: np.float32,
+    cv2.CV_64F: np.float64,
+}
+
+CALLS = deque(maxlen=LOG_SIZE)
+_local = threading.local()
+_model = None
+_model_lock = threading.Lock()
+
+
+class Call:
+    # Bir evrişim çağrısının kaydı; süreler saniyedir
+    def __init__(self, label, shape, kernel_shape, method, predicted, elapsed):
+        self.label = label
+        self.shape = shape
+        self.kernel_shape = kernel_shape
+        self.method = method
+        self.predicted = predicted
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return (f"{self.label or 'evrişim'} {self.shape} * {self.kernel_shape}: {self.method} "
+                f"{self.elapsed * 1000:.1f} ms (tahmin {self.predicted * 1000:.1f} ms)")
+
+
+@contextmanager
+def recording():
+    # Blok içinde bu iş parçacığında yapılan çağrıları listede toplar
+    calls = []
+    previous = getattr(_local, "calls", None)
+    _local.calls = calls
+    try:
+        yield calls
+    finally:
+        _local.calls = previous
+
+
+def describe(calls):
+    # Durum çubuğu için kısa özet: "separable x2 (12 ms)"
+    counts = Counter(call.method for call in calls)
+    methods = ", ".join(f"{method} x{count}" for method, count in counts.items())
+    return f"{methods} ({sum(call.elapsed for call in calls) * 1000:.0f} ms)"
+
+
+# --- Maliyet modeli ---
+#
+# separable ve fft için piksel (ya da FFT elemanı) başına süre a + b * x;
+# separable'da x = kh + kw, fft'de x = log2(N). cv2.filter2D büyük
+# çekirdeklerde kendi içinde DFT'ye geçtiği için direct doğrusal değildir:
+# çekirdek alanına göre ölçülmüş bir tablodan ara değerle bulunur, tablonun
+# ötesinde sabit kabul edilir.
+
+def _machine_key():
+    return (f"{platform.machine()} {os.cpu_count()} cpu, OpenCV {cv2.__version__}, "
+            f"NumPy {np.__version__}")
+
+
+def _best_time(func, repeat):
+    func()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _fit(samples):
+    # [(x, birim başına süre), ...] -> negatif olmayan (a, b)
+    x = np.array([s[0] for s in samples], np.float64)
+    y = np.array([s[1] for s in samples], np.float64)
+    b, a = np.polyfit(x, y, 1)
+    return [max(float(a), 0.0), max(float(b), 0.0)]
+
+
+def calibrate(size=768, repeat=3):
+    # Küçük görüntülerde üç yolu ölçüp modeli döndürür (~1 sn)
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (size, size), dtype=np.uint8)
+    pixels = image.size
+
+    direct = [[], []]
+    for k in (3, 5, 7, 11, 15, 31, 61):
+        kernel = rng.random((k, k), dtype=np.float32)
+        direct[0].append(k * k)
+        direct[1].append(_best_time(lambda: cv2.filter2D(image, -1, kernel), repeat) / pixels)
+
+    separable = []
+    for k in (3, 7, 15, 31, 61):
+        # OpenCV simetrik çekirdeklerde daha hızlı yol kullanır; tipik ayrılabilir
+        # çekirdekler (Gauss, kutu, Prewitt) simetrik ya da ters simetriktir
+        vector = cv2.getGaussianKernel(k, 0, cv2.CV_32F)
+        separable.append((2 * k, _best_time(
+            lambda: cv2.sepFilter2D(image, -1, vector, vector), repeat) / pixels))
+
+    fft = []
+    kernel = rng.random((9, 9), dtype=np.float32)
+    for n in (size // 2, size, 2 * size):
+        data = rng.integers(0, 256, (n, n), dtype=np.uint8)
+        elements = (n + 8) * (n + 8)
+        fft.append((math.log2(elements), _best_time(
+            lambda: _fft(data, kernel, np.uint8, 0, cv2.BORDER_REFLECT_101), repeat) / elements))
+
+    return {"version": CALIBRATION_VERSION, "machine": _machine_key(),
+            "direct": direct, "separable": _fit(separable), "fft": _fit(fft)}
+
+
+def _save(data, path):
+    # Geçici dosyaya yazıp yerine taşır; aynı anda yazan ya da okuyan
+    # süreçler yarım yazılmış bir dosya görmez
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def model(path=None):
+    # Katsayılar: önce bellekte, sonra diskte aranır; yoksa ölçülüp kaydedilir
+    # (CALIBRATE False ise ölçülmez, STATIC_MODEL kullanılır)
+    global _model
+    with _model_lock:
+        if _model is not None:
+            return _model
+        path = path or CALIBRATION_PATH
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CALIBRATION_VERSION and data.get("machine") == _machine_key():
+                _model = data
+                return _model
+        except (OSError, ValueError):
+            pass
+        if not CALIBRATE:
+            _model = STATIC_MODEL
+            return _model
+        _model = calibrate()
+        try:
+            _save(_model, path)
+        except OSError:
+            # Yazılamıyorsa her oturumda bir kez yeniden ölçülür
+            pass
+        return _model
+
+
+def use_model(data):
+    # Başka bir süreçte bulunmuş modeli kullan (ör. toplu işlem süreçleri
+    # ana sürecin modelini alır, kendileri ölçmez)
+    global _model
+    with _model_lock:
+        _model = data
+
+
+def recalibrate(path=None):
+    global _model
+    with _model_lock:
+        _model = None
+    try:
+        os.remove(path or CALIBRATION_PATH)
+    except OSError:
+        pass
+    return model(path)
+
+
+def predict(method, shape, kernel_shape):
+    # Tahmini süre (saniye); shape (H, W) veya (H, W, C)
+    coefficients = model()[method]
+    height, width = shape[:2]
+    channels = shape[2] if len(shape) == 3 else 1
+    kh, kw = kernel_shape
+    if method == "direct":
+        taps, seconds = coefficients
+        return height * width * channels * float(np.interp(kh * kw, taps, seconds))
+    a, b = coefficients
+    if method == "separable":
+        return height * width * channels * (a + b * (kh + kw))
+    elements = (height + kh - 1) * (width + kw - 1)
+    return elements * channels * (a + b * math.log2(elements))
+
+
+# --- Evrişim ---
+
+def separate(kernel):
+    # Rank-1 çekirdeği (kx, ky) vektörlerine ayırır; değilse None
+    kernel = np.asarray(kernel, np.float64)
+    one = np.ones((1, 1), np.float32)
+    if kernel.shape[0] == 1:
+        return kernel.astype(np.float32), one
+    if kernel.shape[1] == 1:
+        return one, kernel.astype(np.float32)
+    u, s, vt = np.linalg.svd(kernel)
+    if s[0] == 0 or s[1] > SEPARABLE_TOLERANCE * s[0]:
+        return None
+    scale = math.sqrt(s[0])
+    return ((vt[0] * scale).astype(np.float32).reshape(1, -1),
+            (u[:, 0] * scale).astype(np.float32).reshape(-1, 1))
+
+
+def choose(shape, kernel_shape, separable):
+    # (yol, tahmini süre); separable çekirdek rank-1 ise ayrılmış vektörlerdir
+    candidates = ["direct", "fft"]
+    if separable is not None:
+        candidates.insert(1, "separable")
+    estimates = {method: predict(method, shape, kernel_shape) for method in candidates}
+    method = min(estimates, key=estimates.get)
+    return method, estimates[method]
+
+
+def _fft(image, kernel, dtype, delta, border):
+    import frequency
+    kh, kw = kernel.shape
+    ay, ax = kh // 2, kw // 2
+    padded = cv2.copyMakeBorder(image, ay, kh - 1 - ay, ax, kw - 1 - ax, border)
+    if padded.ndim == 2 and image.ndim == 3:
+        padded = padded[:, :, None]
+    result = frequency.correlate(padded, kernel, "single")
+    if delta:
+        result += delta
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+        result = np.clip(np.rint(result), info.min, info.max)
+    return result.astype(dtype)
+
+
+def convolve(image, kernel, ddepth=-1, delta=0, border=cv2.BORDER_REFLECT_101, method=None,
+             label=None):
+    # cv2.filter2D(image, ddepth, kernel, delta=delta, borderType=border) ile
+    # aynı sonuç; method verilmezse maliyet modeline göre seçilir
+    kernel = np.asarray(kernel, np.float32)
+    if kernel.ndim != 2:
+        raise ValueError("Çekirdek iki boyutlu olmalı")
+    if method is not None and method not in METHODS:
+        raise ValueError(f"Bilinmeyen evrişim yolu: {method}")
+    vectors = separate(kernel) if method in (None, "separable") else None
+    if method is None:
+        method, predicted = choose(image.shape, kernel.shape, vectors)
+    else:
+        if method == "separable" and vectors is None:
+            raise ValueError("Çekirdek ayrıştırılabilir (rank-1) değil")
+        predicted = predict(method, image.shape, kernel.shape)
+
+    if method == "fft":
+        # scipy ilk FFT'de yüklenir; yükleme çağrının süresine sayılmasın
+        importlib.import_module("frequency")
+    start = time.perf_counter()
+    if method == "direct":
+        result = cv2.filter2D(image, ddepth, kernel, delta=delta, borderType=border)
+    elif method == "separable":
+        result = cv2.sepFilter2D(image, ddepth, vectors[0], vectors[1], delta=delta,
+                                 borderType=border)
+    else:
+        dtype = image.dtype if ddepth == -1 else np.dtype(_DEPTHS[ddepth])
+        result = _fft(image, kernel, dtype, delta, border)
+
+    call = Call(label, image.shape, kernel.shape, method, predicted,
+                time.perf_counter() - start)
+    CALLS.append(call)
+    calls = getattr(_local, "calls", None)
+    if calls is not None:
+        calls.append(call)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evrişim yolu seçicisinin maliyet modeli.")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="modeli yeniden ölç ve kaydet")
+    parser.add_argument("--path", default=CALIBRATION_PATH, help="model dosyası")
+    args = parser.parse_args(argv)
+    data = recalibrate(args.path) if args.calibrate else model(args.path)
+    print(f"{data['machine']}: {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+# Çok belgeli oturum
+#
+# Her belge kendi orijinal ve işlenmiş görüntüsünü, tarifini, geri alma
+# geçmişini ve yükleme ayarlarını tutar; pencere yalnızca etkin belgenin
+# durumunu gösterir. Tüm belgeler ortak bir bellek bütçesini paylaşır: bütçe
+# aşılınca en uzun süredir kullanılmayan belgelerin görüntüleri zlib ile
+# sıkıştırılıp (sıkışmayan gürültülü görüntüler ham olarak) diske yazılır,
+# geçmişleri de diske taşınır. Diske taşınan belgeye dönüldüğünde görüntüler
+# okunup yeniden bellekte tutulur; bellekteki belgeler arasında geçiş
+# kopyasızdır.
+#
+# Taşıma arka planda tek bir iş parçacığında yapılır, böylece sekme değiştirmek
+# sıkıştırmayı beklemez. Belge kilidi taşımanın ve geri okumanın aynı anda
+# olmamasını sağlar; etkin belge hiçbir zaman taşınmaz.
+#
+# NumPy, geçmişteki gibi ilk kez gerektiğinde içe aktarılır.
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from history import Pixels
+
+DEFAULT_BUDGET_MB = 1024
+
+
+def _in_memory(item):
+    # Bellekte yer tutan dizi mi (diske eşlenmiş ya da taşınmış değil)
+    import numpy as np
+    return isinstance(item, np.ndarray) and not isinstance(item, np.memmap)
+
+
+class Document:
+    def __init__(self, path, original, processed, recipe, history, grayscale=False,
+                 is_proxy=False, is_tiled=False):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.recipe = recipe
+        self.history = history
+        self.grayscale = grayscale
+        self.is_proxy = is_proxy
+        self.is_tiled = is_tiled
+        self.last_used = 0
+        # Dizi ya da diske taşınmış Pixels; orijinal ve işlenmiş aynı dizi olabilir
+        self._images = [original, processed]
+        self._lock = threading.Lock()
+
+    def images(self):
+        # (orijinal, işlenmiş); diske taşınmışsa okunup bellekte tutulur
+        with self._lock:
+            loaded = {}
+            for i, item in enumerate(self._images):
+                if isinstance(item, Pixels):
+                    if id(item) not in loaded:
+                        loaded[id(item)] = item.load().copy()
+                        item.discard()
+                    self._images[i] = loaded[id(item)]
+            return tuple(self._images)
+
+    def update(self, original, processed, is_proxy=None):
+        with self._lock:
+            self._images = [original, processed]
+            if is_proxy is not None:
+                self.is_proxy = is_proxy
+
+    def is_spilled(self):
+        return any(isinstance(item, Pixels) for item in self._images)
+
+    def memory_bytes(self):
+        arrays = {id(item): item for item in self._images if _in_memory(item)}
+        return sum(a.nbytes for a in arrays.values()) + self.history.memory_bytes()
+
+    def disk_bytes(self):
+        stores = {id(item): item for item in self._images if isinstance(item, Pixels)}
+        return sum(p.disk_bytes() for p in stores.values()) + self.history.disk_bytes()
+
+    def spill(self, directory, skip=None):
+        # Görüntüleri ve geçmişi diske taşır; skip() True dönerse (belge bu
+        # arada etkinleştiyse) vazgeçer
+        with self._lock:
+            if skip is not None and skip():
+                return
+            stores = {}
+            for i, item in enumerate(self._images):
+                if _in_memory(item):
+                    if id(item) not in stores:
+                        pixels = Pixels(item)
+                        pixels.spill(directory)
+                        stores[id(item)] = pixels
+                    self._images[i] = stores[id(item)]
+            self.history.set_budget(0)
+
+    def discard(self):
+        with self._lock:
+            for item in self._images:
+                if isinstance(item, Pixels):
+                    item.discard()
+            self._images = [None, None]
+            self.history.clear()
+
+
+class Session:
+    def __init__(self, budget_mb=DEFAULT_BUDGET_MB):
+        self.budget = budget_mb * 1024 * 1024
+        self.documents = []
+        self.active = None
+        self._clock = 0
+        self._directory = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="belge")
+
+    def __len__(self):
+        return len(self.documents)
+
+    def index(self, document):
+        return self.documents.index(document)
+
+    def add(self, document):
+        # Belgeyi sona ekleyip etkinleştirir; dizinini döndürür
+        self.documents.append(document)
+        self.activate(len(self.documents) - 1)
+        return len(self.documents) - 1
+
+    def activate(self, index):
+        # Belge taşınıyorsa images() taşıma bitince okur
+        document = self.documents[index]
+        self.active = document
+        self._clock += 1
+        document.last_used = self._clock
+        document.images()
+        self.enforce_budget()
+        return document
+
+    def remove(self, index):
+        # Belge taşınıyorsa discard() taşıma bitince dosyaları siler
+        document = self.documents.pop(index)
+        if document is self.active:
+            self.active = None
+        document.discard()
+        return document
+
+    def set_budget(self, budget_mb):
+        self.budget = budget_mb * 1024 * 1024
+        self.enforce_budget()
+
+    def memory_bytes(self):
+        return sum(d.memory_bytes() for d in self.documents)
+
+    def disk_bytes(self):
+        return sum(d.disk_bytes() for d in self.documents)
+
+    def enforce_budget(self):
+        # Bütçe aşılıyorsa etkin olmayan belgeler en eski kullanılandan
+        # başlanarak arka planda diske taşınır
+        total = self.memory_bytes()
+        if total <= self.budget:
+            return
+        if self._directory is None:
+            import tiled
+            self._directory = tiled.scratch_directory()
+        idle = sorted((d for d in self.documents if d is not self.active and not d.is_spilled()),
+                      key=lambda d: d.last_used)
+        for document in idle:
+            if total <= self.budget:
+                break
+            total -= document.memory_bytes()
+            self._executor.submit(document.spill, self._directory,
+                                  lambda document=document: document is self.active)
+
+    def wait(self):
+        # Test ve kapanış için: kuyruktaki taşımaların bitmesini bekle
+        self._executor.submit(lambda: None).result()
+
+    def close(self):
+        # Bekleyen taşımalar iptal edilir; diskteki dosyalar silinir
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for document in self.documents:
+            document.discard()
+        self.documents = []
+        self.active = None
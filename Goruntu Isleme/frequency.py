@@ -0,0 +1,208 @@
+# Frekans alanı filtreleri
+#
+# Maskeler iç içe Python döngüleri yerine yayınlanan (broadcast) uzaklık
+# ızgaralarıyla üretilir ve (boyut, filtre tipi, parametreler) anahtarıyla
+# LRU önbellekte tutulur. Aynı boyutta tekrar filtreleme yalnızca bir
+# çarpma işlemi kadar sürer.
+#
+# Tüm frekans işlemleri ortak bir FFT altyapısını kullanır: gerçek girişli
+# dönüşüm (rfft2), scipy.fft iş parçacıkları, hızlı FFT uzunluklarına
+# doldurma ve isteğe bağlı complex64 hassasiyeti.
+#
+# Renkli görüntülerde üç kanal, kanal ekseni üzerinden tek bir toplu FFT
+# çağrısıyla filtrelenir ("rgb") ya da yalnızca YCrCb parlaklık kanalı
+# filtrelenip renk bilgisi korunur ("luminance").
+from functools import lru_cache
+
+import cv2
+import numpy as np
+from scipy import fft as sfft
+
+MASK_CACHE_SIZE = 32
+
+# scipy.fft iş parçacığı sayısı (-1: tüm çekirdekler)
+FFT_WORKERS = -1
+
+# "double" (complex128) veya "single" (complex64)
+DEFAULT_PRECISION = "double"
+
+_PRECISIONS = {"double": np.float64, "single": np.float32}
+
+# Frekans işlemlerinin renk modları
+COLOR_MODES = ("gray", "rgb", "luminance")
+
+
+def _frequency_axes(shape, fft_shape):
+    # rfft2 düzeninde (fftshift'siz, son eksen yarım) frekans koordinatları.
+    # Doldurulmuş ızgaradaki frekanslar orijinal boyutun kutu birimine
+    # ölçeklenir; böylece kesme frekansları doldurmadan etkilenmez.
+    rows, cols = shape
+    y = sfft.fftfreq(fft_shape[0]) * rows
+    x = sfft.rfftfreq(fft_shape[1]) * cols
+    return y.astype(np.float32)[:, None], x.astype(np.float32)[None, :]
+
+
+def _squared_distance(axes):
+    y, x = axes
+    return y * y + x * x
+
+
+def _box(axes, r):
+    # mask[crow-r:crow+r, ccol-r:ccol+r] dilimiyle aynı kare bölge
+    y, x = axes
+    return ((y >= -r) & (y < r)) & ((x >= -r) & (x < r))
+
+
+def _ideal_lpf(axes, radius=30):
+    return _box(axes, radius)
+
+
+def _ideal_hpf(axes, radius=30):
+    return ~_box(axes, radius)
+
+
+def _band_pass(axes, outer=50, inner=20):
+    return ~_box(axes, outer) | _box(axes, inner)
+
+
+def _band_stop(axes, outer=50, inner=20):
+    return ~_box(axes, inner)
+
+
+def _gaussian(axes, sigma=30):
+    return np.exp(-_squared_distance(axes) / (2 * sigma ** 2))
+
+
+def _gaussian_hpf(axes, sigma=30):
+    return 1 - _gaussian(axes, sigma)
+
+
+def _butterworth(axes, cutoff=30, order=2):
+    # (D/D0)^(2n) = (D^2/D0^2)^n, karekök almaya gerek yok
+    return 1 / (1 + (_squared_distance(axes) / cutoff ** 2) ** order)
+
+
+def _homomorphic(axes, high=2.5, low=0.5, cutoff=10, c=1):
+    d2 = _squared_distance(axes)
+    return (high - low) * (1 - np.exp(-c * d2 / (cutoff * cutoff))) + low
+
+
+MASK_BUILDERS = {
+    "lpf": _ideal_lpf,
+    "hpf": _ideal_hpf,
+    "band_pass": _band_pass,
+    "band_stop": _band_stop,
+    "gaussian": _gaussian,
+    "gaussian_hpf": _gaussian_hpf,
+    "butterworth": _butterworth,
+    "homomorphic": _homomorphic,
+}
+
+
+@lru_cache(maxsize=MASK_CACHE_SIZE)
+def _cached_mask(shape, fft_shape, filter_type, params):
+    builder = MASK_BUILDERS.get(filter_type)
+    if builder is None:
+        raise ValueError(f"Bilinmeyen filtre tipi: {filter_type}")
+    axes = _frequency_axes(shape, fft_shape)
+    mask = np.asarray(builder(axes, **dict(params)), dtype=np.float32)
+    # Önbellekteki maske paylaşıldığı için yanlışlıkla değiştirilmesin
+    mask.setflags(write=False)
+    return mask
+
+
+def get_mask(shape, filter_type, fft_shape=None, **params):
+    # Maske rfft2 çıktısıyla aynı (fft_shape[0], fft_shape[1] // 2 + 1) boyuttadır
+    shape = tuple(int(s) for s in shape[:2])
+    fft_shape = fast_shape(shape) if fft_shape is None else tuple(fft_shape)
+    return _cached_mask(shape, fft_shape, filter_type, tuple(sorted(params.items())))
+
+
+def clear_mask_cache():
+    _cached_mask.cache_clear()
+
+
+def fast_shape(shape):
+    # Her eksen için küçük asal çarpanlı (hızlı) en yakın FFT uzunluğu
+    return tuple(sfft.next_fast_len(int(n), real=True) for n in shape[:2])
+
+
+def forward(image, fft_shape=None, precision=None):
+    # (..., H, W) dizisini hızlı boyuta yansıtarak doldurur ve son iki eksen
+    # üzerinde gerçek girişli FFT alır. Yansıtma, sıfır doldurmanın kenarlarda
+    # oluşturacağı sıçramaları önler.
+    dtype = _PRECISIONS[precision or DEFAULT_PRECISION]
+    rows, cols = image.shape[-2:]
+    fft_shape = fast_shape((rows, cols)) if fft_shape is None else fft_shape
+    pad = [(0, 0)] * (image.ndim - 2)
+    pad += [(0, fft_shape[0] - rows), (0, fft_shape[1] - cols)]
+    data = np.asarray(image, dtype=dtype)
+    if pad[-2][1] or pad[-1][1]:
+        data = np.pad(data, pad, mode="reflect" if min(rows, cols) > 1 else "edge")
+    return sfft.rfft2(data, workers=FFT_WORKERS)
+
+
+def inverse(spectrum, fft_shape, shape):
+    # Ters dönüşüm ve orijinal boyuta kırpma
+    data = sfft.irfft2(spectrum, s=fft_shape, workers=FFT_WORKERS, overwrite_x=True)
+    return data[..., :shape[0], :shape[1]]
+
+
+def filter_image(image, filter_type, precision=None, **params):
+    # (H, W) veya (H, W, C) görüntüye frekans maskesi uygular; gerçek değerli
+    # sonuç döner. Çok kanallı görüntülerde kanallar öne alınır, böylece tüm
+    # kanallar bitişik bellekte tek bir toplu FFT çağrısıyla dönüştürülür.
+    shape = image.shape[:2]
+    fft_shape = fast_shape(shape)
+    dtype = _PRECISIONS[precision or DEFAULT_PRECISION]
+    if image.ndim == 3:
+        image = np.ascontiguousarray(np.moveaxis(image, -1, 0), dtype=dtype)
+    spectrum = forward(image, fft_shape, precision)
+    spectrum *= get_mask(shape, filter_type, fft_shape, **params)
+    result = inverse(spectrum, fft_shape, shape)
+    if result.ndim == 3:
+        result = np.moveaxis(result, 0, -1)
+    return result
+
+
+def correlate(padded, kernel, precision=None):
+    # Uzamsal çekirdekle FFT üzerinden korelasyon (cv2.filter2D ile aynı yön).
+    # padded, çekirdek boyutu kadar kenar payı eklenmiş (H+kh-1, W+kw-1) veya
+    # (..., C) dizidir; yalnızca geçerli (H, W) bölge döner. Dairesel evrişim
+    # geçerli bölgede başa sarmaz, bu yüzden hızlı boyuta doldurmak yeterlidir.
+    kh, kw = kernel.shape
+    shape = padded.shape[:2]
+    fft_shape = fast_shape(shape)
+    dtype = _PRECISIONS[precision or DEFAULT_PRECISION]
+    if padded.ndim == 3:
+        padded = np.ascontiguousarray(np.moveaxis(padded, -1, 0), dtype=dtype)
+    spectrum = forward(padded, fft_shape, precision)
+    spectrum *= sfft.rfft2(np.asarray(kernel[::-1, ::-1], dtype), s=fft_shape,
+                           workers=FFT_WORKERS)
+    result = inverse(spectrum, fft_shape, shape)[..., kh - 1:, kw - 1:]
+    if result.ndim == 3:
+        result = np.moveaxis(result, 0, -1)
+    return result
+
+
+def to_filter_input(image, color_mode="gray"):
+    # RGB görüntüyü seçilen renk moduna göre filtrelenecek veriye çevirir.
+    # İkinci değer, sonucu RGB'ye geri çevirmek için gereken YCrCb görüntüsüdür.
+    if color_mode == "gray":
+        return cv2.cvtColor(image, cv2.COLOR_RGB2GRAY), None
+    if color_mode == "rgb":
+        return image, None
+    if color_mode == "luminance":
+        ycrcb = cv2.cvtColor(image, cv2.COLOR_RGB2YCrCb)
+        return ycrcb[:, :, 0], ycrcb
+    raise ValueError(f"Bilinmeyen renk modu: {color_mode}")
+
+
+def from_filter_output(result, color_mode="gray", ycrcb=None):
+    # Filtrelenmiş uint8 veriyi tekrar RGB görüntüye çevirir
+    if color_mode == "rgb":
+        return np.ascontiguousarray(result)
+    if color_mode == "luminance":
+        ycrcb[:, :, 0] = result
+        return cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2RGB)
+    return cv2.cvtColor(result, cv2.COLOR_GRAY2RGB)
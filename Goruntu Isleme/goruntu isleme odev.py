@@ -1,21 +1,128 @@
 import sys
-import cv2
-import numpy as np
+import time
+_IMPORT_START = time.perf_counter()
+import importlib.util
+import os
+import types
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QPushButton, QLabel, QFileDialog, 
                            QSlider, QMessageBox, QTabWidget, QGroupBox,
                            QScrollArea, QSpinBox, QDoubleSpinBox, QComboBox,
-                           QCheckBox, QDialog, QDialogButtonBox)
-from PyQt6.QtCore import Qt, QPoint, QRect
-from PyQt6.QtGui import QImage, QPixmap, QPalette, QColor, QPainter, QPen, QBrush
-from scipy.fft import fft2, ifft2, fftshift
-from PIL import Image, ImageEnhance
-import os
-import matplotlib
-matplotlib.use('Qt5Agg')  # Qt5Agg backend'i kullan
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+                           QCheckBox, QDialog, QDialogButtonBox, QProgressBar,
+                           QLineEdit, QTabBar)
+from PyQt6.QtCore import Qt, QPoint, QPointF, QRect, QTimer
+from PyQt6.QtGui import (QImage, QPixmap, QPalette, QColor, QPainter, QPen, QBrush,
+                         QKeySequence, QPolygonF)
+
+
+def lazy_import(name):
+    # Modülü gerçekten ilk kullanıldığında (ilk öznitelik erişiminde) yükler.
+    # sys.modules'e kaydedildiği için diğer modüllerin içe aktarmaları da
+    # aynı tembel modülü görür; böylece OpenCV/NumPy pencere açıldıktan
+    # sonra, ilk görüntü işlenirken yüklenir.
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+np = lazy_import("numpy")
+cv2 = lazy_import("cv2")
+ops = lazy_import("operations")
+point_ops = lazy_import("point_ops")
+image_io = lazy_import("image_io")
+hough_ops = lazy_import("hough_ops")
+tiled = lazy_import("tiled")
+convolution = lazy_import("convolution")
+from recipe import Recipe, format_timings
+from workers import OperationRunner
+from history import History, make_delta, DEFAULT_BUDGET_MB
+from documents import Document, Session, DEFAULT_BUDGET_MB as DEFAULT_SESSION_BUDGET_MB
+
+# Açılış süreleri: (adım, saniye); --startup-report ile yazdırılır
+STARTUP_TIMINGS = [("içe aktarmalar", time.perf_counter() - _IMPORT_START)]
+# Açılışta yüklenmemesi gereken ağır modüller; ilk sekme kurulmadan önce
+# gerçekten yüklenmiş olanlar STARTUP_LOADED'a yazılır ve raporda gösterilir
+HEAVY_MODULES = ("numpy", "cv2", "scipy")
+STARTUP_LOADED = []
+
+
+def loaded_modules(names):
+    # lazy_import'un yer tutucuları sys.modules'te durur ama ilk öznitelik
+    # erişimine kadar yüklenmez; yüklenince sınıfları düz ModuleType olur
+    return [name for name in names if type(sys.modules.get(name)) is types.ModuleType]
+
+# Önizleme (proxy) olarak yüklenen görüntülerin en uzun kenarı
+PROXY_MAX_SIZE = 1024
+# Kısa işlemlerde ilerleme çubuğu yanıp sönmesin diye gösterme gecikmesi (ms)
+PROGRESS_DELAY_MS = 150
+# Kaydırıcı sürüklenirken önizleme en fazla bu aralıkla (ms, ~30 fps) ve
+# ekran boyutundaki küçültülmüş kopya üzerinde hesaplanır
+PREVIEW_INTERVAL_MS = 33
+# Görüntü panellerinin boyutu (piksel)
+DISPLAY_SIZE = 400
+# Histogram paneli en fazla bu kadar pikseli sayar (büyük görüntülerde
+# satırlar örneklenir; 24 MP'de bile tek kareden kısa sürer)
+HISTOGRAM_MAX_PIXELS = 1 << 20
+
+
+def array_to_pixmap(image, size):
+    # RGB (ya da gri) uint8 diziyi en fazla size x size piksellik pixmap'e
+    # çevirir. Büyük görüntüler panel boyutuna küçültülerek dönüştürülür:
+    # önce yalnızca panel boyutunun yaklaşık iki katı kadar satır/sütun
+    # seçilir, ardından INTER_AREA ile ortalanır. Böylece 50 MP'lik bir
+    # görüntünün dönüşümü 400 px'lik bir görüntününkiyle hemen hemen aynı
+    # tutar. QImage dizinin belleğini kopyalamadan kullanır.
+    height, width = image.shape[:2]
+    ratio = size / max(height, width)
+    if ratio < 1:
+        step = max(1, int(1 / ratio) // 2)
+        image = cv2.resize(image[::step, ::step],
+                           (max(1, int(width * ratio)), max(1, int(height * ratio))),
+                           interpolation=cv2.INTER_AREA)
+        height, width = image.shape[:2]
+    elif not image.flags.c_contiguous:
+        image = np.ascontiguousarray(image)
+    fmt = QImage.Format.Format_Grayscale8 if image.ndim == 2 else QImage.Format.Format_RGB888
+    q_img = QImage(image.data, width, height, image.strides[0], fmt)
+    pixmap = QPixmap.fromImage(q_img)
+    if ratio > 1:
+        pixmap = pixmap.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio)
+    return pixmap
+
+class HistogramWidget(QWidget):
+    # Ana penceredeki RGB histogram paneli, QPainter ile çizilir
+    COLORS = (QColor(255, 80, 80), QColor(80, 220, 80), QColor(90, 150, 255))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.hist = None
+        self.setMinimumHeight(120)
+
+    def set_image(self, image):
+        self.hist = None if image is None else point_ops.histograms(image, HISTOGRAM_MAX_PIXELS)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor('#353535'))
+        if self.hist is None:
+            return
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        w, h = self.width() - 1, self.height() - 1
+        peak = self.hist.max() or 1
+        xs = np.linspace(0, w, 256)
+        for values, color in zip(self.hist, self.COLORS):
+            ys = h - values / peak * h
+            painter.setPen(QPen(color, 1.5))
+            painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs, ys)]))
+
 
 class CropWidget(QLabel):
     def __init__(self, pixmap, parent=None):
@@ -206,6 +313,15 @@ class ImageProcessor(QMainWindow):
         left_panel = QWidget()
         left_layout = QVBoxLayout(left_panel)
         
+        # Açık belgeler; her sekmenin kendi görüntüleri, tarifi ve geçmişi vardır
+        self.document_tabs = QTabBar()
+        self.document_tabs.setTabsClosable(True)
+        self.document_tabs.setExpanding(False)
+        self.document_tabs.setDocumentMode(True)
+        self.document_tabs.currentChanged.connect(self.switch_document)
+        self.document_tabs.tabCloseRequested.connect(self.close_document)
+        left_layout.addWidget(self.document_tabs)
+
         # Görüntü paneli
         images_widget = QWidget()
         images_layout = QHBoxLayout(images_widget)
@@ -229,6 +345,13 @@ class ImageProcessor(QMainWindow):
         images_layout.addWidget(processed_group)
         
         left_layout.addWidget(images_widget)
+
+        # İşlenmiş görüntünün histogramı; her işlemden sonra güncellenir
+        self.histogram_group = QGroupBox("Histogram (Kırmızı / Yeşil / Mavi)")
+        histogram_panel_layout = QVBoxLayout(self.histogram_group)
+        self.histogram_widget = HistogramWidget()
+        histogram_panel_layout.addWidget(self.histogram_widget)
+        left_layout.addWidget(self.histogram_group)
         
         # Dosya işlem butonları
         file_buttons = QWidget()
@@ -245,8 +368,39 @@ class ImageProcessor(QMainWindow):
         btn_reset = QPushButton("Orijinale Dön")
         btn_reset.clicked.connect(self.reset_image)
         file_layout.addWidget(btn_reset)
+
+        self.btn_undo = QPushButton("Geri Al")
+        self.btn_undo.setShortcut(QKeySequence.StandardKey.Undo)
+        self.btn_undo.clicked.connect(self.undo)
+        file_layout.addWidget(self.btn_undo)
+
+        self.btn_redo = QPushButton("Yinele")
+        self.btn_redo.setShortcut(QKeySequence.StandardKey.Redo)
+        self.btn_redo.clicked.connect(self.redo)
+        file_layout.addWidget(self.btn_redo)
         
         left_layout.addWidget(file_buttons)
+
+        # Tarif butonları
+        recipe_buttons = QWidget()
+        recipe_layout = QHBoxLayout(recipe_buttons)
+
+        self.recipe_label = QLabel("Tarif: 0 adım")
+        recipe_layout.addWidget(self.recipe_label)
+
+        btn_save_recipe = QPushButton("Tarifi Kaydet")
+        btn_save_recipe.clicked.connect(self.save_recipe)
+        recipe_layout.addWidget(btn_save_recipe)
+
+        btn_load_recipe = QPushButton("Tarif Uygula")
+        btn_load_recipe.clicked.connect(self.load_recipe)
+        recipe_layout.addWidget(btn_load_recipe)
+
+        btn_full_res = QPushButton("Tam Çözünürlükte Uygula")
+        btn_full_res.clicked.connect(self.apply_recipe_full_resolution)
+        recipe_layout.addWidget(btn_full_res)
+
+        left_layout.addWidget(recipe_buttons)
         main_layout.addWidget(left_panel)
 
         # Sağ panel (sekmeli kontrol paneli)
@@ -256,17 +410,37 @@ class ImageProcessor(QMainWindow):
         # Sekmeli widget
         self.tab_widget = QTabWidget()
         
-        # Sekmeleri oluştur
-        self.create_basic_tab()      # Temel İşlemler
-        self.create_color_tab()      # Renk İşlemleri
-        self.create_geometric_tab()  # Geometrik Dönüşümler
-        self.create_filter_tab()     # Filtreleme İşlemleri
-        self.create_frequency_tab()  # Frekans Alanı İşlemleri
-        self.create_crop_tab()       # Kırpma
-        self.create_edge_tab()       # Kenar Bulma
-        self.create_morph_tab()      # Morfolojik İşlemler
-        self.create_segment_tab()    # Segmentasyon
-        self.create_advanced_filter_tab() # Gelişmiş Filtreler
+        # Sekmeleri oluştur. İçerikleri ilk kez açıldıklarında kurulur; açılışta
+        # yalnızca görünen ilk sekme hazırlanır.
+        tabs_start = time.perf_counter()
+        # Frekans renk modu bu sekmede gösterilir ama Gelişmiş Filtreler
+        # sekmesindeki Gaussian LPF/HPF de kullanır; sekmeler tembel
+        # kurulduğu için hangisi önce açılırsa açılsın hazır olmalı
+        self.frequency_color_mode = QComboBox()
+        self.frequency_color_mode.addItem("Gri Ton", "gray")
+        self.frequency_color_mode.addItem("Renkli (RGB kanalları)", "rgb")
+        self.frequency_color_mode.addItem("Renkli (YCrCb parlaklık)", "luminance")
+
+        self.tab_builders = {}
+        for title, builder in (
+                ("Temel İşlemler", self.create_basic_tab),
+                ("Renk İşlemleri", self.create_color_tab),
+                ("Geometrik İşlemler", self.create_geometric_tab),
+                ("Filtreleme", self.create_filter_tab),
+                ("Frekans İşlemleri", self.create_frequency_tab),
+                ("Kırpma", self.create_crop_tab),
+                ("Kenar Bulma", self.create_edge_tab),
+                ("Morfolojik İşlemler", self.create_morph_tab),
+                ("Segmentasyon", self.create_segment_tab),
+                ("Gelişmiş Filtreler", self.create_advanced_filter_tab)):
+            page = QWidget()
+            page_layout = QVBoxLayout(page)
+            page_layout.setContentsMargins(0, 0, 0, 0)
+            self.tab_builders[self.tab_widget.addTab(page, title)] = builder
+        self.tab_widget.currentChanged.connect(self.build_tab)
+        STARTUP_LOADED[:] = loaded_modules(HEAVY_MODULES)
+        self.build_tab(self.tab_widget.currentIndex())
+        STARTUP_TIMINGS.append(("  ilk sekme", time.perf_counter() - tabs_start))
         
         # Scroll Area içine tab widget'ı ekle
         scroll = QScrollArea()
@@ -280,11 +454,86 @@ class ImageProcessor(QMainWindow):
         # Görüntü değişkenleri
         self.original_image = None
         self.processed_image = None
+        self.image_path = None
+        self.image_grayscale = False
+        self.is_proxy = False
+        self.is_tiled = False
+        self.recipe = Recipe()
+        self.history = History()
+        self.session = Session()
         self.perspective_points = []
         self.is_selecting_points = False
         self.is_cropping = False
         self.crop_points = []
         self.crop_rect = None
+        # Panellerde şu an gösterilen diziler (değişmedikçe yeniden çizilmez)
+        self.displayed_original = None
+        self.displayed_processed = None
+
+        # Arka plan işlemleri ve durum çubuğu
+        self.runner = OperationRunner(self)
+        # Görüntü yükleme ayrı çalışır; yüklenirken başlatılan işlem onu iptal etmez
+        self.loader = OperationRunner(self, max_workers=1)
+        self.loading_previous = (None, None)
+        # Kaydetme de ayrı çalışır; son kullanılan biçim ayarları hatırlanır
+        self.saver = OperationRunner(self, max_workers=1)
+        self.save_options = {"png_compression": 3, "jpeg_quality": 95, "jpeg_progressive": False,
+                             "webp_quality": 90, "webp_lossless": False, "tiff_compression": "lzw"}
+        self.status_label = QLabel()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)  # Süresi belirsiz (meşgul) gösterim
+        self.progress_bar.setMaximumWidth(150)
+        self.cancel_button = QPushButton("İptal")
+        self.cancel_button.clicked.connect(self.cancel_operation)
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setSingleShot(True)
+        self.progress_timer.timeout.connect(self.show_progress)
+        # Geri alma geçmişinin bellek/disk kullanımı ve bellek bütçesi
+        self.history_label = QLabel()
+        self.history_budget = QSpinBox()
+        self.history_budget.setRange(16, 16384)
+        self.history_budget.setSingleStep(64)
+        self.history_budget.setValue(DEFAULT_BUDGET_MB)
+        self.history_budget.setPrefix("Geçmiş bütçesi: ")
+        self.history_budget.setSuffix(" MB")
+        self.history_budget.valueChanged.connect(self.set_history_budget)
+        # Tüm belgelerin ortak bellek bütçesi; aşılınca eski belgeler diske taşınır
+        self.session_label = QLabel()
+        self.session_budget = QSpinBox()
+        self.session_budget.setRange(64, 65536)
+        self.session_budget.setSingleStep(256)
+        self.session_budget.setValue(DEFAULT_SESSION_BUDGET_MB)
+        self.session_budget.setPrefix("Belge bütçesi: ")
+        self.session_budget.setSuffix(" MB")
+        self.session_budget.valueChanged.connect(self.set_session_budget)
+        status_bar = self.statusBar()
+        status_bar.addWidget(self.history_label)
+        status_bar.addWidget(self.history_budget)
+        status_bar.addWidget(self.session_label)
+        status_bar.addWidget(self.session_budget)
+        status_bar.addPermanentWidget(self.status_label)
+        status_bar.addPermanentWidget(self.progress_bar)
+        status_bar.addPermanentWidget(self.cancel_button)
+        self.set_progress_visible(False)
+        self.runner.started.connect(self.on_operation_started)
+        self.runner.idle.connect(self.on_operation_idle)
+        self.loader.started.connect(self.on_operation_started)
+        self.loader.idle.connect(self.on_operation_idle)
+        self.saver.started.connect(self.on_operation_started)
+        self.saver.idle.connect(self.on_operation_idle)
+        self.update_history_label()
+
+        # Kaydırıcı önizlemesi: değişiklikler biriktirilip kare hızında işlenir
+        self.preview_cache = None  # (kaynak görüntü, küçültülmüş kopya)
+        self.pending_preview = None
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.timeout.connect(self.flush_preview)
+        self.slider_operations = {
+            "brightness": (self.brightness_slider, self.adjust_brightness),
+            "contrast": (self.contrast_slider, self.adjust_contrast),
+            "threshold": (self.threshold_slider, self.apply_threshold),
+        }
 
     def create_basic_tab(self):
         basic_tab = QWidget()
@@ -299,7 +548,8 @@ class ImageProcessor(QMainWindow):
         self.brightness_slider.setMinimum(-100)
         self.brightness_slider.setMaximum(100)
         self.brightness_slider.setValue(0)
-        self.brightness_slider.valueChanged.connect(self.adjust_brightness)
+        self.brightness_slider.valueChanged.connect(lambda: self.preview_slider("brightness"))
+        self.brightness_slider.sliderReleased.connect(lambda: self.preview_slider("brightness"))
         adjust_layout.addWidget(self.brightness_slider)
         
         adjust_layout.addWidget(QLabel("Kontrast"))
@@ -307,7 +557,8 @@ class ImageProcessor(QMainWindow):
         self.contrast_slider.setMinimum(-100)
         self.contrast_slider.setMaximum(100)
         self.contrast_slider.setValue(0)
-        self.contrast_slider.valueChanged.connect(self.adjust_contrast)
+        self.contrast_slider.valueChanged.connect(lambda: self.preview_slider("contrast"))
+        self.contrast_slider.sliderReleased.connect(lambda: self.preview_slider("contrast"))
         adjust_layout.addWidget(self.contrast_slider)
         
         layout.addWidget(adjust_group)
@@ -320,7 +571,8 @@ class ImageProcessor(QMainWindow):
         self.threshold_slider.setMinimum(0)
         self.threshold_slider.setMaximum(255)
         self.threshold_slider.setValue(127)
-        self.threshold_slider.valueChanged.connect(self.apply_threshold)
+        self.threshold_slider.valueChanged.connect(lambda: self.preview_slider("threshold"))
+        self.threshold_slider.sliderReleased.connect(lambda: self.preview_slider("threshold"))
         threshold_layout.addWidget(QLabel("Eşik Değeri"))
         threshold_layout.addWidget(self.threshold_slider)
         
@@ -341,7 +593,7 @@ class ImageProcessor(QMainWindow):
         layout.addWidget(histogram_group)
         
         layout.addStretch()
-        self.tab_widget.addTab(basic_tab, "Temel İşlemler")
+        return basic_tab
 
     def create_color_tab(self):
         color_tab = QWidget()
@@ -365,7 +617,7 @@ class ImageProcessor(QMainWindow):
         
         layout.addWidget(color_group)
         layout.addStretch()
-        self.tab_widget.addTab(color_tab, "Renk İşlemleri")
+        return color_tab
 
     def create_geometric_tab(self):
         geometric_tab = QWidget()
@@ -441,7 +693,7 @@ class ImageProcessor(QMainWindow):
         
         layout.addWidget(advanced_group)
         layout.addStretch()
-        self.tab_widget.addTab(geometric_tab, "Geometrik İşlemler")
+        return geometric_tab
 
     def create_filter_tab(self):
         filter_tab = QWidget()
@@ -451,9 +703,11 @@ class ImageProcessor(QMainWindow):
         basic_filter_group = QGroupBox("Temel Filtreler")
         basic_filter_layout = QVBoxLayout(basic_filter_group)
         
-        # Filtre boyutu seçimi
-        self.kernel_size = QComboBox()
-        self.kernel_size.addItems(['3x3', '5x5', '7x7'])
+        # Filtre boyutu seçimi (tek sayı; büyük boyutlarda da maliyet sabit kalır)
+        self.kernel_size = QSpinBox()
+        self.kernel_size.setRange(3, 201)
+        self.kernel_size.setSingleStep(2)
+        self.kernel_size.setValue(3)
         basic_filter_layout.addWidget(QLabel("Filtre Boyutu:"))
         basic_filter_layout.addWidget(self.kernel_size)
         
@@ -475,22 +729,47 @@ class ImageProcessor(QMainWindow):
         advanced_filter_group = QGroupBox("İleri Filtreler")
         advanced_filter_layout = QVBoxLayout(advanced_filter_group)
         
+        conservative_layout = QHBoxLayout()
+        conservative_layout.addWidget(QLabel("Konservatif Boyut:"))
+        self.conservative_size = QSpinBox()
+        self.conservative_size.setRange(3, 31)
+        self.conservative_size.setSingleStep(2)
+        self.conservative_size.setValue(3)
+        conservative_layout.addWidget(self.conservative_size)
+        advanced_filter_layout.addLayout(conservative_layout)
+
         btn_conservative = QPushButton("Konservatif Filtre")
         btn_conservative.clicked.connect(self.apply_conservative_filter)
         advanced_filter_layout.addWidget(btn_conservative)
         
+        crimmins_layout = QHBoxLayout()
+        crimmins_layout.addWidget(QLabel("Crimmins Yineleme:"))
+        self.crimmins_iterations = QSpinBox()
+        self.crimmins_iterations.setRange(1, ops.CRIMMINS_MAX_ITERATIONS)
+        self.crimmins_iterations.setValue(1)
+        crimmins_layout.addWidget(self.crimmins_iterations)
+        self.crimmins_until_stable = QCheckBox("Kararlı olana kadar")
+        self.crimmins_until_stable.toggled.connect(
+            lambda checked: self.crimmins_iterations.setEnabled(not checked))
+        crimmins_layout.addWidget(self.crimmins_until_stable)
+        advanced_filter_layout.addLayout(crimmins_layout)
+
         btn_crimmins = QPushButton("Crimmins Speckle")
         btn_crimmins.clicked.connect(self.apply_crimmins)
         advanced_filter_layout.addWidget(btn_crimmins)
         
         layout.addWidget(advanced_filter_group)
         layout.addStretch()
-        self.tab_widget.addTab(filter_tab, "Filtreleme")
+        return filter_tab
 
     def create_frequency_tab(self):
         frequency_tab = QWidget()
         layout = QVBoxLayout(frequency_tab)
 
+        # Renk modu seçimi (__init__'te oluşturulur)
+        layout.addWidget(QLabel("Renk Modu:"))
+        layout.addWidget(self.frequency_color_mode)
+
         # Fourier Dönüşümleri grubu
         fourier_group = QGroupBox("Fourier Dönüşümleri")
         fourier_layout = QVBoxLayout(fourier_group)
@@ -537,7 +816,7 @@ class ImageProcessor(QMainWindow):
         
         layout.addWidget(special_group)
         layout.addStretch()
-        self.tab_widget.addTab(frequency_tab, "Frekans İşlemleri")
+        return frequency_tab
 
     def create_crop_tab(self):
         crop_tab = QWidget()
@@ -546,7 +825,7 @@ class ImageProcessor(QMainWindow):
         btn_crop.clicked.connect(self.start_crop)
         layout.addWidget(btn_crop)
         layout.addStretch()
-        self.tab_widget.addTab(crop_tab, "Kırpma")
+        return crop_tab
 
     def create_edge_tab(self):
         edge_tab = QWidget()
@@ -560,9 +839,18 @@ class ImageProcessor(QMainWindow):
         btn_roberts = QPushButton("Roberts Cross")
         btn_roberts.clicked.connect(self.apply_roberts)
         layout.addWidget(btn_roberts)
+        self.compass_family = QComboBox()
+        self.compass_family.addItem("Kirsch", "kirsch")
+        self.compass_family.addItem("Robinson", "robinson")
+        self.compass_family.addItem("Prewitt (pusula)", "prewitt")
+        layout.addWidget(QLabel("Compass Çekirdekleri:"))
+        layout.addWidget(self.compass_family)
         btn_compass = QPushButton("Compass")
         btn_compass.clicked.connect(self.apply_compass)
         layout.addWidget(btn_compass)
+        btn_compass_directions = QPushButton("Compass Yön Haritası")
+        btn_compass_directions.clicked.connect(self.apply_compass_directions)
+        layout.addWidget(btn_compass_directions)
         btn_canny = QPushButton("Canny")
         btn_canny.clicked.connect(self.apply_canny)
         layout.addWidget(btn_canny)
@@ -572,32 +860,172 @@ class ImageProcessor(QMainWindow):
         btn_gabor = QPushButton("Gabor")
         btn_gabor.clicked.connect(self.apply_gabor)
         layout.addWidget(btn_gabor)
+
+        # Hough grubu
+        hough_group = QGroupBox("Hough Dönüşümü")
+        hough_layout = QVBoxLayout(hough_group)
+        self.hough_mode = QComboBox()
+        self.hough_mode.addItem("Standart doğrular", "standard")
+        self.hough_mode.addItem("Olasılıksal doğru parçaları", "probabilistic")
+        self.hough_mode.addItem("Çemberler", "circles")
+        hough_layout.addWidget(self.hough_mode)
+
+        def spin_row(*fields):
+            # [(etiket, en küçük, en büyük, değer), ...] -> bir satırda spin kutuları
+            row = QHBoxLayout()
+            spins = []
+            for label, low, high, value in fields:
+                row.addWidget(QLabel(label))
+                spin = QSpinBox()
+                spin.setRange(low, high)
+                spin.setValue(value)
+                row.addWidget(spin)
+                spins.append(spin)
+            hough_layout.addLayout(row)
+            return spins
+
+        self.hough_canny_low, self.hough_canny_high = spin_row(
+            ("Canny Alt:", 0, 1000, 50), ("Üst:", 0, 1000, 150))
+        self.hough_threshold, self.hough_max_lines = spin_row(
+            ("Eşik:", 1, 10000, hough_ops.DEFAULT_THRESHOLDS["standard"]),
+            ("En fazla (0: sınırsız):", 0, 100000, 100))
+        self.hough_min_length, self.hough_max_gap = spin_row(
+            ("En kısa parça:", 0, 100000, 50), ("En büyük boşluk:", 0, 10000, 10))
+        self.hough_min_radius, self.hough_max_radius, self.hough_min_distance = spin_row(
+            ("Yarıçap:", 0, 100000, 0), ("-", 0, 100000, 0), ("Merkez aralığı:", 1, 100000, 20))
+
+        downscale_row = QHBoxLayout()
+        downscale_row.addWidget(QLabel("Oylama ölçeği:"))
+        self.hough_downscale = QComboBox()
+        for label, factor in (("Tam", 1.0), ("1/2", 0.5), ("1/4", 0.25)):
+            self.hough_downscale.addItem(label, factor)
+        downscale_row.addWidget(self.hough_downscale)
+        hough_layout.addLayout(downscale_row)
+
+        self.hough_mode.currentIndexChanged.connect(self.update_hough_mode)
+        self.update_hough_mode()
+
         btn_hough = QPushButton("Hough Dönüşümü")
         btn_hough.clicked.connect(self.apply_hough)
-        layout.addWidget(btn_hough)
+        hough_layout.addWidget(btn_hough)
+        self.btn_hough_export = QPushButton("Sonuçları JSON Olarak Kaydet")
+        self.btn_hough_export.clicked.connect(self.export_hough)
+        self.btn_hough_export.setEnabled(False)
+        hough_layout.addWidget(self.btn_hough_export)
+        self.hough_summary = QLabel()
+        hough_layout.addWidget(self.hough_summary)
+        self.hough_result = None
+
+        layout.addWidget(hough_group)
         layout.addStretch()
-        self.tab_widget.addTab(edge_tab, "Kenar Bulma")
+        return edge_tab
+
+    def update_hough_mode(self):
+        # Moda göre ilgili alanları aç, eşiği varsayılana getir
+        mode = self.hough_mode.currentData()
+        self.hough_threshold.setValue(hough_ops.DEFAULT_THRESHOLDS[mode])
+        for spin in (self.hough_min_length, self.hough_max_gap):
+            spin.setEnabled(mode == "probabilistic")
+        for spin in (self.hough_min_radius, self.hough_max_radius, self.hough_min_distance):
+            spin.setEnabled(mode == "circles")
 
     def create_morph_tab(self):
         morph_tab = QWidget()
         layout = QVBoxLayout(morph_tab)
-        btn_erode = QPushButton("Erode")
-        btn_erode.clicked.connect(self.apply_erode)
-        layout.addWidget(btn_erode)
-        btn_dilate = QPushButton("Dilate")
-        btn_dilate.clicked.connect(self.apply_dilate)
-        layout.addWidget(btn_dilate)
+
+        # Yapı Elemanı grubu
+        element_group = QGroupBox("Yapı Elemanı")
+        element_layout = QVBoxLayout(element_group)
+
+        self.morph_shape = QComboBox()
+        self.morph_shape.addItem("Dikdörtgen", "rect")
+        self.morph_shape.addItem("Elips", "ellipse")
+        self.morph_shape.addItem("Artı", "cross")
+        self.morph_shape.addItem("Özel", "custom")
+        element_layout.addWidget(self.morph_shape)
+
+        size_layout = QHBoxLayout()
+        size_layout.addWidget(QLabel("Boyut:"))
+        self.morph_size = QSpinBox()
+        self.morph_size.setRange(1, 301)
+        self.morph_size.setSingleStep(2)
+        self.morph_size.setValue(3)
+        size_layout.addWidget(self.morph_size)
+        element_layout.addLayout(size_layout)
+
+        iterations_layout = QHBoxLayout()
+        iterations_layout.addWidget(QLabel("Yineleme:"))
+        self.morph_iterations = QSpinBox()
+        self.morph_iterations.setRange(1, 50)
+        self.morph_iterations.setValue(1)
+        iterations_layout.addWidget(self.morph_iterations)
+        element_layout.addLayout(iterations_layout)
+
+        # Özel eleman: satırlar ";" ile ayrılmış 0/1 dizisi
+        self.morph_kernel = QLineEdit("010;111;010")
+        self.morph_kernel.setPlaceholderText("ör. 010;111;010")
+        self.morph_kernel.setEnabled(False)
+        element_layout.addWidget(self.morph_kernel)
+        self.morph_shape.currentIndexChanged.connect(self.update_morph_shape)
+
+        layout.addWidget(element_group)
+
+        # İşlemler grubu
+        operations_group = QGroupBox("İşlemler")
+        operations_layout = QVBoxLayout(operations_group)
+        for label, op in (("Erode", "erode"), ("Dilate", "dilate"),
+                          ("Açma (Opening)", "open"), ("Kapama (Closing)", "close"),
+                          ("Morfolojik Gradyan", "gradient"), ("Top-hat", "tophat"),
+                          ("Black-hat", "blackhat")):
+            button = QPushButton(label)
+            button.clicked.connect(lambda checked, op=op: self.apply_morphology(op))
+            operations_layout.addWidget(button)
+
+        layout.addWidget(operations_group)
         layout.addStretch()
-        self.tab_widget.addTab(morph_tab, "Morfolojik İşlemler")
+        return morph_tab
+
+    def update_morph_shape(self):
+        custom = self.morph_shape.currentData() == "custom"
+        self.morph_kernel.setEnabled(custom)
+        self.morph_size.setEnabled(not custom)
 
     def create_segment_tab(self):
         segment_tab = QWidget()
         layout = QVBoxLayout(segment_tab)
+        kmeans_group = QGroupBox("K-means")
+        kmeans_layout = QVBoxLayout(kmeans_group)
+
+        k_layout = QHBoxLayout()
+        k_layout.addWidget(QLabel("Küme Sayısı (K):"))
+        self.kmeans_k = QSpinBox()
+        self.kmeans_k.setRange(2, 32)
+        self.kmeans_k.setValue(4)
+        k_layout.addWidget(self.kmeans_k)
+        k_layout.addWidget(QLabel("Tohum:"))
+        self.kmeans_seed = QSpinBox()
+        self.kmeans_seed.setRange(0, 9999)
+        k_layout.addWidget(self.kmeans_seed)
+        kmeans_layout.addLayout(k_layout)
+
+        # Önceki merkezlerden başlamak benzer görüntülerde hem hızlandırır
+        # hem de küme renklerini tutarlı tutar
+        self.kmeans_warm_start = QCheckBox("Önceki merkezlerden başla")
+        kmeans_layout.addWidget(self.kmeans_warm_start)
+        self.kmeans_labels = QCheckBox("Etiket haritasını göster")
+        kmeans_layout.addWidget(self.kmeans_labels)
+
         btn_kmeans = QPushButton("K-means Segmentasyon")
         btn_kmeans.clicked.connect(self.apply_kmeans)
-        layout.addWidget(btn_kmeans)
+        kmeans_layout.addWidget(btn_kmeans)
+
+        self.kmeans_stats = QLabel()
+        self.kmeans_stats.setTextFormat(Qt.TextFormat.RichText)
+        kmeans_layout.addWidget(self.kmeans_stats)
+
+        layout.addWidget(kmeans_group)
         layout.addStretch()
-        self.tab_widget.addTab(segment_tab, "Segmentasyon")
+        return segment_tab
 
     def create_advanced_filter_tab(self):
         adv_tab = QWidget()
@@ -609,12 +1037,271 @@ class ImageProcessor(QMainWindow):
         btn_gaussian_hpf.clicked.connect(self.apply_gaussian_hpf)
         layout.addWidget(btn_gaussian_hpf)
         layout.addStretch()
-        self.tab_widget.addTab(adv_tab, "Gelişmiş Filtreler")
+        return adv_tab
+
+    def build_tab(self, index):
+        builder = self.tab_builders.pop(index, None)
+        if builder is not None:
+            self.tab_widget.widget(index).layout().addWidget(builder())
+
+    def build_all_tabs(self):
+        for index in list(self.tab_builders):
+            self.build_tab(index)
+
+    def selected_kernel_size(self):
+        # Elle çift sayı girilirse bir üstteki tek sayı kullanılır
+        return self.kernel_size.value() | 1
+
+    def run_operation(self, name, from_original=False, on_details=None, **params):
+        # İşlemi arka planda uygula ve bitince tarife kaydet. Kaydırıcılar her
+        # seferinde orijinal görüntüden hesapladığı için önceki adımları
+        # geçersiz kılar. Yeni bir istek devam eden işin sonucunu geçersiz kılar.
+        # on_details verilirse işlemin ayrıntılı sürümü çalışır ve sonuçla
+        # dönen ayrıntı (ör. küme istatistikleri) bu fonksiyona verilir.
+        # Evrişim seçicisinin seçtiği yollar durum çubuğunda gösterilir.
+        source = self.original_image if from_original else self.processed_image
+        before = self.processed_image
+        recipe_before = list(self.recipe.steps)
+        if self.is_tiled and tiled.supports(name):
+            # Disk üzerinde döşeme döşeme; sonuç da diske eşlenmiş bir dizidir
+            func, cancellable = tiled.process, True
+        elif on_details is not None:
+            func, cancellable = ops.apply_detailed, False
+        else:
+            func, cancellable = ops.apply, name in ops.CANCELLABLE
+
+        recording = convolution.recording
+
+        def compute(*args, **kwargs):
+            # Geri alma farkı da arka planda, sonuçla birlikte hesaplanır
+            with recording() as calls:
+                result = func(*args, **kwargs)
+            details = None
+            if func is ops.apply_detailed:
+                result, details = result
+            delta = make_delta(result, before, None if from_original else name, params)
+            return result, delta, details, calls
+
+        def done(output):
+            result, delta, details, calls = output
+            self.history.push(name, before, result, recipe_before, delta)
+            self.processed_image = result
+            if from_original:
+                self.recipe.clear()
+            self.recipe.add(name, source.shape, **params)
+            self.update_recipe_label()
+            self.update_history_label()
+            self.update_display()
+            if calls:
+                self.status_label.setText(
+                    f"{self.status_label.text()} | evrişim: {convolution.describe(calls)}")
+            if on_details is not None:
+                on_details(details)
+
+        self.runner.submit(name, compute, source, name, **params, on_done=done,
+                           on_error=self.show_operation_error, cancellable=cancellable)
+
+    def set_processed(self, label, image, recipe_steps):
+        # Tek seferde değişen (sıfırlama, tarif) sonuçları geçmişe ekleyerek uygula
+        self.history.push(label, self.processed_image, image, list(self.recipe.steps))
+        self.processed_image = image
+        self.recipe.steps = list(recipe_steps)
+        self.update_recipe_label()
+        self.update_history_label()
+        self.update_display()
+
+    def undo(self):
+        self.step_history(self.history.undo)
+
+    def redo(self):
+        self.step_history(self.history.redo)
+
+    def step_history(self, step):
+        try:
+            if self.processed_image is None:
+                return
+            self.runner.cancel()
+            result = step(self.processed_image, list(self.recipe.steps))
+            if result is None:
+                return
+            self.processed_image, steps = result
+            self.recipe.steps = list(steps)
+            self.update_recipe_label()
+            self.update_history_label()
+            self.update_display()
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Geçmiş geri yüklenirken bir hata oluştu: {str(e)}")
+
+    def set_history_budget(self, value):
+        self.history.set_budget(value)
+        self.update_history_label()
+
+    def update_history_label(self):
+        mb = 1024 * 1024
+        self.history_label.setText(
+            f"Geçmiş: {len(self.history)} adım | bellek {self.history.memory_bytes() / mb:.1f} MB"
+            f" | disk {self.history.disk_bytes() / mb:.1f} MB")
+        self.btn_undo.setEnabled(self.history.can_undo())
+        self.btn_redo.setEnabled(self.history.can_redo())
+        self.update_session_label()
+
+    def initial_processed_image(self):
+        # Döşemeli modda orijinal salt okunur eşlemedir ve işlemler onu
+        # değiştirmez; belleğe tam kopya alınmaz
+        if self.is_tiled:
+            return self.original_image
+        return self.original_image.copy()
+
+    def show_operation_error(self, error):
+        # Parametre hataları (ör. geçersiz kırpma alanı) uyarı olarak gösterilir
+        if isinstance(error, ValueError):
+            QMessageBox.warning(self, "Uyarı", str(error))
+        else:
+            QMessageBox.critical(self, "Hata", f"İşlem sırasında bir hata oluştu: {str(error)}")
+
+    def on_operation_started(self, label):
+        self.status_label.setText(f"{label} çalışıyor...")
+        self.progress_timer.start(PROGRESS_DELAY_MS)
+
+    def on_operation_idle(self, message):
+        self.progress_timer.stop()
+        self.set_progress_visible(False)
+        self.status_label.setText(message)
+
+    def show_progress(self):
+        if self.runner.is_busy() or self.loader.is_busy() or self.saver.is_busy():
+            self.set_progress_visible(True)
+
+    def set_progress_visible(self, visible):
+        self.progress_bar.setVisible(visible)
+        self.cancel_button.setVisible(visible)
+
+    def closeEvent(self, event):
+        self.runner.shutdown()
+        self.loader.shutdown()
+        self.saver.shutdown()
+        self.session.close()
+        super().closeEvent(event)
+
+    def preview_image(self):
+        # Orijinalin ekran boyutuna küçültülmüş kopyası; orijinal değişene
+        # kadar önbellekte tutulur
+        if self.preview_cache is None or self.preview_cache[0] is not self.original_image:
+            height, width = self.original_image.shape[:2]
+            ratio = DISPLAY_SIZE / max(height, width)
+            proxy = self.original_image
+            if ratio < 1:
+                proxy = cv2.resize(proxy, (max(1, int(width * ratio)), max(1, int(height * ratio))),
+                                   interpolation=cv2.INTER_AREA)
+            self.preview_cache = (self.original_image, proxy)
+        return self.preview_cache[1]
+
+    def preview_slider(self, name):
+        # Ardışık valueChanged olayları tek bir güncellemede birleştirilir
+        if self.original_image is None:
+            return
+        self.pending_preview = name
+        if not self.preview_timer.isActive():
+            self.preview_timer.start(PREVIEW_INTERVAL_MS)
+
+    def flush_preview(self):
+        # Tam çözünürlükte uygulamanın tek yolu: sürükleme bırakıldığında
+        # (sliderReleased da buraya gelir) ya da klavye/tekerlek ile değişimde
+        name, self.pending_preview = self.pending_preview, None
+        if name is None or self.original_image is None:
+            return
+        slider, commit = self.slider_operations[name]
+        if not slider.isSliderDown():
+            commit()
+            return
+        try:
+            preview = ops.apply(self.preview_image(), name, value=slider.value())
+            self.processed_label.setPixmap(array_to_pixmap(preview, DISPLAY_SIZE))
+            self.refresh_histogram(preview)
+            self.displayed_processed = None
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Önizleme oluşturulurken bir hata oluştu: {str(e)}")
+
+    def cancel_pending_preview(self):
+        # Bekleyen önizleme, uygulanan değerin ardından ikinci kez işlenmesin
+        self.preview_timer.stop()
+        self.pending_preview = None
+
+    def update_recipe_label(self):
+        proxy = " (önizleme)" if self.is_proxy else ""
+        self.recipe_label.setText(f"Tarif: {len(self.recipe)} adım{proxy}")
 
     def reset_image(self):
         if self.original_image is not None:
-            self.processed_image = self.original_image.copy()
-            self.update_display()
+            self.runner.cancel()
+            # Sıfırlama da geri alınabilir
+            self.set_processed("Orijinale dön", self.initial_processed_image(), [])
+
+    def save_recipe(self):
+        try:
+            if len(self.recipe) == 0:
+                QMessageBox.warning(self, "Uyarı", "Kaydedilecek işlem yok!")
+                return
+            file_name, _ = QFileDialog.getSaveFileName(self, "Tarifi Kaydet", "",
+                                                       "Tarif (*.json)")
+            if file_name:
+                self.recipe.save(file_name)
+                QMessageBox.information(self, "Başarılı", "Tarif başarıyla kaydedildi!")
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Tarif kaydedilirken bir hata oluştu: {str(e)}")
+
+    def load_recipe(self):
+        try:
+            if self.original_image is None:
+                QMessageBox.warning(self, "Uyarı", "Önce bir görüntü yükleyin!")
+                return
+            file_name, _ = QFileDialog.getOpenFileName(self, "Tarif Seç", "",
+                                                       "Tarif (*.json)")
+            if file_name:
+                recipe = Recipe.load(file_name)
+
+                def done(output):
+                    result, timings = output
+                    self.set_processed("Tarif", result, recipe.steps)
+                    QMessageBox.information(self, "Tarif Uygulandı", format_timings(timings))
+
+                self.runner.submit("Tarif", recipe.replay, self.original_image,
+                                   on_done=done, on_error=self.show_operation_error,
+                                   cancellable=True)
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Tarif uygulanırken bir hata oluştu: {str(e)}")
+
+    def apply_recipe_full_resolution(self):
+        # Önizlemede hazırlanan tarifi diskteki tam çözünürlüklü orijinale uygula
+        try:
+            if self.image_path is None:
+                QMessageBox.warning(self, "Uyarı", "Önce bir görüntü yükleyin!")
+                return
+            recipe = Recipe(self.recipe.steps)
+
+            def replay_full(path, grayscale, should_stop):
+                full_image = image_io.read_image(path, grayscale)
+                return (full_image,) + recipe.replay(full_image, should_stop)
+
+            def done(output):
+                full_image, result, timings = output
+                self.original_image = full_image
+                self.processed_image = result
+                self.is_proxy = False
+                # Önizleme boyutundaki geçmiş yeni çözünürlükte geçersizdir
+                self.history.clear()
+                self.update_history_label()
+                self.update_recipe_label()
+                self.update_display()
+                height, width = result.shape[:2]
+                QMessageBox.information(self, "Tam Çözünürlük",
+                    f"{width}x{height} görüntüye uygulandı:\n\n{format_timings(timings)}")
+
+            self.runner.submit("Tam çözünürlük", replay_full, self.image_path,
+                               self.image_grayscale, on_done=done,
+                               on_error=self.show_operation_error, cancellable=True)
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Tarif uygulanırken bir hata oluştu: {str(e)}")
 
     def load_image(self):
         try:
@@ -624,9 +1311,15 @@ class ImageProcessor(QMainWindow):
                     super().__init__()
                     self.setWindowTitle("Görüntü Seçenekleri")
                     self.checkbox = QCheckBox("Gri tonda oku (grayscale)")
+                    self.proxy_checkbox = QCheckBox(
+                        f"Önizleme olarak yükle (en fazla {PROXY_MAX_SIZE} px)")
                     layout = QVBoxLayout()
                     layout.addWidget(QLabel("Görüntü gri tonda mı yüklensin?"))
                     layout.addWidget(self.checkbox)
+                    layout.addWidget(self.proxy_checkbox)
+                    self.tiled_checkbox = QCheckBox(
+                        "Büyük görüntü: diskte döşemeli işle (bellek sınırlı)")
+                    layout.addWidget(self.tiled_checkbox)
                     buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
                     buttons.accepted.connect(self.accept)
                     buttons.rejected.connect(self.reject)
@@ -637,7 +1330,7 @@ class ImageProcessor(QMainWindow):
                 self,
                 "Görüntü Seç",
                 "",
-                "Image Files (*.png *.jpg *.jpeg *.bmp *.gif *.tiff);;All Files (*.*)"
+                "Image Files (*.png *.jpg *.jpeg *.bmp *.gif *.tif *.tiff *.npy);;All Files (*.*)"
             )
             if file_name and os.path.exists(file_name):
                 # Gri tonda okuma seçeneği sor
@@ -645,131 +1338,363 @@ class ImageProcessor(QMainWindow):
                 grayscale = False
                 if dlg.exec() == QDialog.DialogCode.Accepted:
                     grayscale = dlg.checkbox.isChecked()
+                    proxy = dlg.proxy_checkbox.isChecked()
+                    is_tiled = dlg.tiled_checkbox.isChecked()
                 else:
                     return
-                pil_image = Image.open(file_name)
-                if grayscale:
-                    pil_image = pil_image.convert('L')
-                elif pil_image.mode in ['RGBA', 'LA']:
-                    background = Image.new('RGB', pil_image.size, (255, 255, 255))
-                    background.paste(pil_image, mask=pil_image.split()[-1])
-                    pil_image = background
-                elif pil_image.mode not in ['RGB', 'L']:
-                    pil_image = pil_image.convert('RGB')
-                self.original_image = np.array(pil_image)
-                if len(self.original_image.shape) == 2:
-                    self.original_image = cv2.cvtColor(self.original_image, cv2.COLOR_GRAY2RGB)
-                self.processed_image = self.original_image.copy()
-                self.update_display()
-                QMessageBox.information(self, "Başarılı", "Görüntü başarıyla yüklendi!")
+                if is_tiled:
+                    # Görüntü diske eşlenir; komşuluk işlemleri döşeme döşeme çalışır
+                    self.set_loaded_image(tiled.load(file_name, grayscale), file_name,
+                                          grayscale, False, True)
+                    QMessageBox.information(self, "Başarılı", "Görüntü başarıyla yüklendi!")
+                else:
+                    self.start_loading(file_name, grayscale, proxy)
         except Exception as e:
             QMessageBox.critical(self, "Hata", 
                 f"Görüntü yüklenirken bir hata oluştu:\n{str(e)}\n\n"
                 "Lütfen geçerli bir görüntü dosyası seçtiğinizden emin olun.\n"
                 "Desteklenen formatlar: PNG, JPG, JPEG, BMP, GIF, TIFF")
 
+    def start_loading(self, path, grayscale, proxy):
+        # JPEG'ler önce DCT ölçeklemesiyle küçük çözülüp hemen gösterilir; tam
+        # çözünürlük arka planda çözülür. Önizleme modunda tam çözünürlüğe hiç
+        # gerek yoktur: doğrudan PROXY_MAX_SIZE'a yakın bir ölçekte çözülür.
+        self.runner.cancel()
+        if not self.loader.is_busy():
+            self.loading_previous = (self.original_image, self.processed_image)
+        self.loader.cancel()
+        self.store_document()
+        self.document_tabs.setEnabled(False)
+        # Yükleme bitene kadar işlemler eski görüntüye uygulanmasın
+        self.original_image = None
+        self.processed_image = None
+        # Dosya işçide bir kez okunur; önizleme aynı baytlardan çözülüp tam
+        # çözmeden önce gönderilir
+        previews = []
+
+        def show_preview(preview):
+            previews.append(preview)
+            pixmap = array_to_pixmap(preview.image, DISPLAY_SIZE)
+            self.original_label.setPixmap(pixmap)
+            self.processed_label.setPixmap(pixmap)
+            self.displayed_original = None
+            self.displayed_processed = None
+
+        def done(decoded):
+            self.finish_loading(decoded, path, grayscale, proxy,
+                                previews[0] if previews else None)
+
+        def failed(error):
+            self.restore_previous_image()
+            QMessageBox.critical(self, "Hata",
+                f"Görüntü yüklenirken bir hata oluştu:\n{str(error)}\n\n"
+                "Lütfen geçerli bir görüntü dosyası seçtiğinizden emin olun.\n"
+                "Desteklenen formatlar: PNG, JPG, JPEG, BMP, GIF, TIFF")
+
+        self.loader.submit("Görüntü yükleme", image_io.decode_with_preview, path, grayscale,
+                           PROXY_MAX_SIZE if proxy else None, DISPLAY_SIZE,
+                           on_done=done, on_error=failed,
+                           on_progress=None if proxy else show_preview)
+
+    def finish_loading(self, decoded, path, grayscale, proxy, preview=None):
+        self.set_loaded_image(decoded.image, path, grayscale, proxy, False,
+                              max(decoded.full_size))
+        message = f"{os.path.basename(path)}: {decoded.summary()}"
+        if preview is not None:
+            message += f", önizleme {(preview.read_seconds + preview.decode_seconds) * 1000:.0f} ms"
+        self.status_label.setText(message)
+        QMessageBox.information(self, "Başarılı", "Görüntü başarıyla yüklendi!")
+
+    def restore_previous_image(self):
+        # Yarıda kalan yüklemede önceki görüntüye dön
+        self.original_image, self.processed_image = self.loading_previous
+        self.document_tabs.setEnabled(True)
+        self.displayed_original = None
+        self.displayed_processed = None
+        if self.original_image is None:
+            self.original_label.clear()
+            self.processed_label.clear()
+        self.update_display()
+
+    def cancel_operation(self):
+        self.runner.cancel()
+        if self.loader.is_busy():
+            self.loader.cancel()
+            self.restore_previous_image()
+
+    def set_loaded_image(self, image, path, grayscale, proxy, is_tiled, full_size=None):
+        # Önizleme modunda görüntüyü küçült; tarif daha sonra tam
+        # çözünürlükte yeniden uygulanabilir. full_size, dosyadaki uzun kenardır
+        # (görüntü zaten küçültülmüş çözülmüş olabilir).
+        self.store_document()
+        height, width = image.shape[:2]
+        ratio = PROXY_MAX_SIZE / max(height, width)
+        self.is_proxy = proxy and PROXY_MAX_SIZE < (full_size or max(height, width)) \
+            and not is_tiled
+        if self.is_proxy and ratio < 1:
+            image = cv2.resize(image, (max(1, int(width * ratio)), max(1, int(height * ratio))),
+                               interpolation=cv2.INTER_AREA)
+        self.runner.cancel()
+        self.original_image = image
+        self.image_path = path
+        self.image_grayscale = grayscale
+        self.is_tiled = is_tiled
+        self.processed_image = self.initial_processed_image()
+        # Her yükleme yeni bir belge (sekme) açar
+        self.recipe = Recipe()
+        self.history = History(self.history_budget.value())
+        self.add_document()
+        self.update_history_label()
+        self.update_recipe_label()
+        self.update_display()
+
+    def add_document(self):
+        document = Document(self.image_path, self.original_image, self.processed_image,
+                            self.recipe, self.history, self.image_grayscale, self.is_proxy,
+                            self.is_tiled)
+        index = self.session.add(document)
+        self.document_tabs.blockSignals(True)
+        self.document_tabs.addTab(document.name)
+        self.document_tabs.setTabToolTip(index, document.path)
+        self.document_tabs.setCurrentIndex(index)
+        self.document_tabs.blockSignals(False)
+        self.document_tabs.setEnabled(True)
+
+    def store_document(self):
+        # Penceredeki etkin belgenin güncel görüntülerini oturuma yaz
+        document = self.session.active
+        if document is not None and self.original_image is not None:
+            document.update(self.original_image, self.processed_image, self.is_proxy)
+
+    def switch_document(self, index):
+        try:
+            if not 0 <= index < len(self.session):
+                return
+            if self.session.documents[index] is self.session.active:
+                return
+            self.runner.cancel()
+            self.store_document()
+            self.show_document(self.session.activate(index))
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Belge açılırken bir hata oluştu: {str(e)}")
+
+    def show_document(self, document):
+        # Belgenin durumunu pencereye al; görüntüler diske taşınmışsa okunmuştur
+        if document is None:
+            self.original_image = None
+            self.processed_image = None
+            self.image_path = None
+            self.recipe = Recipe()
+            self.history = History(self.history_budget.value())
+            self.original_label.clear()
+            self.processed_label.clear()
+        else:
+            self.original_image, self.processed_image = document.images()
+            self.image_path = document.path
+            self.image_grayscale = document.grayscale
+            self.is_proxy = document.is_proxy
+            self.is_tiled = document.is_tiled
+            self.recipe = document.recipe
+            self.history = document.history
+            self.history.set_budget(self.history_budget.value())
+        self.perspective_points = []
+        self.is_selecting_points = False
+        self.is_cropping = False
+        self.crop_points = []
+        self.crop_rect = None
+        self.displayed_original = None
+        self.displayed_processed = None
+        self.update_history_label()
+        self.update_recipe_label()
+        self.update_display()
+
+    def close_document(self, index):
+        try:
+            if self.loader.is_busy():
+                return
+            if self.session.documents[index] is self.session.active:
+                self.runner.cancel()
+            self.session.remove(index)
+            # Etkin sekme kapanırsa currentChanged komşu belgeyi açar
+            self.document_tabs.removeTab(index)
+            if self.session.active is None:
+                self.show_document(None)
+            self.update_session_label()
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Belge kapatılırken bir hata oluştu: {str(e)}")
+
+    def set_session_budget(self, value):
+        self.store_document()
+        self.session.set_budget(value)
+        self.update_session_label()
+
+    def update_session_label(self):
+        mb = 1024 * 1024
+        spilled = sum(document.is_spilled() for document in self.session.documents)
+        self.session_label.setText(
+            f"Belgeler: {len(self.session)} ({spilled} diskte) | bellek "
+            f"{self.session.memory_bytes() / mb:.1f} MB | disk {self.session.disk_bytes() / mb:.1f} MB")
+
     def save_image(self):
         try:
             if self.processed_image is not None:
-                file_name, _ = QFileDialog.getSaveFileName(self, "Görüntüyü Kaydet",
-                                                         "", "PNG (*.png);;JPEG (*.jpg *.jpeg);;BMP (*.bmp)")
-                if file_name:
-                    # RGB'den BGR'ye dönüştür
-                    save_image = cv2.cvtColor(self.processed_image, cv2.COLOR_RGB2BGR)
-                    cv2.imwrite(file_name, save_image)
+                file_name, selected = QFileDialog.getSaveFileName(
+                    self, "Görüntüyü Kaydet", "",
+                    "PNG (*.png);;JPEG (*.jpg *.jpeg);;WebP (*.webp);;TIFF (*.tif *.tiff);;BMP (*.bmp)")
+                if not file_name:
+                    return
+                ext = os.path.splitext(file_name)[1].lower()
+                if not ext:
+                    # Uzantı yazılmadıysa seçilen filtrenin ilk uzantısı
+                    ext = selected.split("*")[1].split()[0].rstrip(")") if "*" in selected else ".png"
+                    file_name += ext
+                options = self.ask_save_options(ext)
+                if options is None:
+                    return
+                params = image_io.write_params(ext, **options)
+                self.save_options.update(options)
+
+                def done(encoded):
+                    self.status_label.setText(
+                        f"{os.path.basename(file_name)} kaydedildi: {encoded.summary()}")
                     QMessageBox.information(self, "Başarılı", "Görüntü başarıyla kaydedildi!")
+
+                # Kodlama arka planda; işlenmiş görüntü değiştirilmediği (her
+                # işlem yeni dizi döndürdüğü) için kopyalamaya gerek yok. Gri
+                # olup olmadığı tariften bilinir, görüntü taranmaz.
+                self.saver.submit("Kaydetme", image_io.encode, file_name, self.processed_image,
+                                  params, self.recipe.is_gray(self.image_grayscale),
+                                  on_done=done, on_error=self.show_operation_error)
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Görüntü kaydedilirken bir hata oluştu: {str(e)}")
 
+    def ask_save_options(self, ext):
+        # Biçime göre sıkıştırma/kalite ayarları; iptal edilirse None
+        options = self.save_options
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Kaydetme Seçenekleri")
+        layout = QVBoxLayout()
+        values = {}
+        if ext == ".png":
+            level = QSpinBox()
+            level.setRange(0, 9)
+            level.setValue(options["png_compression"])
+            level.setPrefix("PNG sıkıştırma düzeyi: ")
+            layout.addWidget(level)
+            layout.addWidget(QLabel("0: en hızlı / en büyük dosya, 9: en küçük dosya"))
+            values["png_compression"] = level.value
+        elif ext in (".jpg", ".jpeg"):
+            quality = QSpinBox()
+            quality.setRange(1, 100)
+            quality.setValue(options["jpeg_quality"])
+            quality.setPrefix("JPEG kalitesi: ")
+            progressive = QCheckBox("Aşamalı (progressive) JPEG")
+            progressive.setChecked(options["jpeg_progressive"])
+            layout.addWidget(quality)
+            layout.addWidget(progressive)
+            values["jpeg_quality"] = quality.value
+            values["jpeg_progressive"] = progressive.isChecked
+        elif ext == ".webp":
+            quality = QSpinBox()
+            quality.setRange(1, 100)
+            quality.setValue(options["webp_quality"])
+            quality.setPrefix("WebP kalitesi: ")
+            lossless = QCheckBox("Kayıpsız")
+            lossless.toggled.connect(lambda checked: quality.setEnabled(not checked))
+            lossless.setChecked(options["webp_lossless"])
+            layout.addWidget(quality)
+            layout.addWidget(lossless)
+            values["webp_quality"] = quality.value
+            values["webp_lossless"] = lossless.isChecked
+        elif ext in (".tif", ".tiff"):
+            compression = QComboBox()
+            for key, text in (("lzw", "LZW"), ("deflate", "Deflate (zlib)"), ("none", "Sıkıştırmasız")):
+                compression.addItem(text, key)
+            compression.setCurrentIndex(compression.findData(options["tiff_compression"]))
+            layout.addWidget(QLabel("Kayıpsız TIFF sıkıştırması:"))
+            layout.addWidget(compression)
+            values["tiff_compression"] = compression.currentData
+        else:
+            # BMP gibi ayarı olmayan biçimler
+            return {}
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+        dialog.setLayout(layout)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return None
+        return {key: value() for key, value in values.items()}
+
     def convert_to_grayscale(self):
         try:
             if self.processed_image is not None:
-                gray = cv2.cvtColor(self.processed_image, cv2.COLOR_RGB2GRAY)
-                self.processed_image = cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
-                self.update_display()
+                self.run_operation("grayscale")
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Gri tonlamaya dönüştürürken bir hata oluştu: {str(e)}")
 
     def convert_to_negative(self):
         try:
             if self.processed_image is not None:
-                self.processed_image = 255 - self.processed_image
-                self.update_display()
+                self.run_operation("negative")
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Negatif görüntü oluştururken bir hata oluştu: {str(e)}")
 
     def adjust_brightness(self):
         try:
+            self.cancel_pending_preview()
             if self.original_image is not None:
-                value = self.brightness_slider.value()
-                self.processed_image = cv2.convertScaleAbs(self.original_image, alpha=1, beta=value)
-                self.update_display()
+                self.run_operation("brightness", from_original=True,
+                                   value=self.brightness_slider.value())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Parlaklık ayarlanırken bir hata oluştu: {str(e)}")
 
     def adjust_contrast(self):
         try:
+            self.cancel_pending_preview()
             if self.original_image is not None:
-                value = self.contrast_slider.value()
-                alpha = 1.0 + (value / 100.0)
-                self.processed_image = cv2.convertScaleAbs(self.original_image, alpha=alpha, beta=0)
-                self.update_display()
+                self.run_operation("contrast", from_original=True,
+                                   value=self.contrast_slider.value())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Kontrast ayarlanırken bir hata oluştu: {str(e)}")
 
     def apply_threshold(self):
         try:
+            self.cancel_pending_preview()
             if self.original_image is not None:
-                threshold_value = self.threshold_slider.value()
-                gray = cv2.cvtColor(self.original_image, cv2.COLOR_RGB2GRAY)
-                _, thresh = cv2.threshold(gray, threshold_value, 255, cv2.THRESH_BINARY)
-                self.processed_image = cv2.cvtColor(thresh, cv2.COLOR_GRAY2RGB)
-                self.update_display()
+                self.run_operation("threshold", from_original=True,
+                                   value=self.threshold_slider.value())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Eşikleme işlemi sırasında bir hata oluştu: {str(e)}")
 
     def flip_image(self, direction):
         try:
             if self.processed_image is not None:
-                self.processed_image = cv2.flip(self.processed_image, direction)
-                self.update_display()
+                self.run_operation("flip", direction=direction)
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Görüntü çevrilirken bir hata oluştu: {str(e)}")
 
     def rotate_image(self):
         try:
             if self.processed_image is not None:
-                self.processed_image = cv2.rotate(self.processed_image, 
-                                                cv2.ROTATE_90_CLOCKWISE)
-                self.update_display()
+                self.run_operation("rotate")
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Görüntü döndürülürken bir hata oluştu: {str(e)}")
 
     def update_display(self):
         try:
-            if self.original_image is not None:
+            # Paneller yalnızca gösterdikleri dizi değiştiğinde yeniden çizilir;
+            # orijinal paneli yeni bir görüntü yüklenene kadar aynı kalır
+            if self.original_image is not None and self.original_image is not self.displayed_original:
                 # Orijinal görüntüyü göster
-                height, width = self.original_image.shape[:2]
-                bytes_per_line = 3 * width
-                # Görüntü boyutlarını kontrol et
-                if height > 0 and width > 0 and self.original_image.data and bytes_per_line > 0:
-                    q_img = QImage(self.original_image.tobytes(), width, height, 
-                                bytes_per_line, QImage.Format.Format_RGB888)
-                    pixmap = QPixmap.fromImage(q_img)
-                    scaled_pixmap = pixmap.scaled(400, 400, Qt.AspectRatioMode.KeepAspectRatio)
-                    self.original_label.setPixmap(scaled_pixmap)
+                self.original_label.setPixmap(array_to_pixmap(self.original_image, DISPLAY_SIZE))
+                self.displayed_original = self.original_image
 
-            if self.processed_image is not None:
+            if self.processed_image is not None and self.processed_image is not self.displayed_processed:
                 # İşlenmiş görüntüyü göster
-                height, width = self.processed_image.shape[:2]
-                bytes_per_line = 3 * width
-                # Görüntü boyutlarını kontrol et
-                if height > 0 and width > 0 and self.processed_image.data and bytes_per_line > 0:
-                    q_img = QImage(self.processed_image.tobytes(), width, height, 
-                                bytes_per_line, QImage.Format.Format_RGB888)
-                    pixmap = QPixmap.fromImage(q_img)
-                    scaled_pixmap = pixmap.scaled(400, 400, Qt.AspectRatioMode.KeepAspectRatio)
-                    self.processed_label.setPixmap(scaled_pixmap)
+                self.processed_label.setPixmap(array_to_pixmap(self.processed_image, DISPLAY_SIZE))
+                self.refresh_histogram(self.processed_image)
+                self.displayed_processed = self.processed_image
                     
         except Exception as e:
             QMessageBox.critical(self, "Hata", 
@@ -777,78 +1702,21 @@ class ImageProcessor(QMainWindow):
                 "Lütfen geçerli bir görüntü dosyası seçtiğinizden emin olun.")
 
     def show_histogram(self):
-        try:
-            if self.processed_image is not None:
-                # Yeni bir pencere oluştur
-                self.hist_window = QMainWindow()  # self ile sakla
-                self.hist_window.setWindowTitle("Histogram")
-                self.hist_window.setGeometry(200, 200, 800, 600)
-                
-                # Merkezi widget ve layout oluştur
-                central_widget = QWidget()
-                self.hist_window.setCentralWidget(central_widget)
-                layout = QVBoxLayout(central_widget)
-                
-                # matplotlib figure oluştur
-                fig = Figure(figsize=(8, 6), facecolor='#353535')
-                canvas = FigureCanvas(fig)
-                layout.addWidget(canvas)
-                
-                # Alt grafik için axes oluştur
-                ax = fig.add_subplot(111)
-                ax.set_facecolor('#353535')
-                
-                # Izgara çizgilerini ayarla
-                ax.grid(True, color='#666666', linestyle='--', alpha=0.3)
-                
-                # RGB kanalları için histogram hesapla ve çiz
-                colors = ('r', 'g', 'b')
-                labels = ('Kırmızı', 'Yeşil', 'Mavi')
-                
-                for i, (color, label) in enumerate(zip(colors, labels)):
-                    hist = cv2.calcHist([self.processed_image], [i], None, [256], [0, 256])
-                    ax.plot(hist, color=color, label=label, linewidth=2)
-                
-                # Grafik özelliklerini ayarla
-                ax.set_title('RGB Histogram', color='white', pad=20, fontsize=12)
-                ax.set_xlabel('Piksel Değeri', color='white', fontsize=10)
-                ax.set_ylabel('Piksel Sayısı', color='white', fontsize=10)
-                
-                # Eksen renklerini ayarla
-                ax.tick_params(axis='both', colors='white')
-                for spine in ax.spines.values():
-                    spine.set_color('white')
-                
-                # Gösterge kutusunu ayarla
-                legend = ax.legend(facecolor='#353535', edgecolor='white')
-                plt.setp(legend.get_texts(), color='white')
-                
-                # Grafik kenarlarında boşluk bırak
-                fig.tight_layout()
-                
-                # Pencereyi göster
-                self.hist_window.show()
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Histogram gösterimi sırasında bir hata oluştu: {str(e)}")
-            print(f"Detaylı hata: {str(e)}")  # Konsola detaylı hata mesajı yazdır
+        # Histogram paneli ana pencerede; buton paneli gösterir/gizler
+        visible = self.histogram_group.isHidden()
+        self.histogram_group.setVisible(visible)
+        if visible:
+            self.refresh_histogram(self.processed_image)
+
+    def refresh_histogram(self, image):
+        if not self.histogram_group.isHidden():
+            self.histogram_widget.set_image(image)
 
     def equalize_histogram(self):
         try:
             if self.processed_image is not None:
-                # RGB kanallarını ayır
-                b, g, r = cv2.split(self.processed_image)
-                
-                # Her kanal için histogram eşitleme uygula
-                b_eq = cv2.equalizeHist(b)
-                g_eq = cv2.equalizeHist(g)
-                r_eq = cv2.equalizeHist(r)
-                
-                # Kanalları birleştir
-                self.processed_image = cv2.merge([b_eq, g_eq, r_eq])
-                
-                # Görüntüyü güncelle
-                self.update_display()
+                # Her kanal için histogram eşitleme uygula ve görüntüyü güncelle
+                self.run_operation("equalize_histogram")
                 
                 # Başarı mesajı göster
                 QMessageBox.information(self, "Başarılı", "Histogram eşitleme işlemi tamamlandı!")
@@ -870,11 +1738,7 @@ class ImageProcessor(QMainWindow):
                     window.setGeometry(200, 200, 400, 400)
                     label = QLabel()
                     label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    rgb_channel = cv2.cvtColor(channel, cv2.COLOR_GRAY2RGB)
-                    height, width = rgb_channel.shape[:2]
-                    bytes_per_line = 3 * width
-                    q_img = QImage(rgb_channel.tobytes(), width, height, bytes_per_line, QImage.Format.Format_RGB888)
-                    label.setPixmap(QPixmap.fromImage(q_img).scaled(400, 400, Qt.AspectRatioMode.KeepAspectRatio))
+                    label.setPixmap(array_to_pixmap(channel, DISPLAY_SIZE))
                     window.setCentralWidget(label)
                     window.show()
                     self.channel_windows.append(window)
@@ -889,46 +1753,21 @@ class ImageProcessor(QMainWindow):
     def translate_image(self):
         try:
             if self.processed_image is not None:
-                # Taşıma matrisi oluştur
-                tx, ty = self.tx_spin.value(), self.ty_spin.value()
-                M = np.float32([[1, 0, tx], [0, 1, ty]])
-                
-                # Görüntüyü taşı
-                height, width = self.processed_image.shape[:2]
-                self.processed_image = cv2.warpAffine(self.processed_image, M, (width, height))
-                self.update_display()
+                self.run_operation("translate", tx=self.tx_spin.value(), ty=self.ty_spin.value())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Görüntü taşıma sırasında bir hata oluştu: {str(e)}")
 
     def scale_image(self):
         try:
             if self.processed_image is not None:
-                scale = self.scale_spin.value()
-                height, width = self.processed_image.shape[:2]
-                new_width = max(1, int(width * scale))
-                new_height = max(1, int(height * scale))
-                new_size = (new_width, new_height)
-                self.processed_image = cv2.resize(self.processed_image, new_size, 
-                                               interpolation=cv2.INTER_LINEAR)
-                self.update_display()
+                self.run_operation("scale", factor=self.scale_spin.value())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Görüntü ölçekleme sırasında bir hata oluştu: {str(e)}")
 
     def shear_image(self):
         try:
             if self.processed_image is not None:
-                shear_factor = self.shear_spin.value()
-                height, width = self.processed_image.shape[:2]
-                
-                # Eğme matrisi oluştur
-                M = np.float32([[1, shear_factor, 0], [0, 1, 0]])
-                
-                # Yeni görüntü boyutunu hesapla
-                new_width = int(width + abs(shear_factor * height))
-                
-                # Görüntüyü eğ
-                self.processed_image = cv2.warpAffine(self.processed_image, M, (new_width, height))
-                self.update_display()
+                self.run_operation("shear", factor=self.shear_spin.value())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Görüntü eğme sırasında bir hata oluştu: {str(e)}")
 
@@ -944,10 +1783,11 @@ class ImageProcessor(QMainWindow):
                 self.perspective_window.setGeometry(200, 200, 800, 600)
                 self.perspective_label = QLabel()
                 self.perspective_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+                # Tıklanan noktalar görüntü koordinatı olarak kullanıldığı için
+                # pixmap tam boyuttadır (küçültülmez)
                 height, width = self.processed_image.shape[:2]
-                bytes_per_line = 3 * width
-                q_img = QImage(self.processed_image.tobytes(), width, height, bytes_per_line, QImage.Format.Format_RGB888)
-                self.perspective_label.setPixmap(QPixmap.fromImage(q_img))
+                self.perspective_label.setPixmap(
+                    array_to_pixmap(self.processed_image, max(height, width)))
                 self.perspective_label.mousePressEvent = self.perspective_point_click
                 self.perspective_window.setCentralWidget(self.perspective_label)
                 self.perspective_window.show()
@@ -977,24 +1817,8 @@ class ImageProcessor(QMainWindow):
 
     def apply_perspective_correction(self):
         try:
-            src_points = np.float32(self.perspective_points)
-            width = max(
-                np.linalg.norm(src_points[0] - src_points[1]),
-                np.linalg.norm(src_points[2] - src_points[3])
-            )
-            height = max(
-                np.linalg.norm(src_points[1] - src_points[2]),
-                np.linalg.norm(src_points[3] - src_points[0])
-            )
-            dst_points = np.float32([
-                [0, 0],
-                [width-1, 0],
-                [width-1, height-1],
-                [0, height-1]
-            ])
-            M = cv2.getPerspectiveTransform(src_points, dst_points)
-            self.processed_image = cv2.warpPerspective(self.processed_image, M, (int(width), int(height)))
-            self.update_display()
+            points = [list(p) for p in self.perspective_points]
+            self.run_operation("perspective", points=points)
             self.perspective_window.close()
             self.is_selecting_points = False
             self.perspective_points = []
@@ -1004,238 +1828,61 @@ class ImageProcessor(QMainWindow):
     def apply_average_filter(self):
         try:
             if self.processed_image is not None:
-                kernel_size = int(self.kernel_size.currentText().split('x')[0])
-                kernel = np.ones((kernel_size, kernel_size), np.float32) / (kernel_size * kernel_size)
-                self.processed_image = cv2.filter2D(self.processed_image, -1, kernel)
-                self.update_display()
+                self.run_operation("average_filter", ksize=self.selected_kernel_size())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Ortalama filtre uygulanırken bir hata oluştu: {str(e)}")
 
     def apply_median_filter(self):
         try:
             if self.processed_image is not None:
-                kernel_size = int(self.kernel_size.currentText().split('x')[0])
-                self.processed_image = cv2.medianBlur(self.processed_image, kernel_size)
-                self.update_display()
+                self.run_operation("median_filter", ksize=self.selected_kernel_size())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Medyan filtre uygulanırken bir hata oluştu: {str(e)}")
 
     def apply_gaussian_filter(self):
         try:
             if self.processed_image is not None:
-                kernel_size = int(self.kernel_size.currentText().split('x')[0])
-                self.processed_image = cv2.GaussianBlur(self.processed_image, 
-                                                      (kernel_size, kernel_size), 0)
-                self.update_display()
+                self.run_operation("gaussian_filter", ksize=self.selected_kernel_size())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Gauss filtresi uygulanırken bir hata oluştu: {str(e)}")
 
     def apply_frequency_filter(self, filter_type):
         try:
             if self.processed_image is not None:
-                # Görüntüyü gri tonlamaya çevir
-                gray = cv2.cvtColor(self.processed_image, cv2.COLOR_RGB2GRAY)
-                
-                # Fourier dönüşümü
-                f = np.fft.fft2(gray)
-                fshift = np.fft.fftshift(f)
-                
-                # Görüntü boyutları
-                rows, cols = gray.shape
-                crow, ccol = rows//2, cols//2
-                
-                # Filtre maskesi oluştur
-                mask = np.ones((rows, cols), np.uint8)
-                
-                if filter_type == "lpf":
-                    # Alçak geçiren filtre
-                    r = 30
-                    mask[crow-r:crow+r, ccol-r:ccol+r] = 0
-                    mask = 1 - mask
-                elif filter_type == "hpf":
-                    # Yüksek geçiren filtre
-                    r = 30
-                    mask[crow-r:crow+r, ccol-r:ccol+r] = 0
-                elif filter_type == "band_pass":
-                    # Band geçiren filtre
-                    r_out, r_in = 50, 20
-                    mask[crow-r_out:crow+r_out, ccol-r_out:ccol+r_out] = 0
-                    mask[crow-r_in:crow+r_in, ccol-r_in:ccol+r_in] = 1
-                elif filter_type == "band_stop":
-                    # Band durduran filtre
-                    r_out, r_in = 50, 20
-                    mask[crow-r_out:crow+r_out, ccol-r_out:ccol+r_out] = 1
-                    mask[crow-r_in:crow+r_in, ccol-r_in:ccol+r_in] = 0
-                elif filter_type == "gaussian":
-                    # Gaussian filtre
-                    mask = np.zeros((rows, cols))
-                    sigma = 30
-                    for i in range(rows):
-                        for j in range(cols):
-                            mask[i,j] = np.exp(-((i-crow)**2 + (j-ccol)**2)/(2*sigma**2))
-                
-                # Filtreyi uygula
-                fshift = fshift * mask
-                
-                # Ters Fourier dönüşümü
-                f_ishift = np.fft.ifftshift(fshift)
-                img_back = np.fft.ifft2(f_ishift)
-                img_back = np.abs(img_back)
-                
-                # Görüntüyü normalize et
-                img_back = cv2.normalize(img_back, None, 0, 255, cv2.NORM_MINMAX)
-                
-                # RGB'ye dönüştür
-                self.processed_image = cv2.cvtColor(img_back.astype(np.uint8), cv2.COLOR_GRAY2RGB)
-                self.update_display()
+                self.run_operation("frequency_filter", filter_type=filter_type,
+                                   color_mode=self.frequency_color_mode.currentData())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Frekans filtresi uygulanırken bir hata oluştu: {str(e)}")
 
     def apply_butterworth(self):
         try:
             if self.processed_image is not None:
-                # Görüntüyü gri tonlamaya çevir
-                gray = cv2.cvtColor(self.processed_image, cv2.COLOR_RGB2GRAY)
-                
-                # Fourier dönüşümü
-                f = np.fft.fft2(gray)
-                fshift = np.fft.fftshift(f)
-                
-                # Görüntü boyutları
-                rows, cols = gray.shape
-                crow, ccol = rows//2, cols//2
-                
-                # Butterworth filtre parametreleri
-                D0 = 30  # Kesme frekansı
-                n = 2    # Filtre derecesi
-                
-                # Butterworth filtre maskesi oluştur
-                mask = np.zeros((rows, cols))
-                for i in range(rows):
-                    for j in range(cols):
-                        D = np.sqrt((i-crow)**2 + (j-ccol)**2)
-                        mask[i,j] = 1 / (1 + (D/D0)**(2*n))
-                
-                # Filtreyi uygula
-                fshift = fshift * mask
-                
-                # Ters Fourier dönüşümü
-                f_ishift = np.fft.ifftshift(fshift)
-                img_back = np.fft.ifft2(f_ishift)
-                img_back = np.abs(img_back)
-                
-                # Görüntüyü normalize et
-                img_back = cv2.normalize(img_back, None, 0, 255, cv2.NORM_MINMAX)
-                
-                # RGB'ye dönüştür
-                self.processed_image = cv2.cvtColor(img_back.astype(np.uint8), cv2.COLOR_GRAY2RGB)
-                self.update_display()
+                self.run_operation("butterworth", cutoff=30, order=2,
+                                   color_mode=self.frequency_color_mode.currentData())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Butterworth filtresi uygulanırken bir hata oluştu: {str(e)}")
 
     def apply_homomorphic(self):
         try:
             if self.processed_image is not None:
-                # Görüntüyü gri tonlamaya çevir
-                gray = cv2.cvtColor(self.processed_image, cv2.COLOR_RGB2GRAY).astype(np.float32)
-                
-                # Sıfır değerlerini küçük bir sayı ile değiştir (log(0) tanımsız olduğu için)
-                gray = np.maximum(gray, 0.001)
-                
-                # Log dönüşümü
-                img_log = np.log(gray)
-                
-                # Fourier dönüşümü
-                f = np.fft.fft2(img_log)
-                fshift = np.fft.fftshift(f)
-                
-                # Görüntü boyutları
-                rows, cols = gray.shape
-                crow, ccol = rows//2, cols//2
-                
-                # Homomorfik filtre parametreleri
-                rh = 2.5    # Yüksek frekans kazancı
-                rl = 0.5    # Düşük frekans kazancı
-                d0 = 10     # Kesme frekansı
-                c = 1       # Keskinlik kontrolü
-                
-                # Filtre maskesi oluştur
-                y, x = np.ogrid[-crow:rows-crow, -ccol:cols-ccol]
-                d = np.sqrt(x*x + y*y)
-                mask = (rh - rl) * (1 - np.exp(-c * (d*d)/(d0*d0))) + rl
-                
-                # Filtreyi uygula
-                fshift_filtered = fshift * mask
-                
-                # Ters Fourier dönüşümü
-                f_ishift = np.fft.ifftshift(fshift_filtered)
-                img_back = np.fft.ifft2(f_ishift)
-                img_back = np.abs(img_back)
-                
-                # Üstel dönüşüm
-                img_exp = np.exp(img_back)
-                
-                # Görüntüyü normalize et
-                img_norm = cv2.normalize(img_exp, None, 0, 255, cv2.NORM_MINMAX)
-                
-                # RGB'ye dönüştür
-                self.processed_image = cv2.cvtColor(img_norm.astype(np.uint8), cv2.COLOR_GRAY2RGB)
-                self.update_display()
-                
+                self.run_operation("homomorphic", high=2.5, low=0.5, cutoff=10, c=1,
+                                   color_mode=self.frequency_color_mode.currentData())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Homomorfik filtre uygulanırken bir hata oluştu: {str(e)}")
 
     def apply_conservative_filter(self):
-        print("Konservatif filtre tıklandı")
         try:
             if self.processed_image is not None:
-                kernel_size = int(self.kernel_size.currentText().split('x')[0])
-                result = self.processed_image.copy()
-                for c in range(3):  # Her kanal için uygula
-                    channel = self.processed_image[:, :, c]
-                    min_img = cv2.erode(channel, np.ones((kernel_size, kernel_size), np.uint8))
-                    max_img = cv2.dilate(channel, np.ones((kernel_size, kernel_size), np.uint8))
-                    # Konservatif filtre: min ve max arasında olmayan pikselleri sınırla
-                    result[:, :, c] = np.where(channel < min_img, min_img,
-                                       np.where(channel > max_img, max_img, channel))
-                self.processed_image = result
-                self.update_display()
+                self.run_operation("conservative_filter", ksize=self.conservative_size.value())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Konservatif filtre uygulanırken bir hata oluştu: {str(e)}")
 
     def apply_crimmins(self):
-        print("Crimmins filtre tıklandı")
         try:
             if self.processed_image is not None:
-                img = self.processed_image.copy()
-                def crimmins_iteration(image, direction):
-                    result = np.copy(image)
-                    if direction == 'dark':
-                        for _ in range(4):
-                            tmp1 = np.roll(image, 1, axis=0)
-                            tmp2 = np.roll(image, -1, axis=0)
-                            tmp3 = np.roll(image, 1, axis=1)
-                            tmp4 = np.roll(image, -1, axis=1)
-                            result = np.where((image < tmp1) & (image < tmp2) & \
-                                            (image < tmp3) & (image < tmp4),
-                                            image + 1, result)
-                    else:  # 'light'
-                        for _ in range(4):
-                            tmp1 = np.roll(image, 1, axis=0)
-                            tmp2 = np.roll(image, -1, axis=0)
-                            tmp3 = np.roll(image, 1, axis=1)
-                            tmp4 = np.roll(image, -1, axis=1)
-                            result = np.where((image > tmp1) & (image > tmp2) & \
-                                            (image > tmp3) & (image > tmp4),
-                                            image - 1, result)
-                    return result
-                for i in range(3):
-                    channel = img[:,:,i]
-                    channel = crimmins_iteration(channel, 'dark')
-                    channel = crimmins_iteration(channel, 'light')
-                    img[:,:,i] = channel
-                self.processed_image = img
-                self.update_display()
+                iterations = (None if self.crimmins_until_stable.isChecked()
+                              else self.crimmins_iterations.value())
+                self.run_operation("crimmins", iterations=iterations)
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Crimmins Speckle filtresi uygulanırken bir hata oluştu: {str(e)}")
 
@@ -1244,11 +1891,7 @@ class ImageProcessor(QMainWindow):
             QMessageBox.warning(self, "Uyarı", "Önce bir görüntü yükleyin!")
             return
         QMessageBox.information(self, "Kırpma Bilgisi", "Köşe tutamaçlarını sürükleyerek istediğiniz alanı seçin. Seçili alan dışı yarı saydam gösterilecektir. 'Kırp' butonuna basınca sadece seçili alan kalacaktır.")
-        img = self.processed_image.copy()
-        height, width = img.shape[:2]
-        bytes_per_line = 3 * width
-        q_img = QImage(img.tobytes(), width, height, bytes_per_line, QImage.Format.Format_RGB888)
-        pixmap = QPixmap.fromImage(q_img).scaled(500, 500, Qt.AspectRatioMode.KeepAspectRatio)
+        pixmap = array_to_pixmap(self.processed_image, 500)
         dialog = QDialog(self)
         dialog.setWindowTitle("Gelişmiş Kırpma")
         layout = QVBoxLayout(dialog)
@@ -1265,13 +1908,7 @@ class ImageProcessor(QMainWindow):
             y1 = int(r.top() * scale_y)
             x2 = int(r.right() * scale_x)
             y2 = int(r.bottom() * scale_y)
-            x1, y1 = max(0, x1), max(0, y1)
-            x2, y2 = min(self.processed_image.shape[1]-1, x2), min(self.processed_image.shape[0]-1, y2)
-            if x2 > x1 and y2 > y1:
-                self.processed_image = self.processed_image[y1:y2, x1:x2]
-                self.update_display()
-            else:
-                QMessageBox.warning(self, "Uyarı", "Geçerli bir alan seçilmedi!")
+            self.run_operation("crop", x1=x1, y1=y1, x2=x2, y2=y2)
             dialog.accept()
         btn_crop.clicked.connect(do_crop)
         dialog.exec()
@@ -1279,216 +1916,175 @@ class ImageProcessor(QMainWindow):
     def apply_sobel(self):
         try:
             if self.processed_image is not None:
-                gray = cv2.cvtColor(self.processed_image, cv2.COLOR_RGB2GRAY)
-                sobelx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-                sobely = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-                sobel = cv2.magnitude(sobelx, sobely)
-                sobel = cv2.normalize(sobel, None, 0, 255, cv2.NORM_MINMAX)
-                self.processed_image = cv2.cvtColor(sobel.astype(np.uint8), cv2.COLOR_GRAY2RGB)
-                self.update_display()
+                self.run_operation("sobel")
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Sobel uygulanırken hata: {str(e)}")
 
     def apply_prewitt(self):
         try:
             if self.processed_image is not None:
-                gray = cv2.cvtColor(self.processed_image, cv2.COLOR_RGB2GRAY)
-                kernelx = np.array([[1,0,-1],[1,0,-1],[1,0,-1]], dtype=np.float32)
-                kernely = np.array([[1,1,1],[0,0,0],[-1,-1,-1]], dtype=np.float32)
-                prewittx = cv2.filter2D(gray, -1, kernelx)
-                prewitty = cv2.filter2D(gray, -1, kernely)
-                prewitt = cv2.magnitude(prewittx.astype(np.float32), prewitty.astype(np.float32))
-                prewitt = cv2.normalize(prewitt, None, 0, 255, cv2.NORM_MINMAX)
-                self.processed_image = cv2.cvtColor(prewitt.astype(np.uint8), cv2.COLOR_GRAY2RGB)
-                self.update_display()
+                self.run_operation("prewitt")
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Prewitt uygulanırken hata: {str(e)}")
 
     def apply_roberts(self):
         try:
             if self.processed_image is not None:
-                gray = cv2.cvtColor(self.processed_image, cv2.COLOR_RGB2GRAY)
-                kernelx = np.array([[1, 0], [0, -1]], dtype=np.float32)
-                kernely = np.array([[0, 1], [-1, 0]], dtype=np.float32)
-                robertsx = cv2.filter2D(gray, -1, kernelx)
-                robertsy = cv2.filter2D(gray, -1, kernely)
-                roberts = cv2.magnitude(robertsx.astype(np.float32), robertsy.astype(np.float32))
-                roberts = cv2.normalize(roberts, None, 0, 255, cv2.NORM_MINMAX)
-                self.processed_image = cv2.cvtColor(roberts.astype(np.uint8), cv2.COLOR_GRAY2RGB)
-                self.update_display()
+                self.run_operation("roberts")
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Roberts uygulanırken hata: {str(e)}")
 
     def apply_compass(self):
         try:
             if self.processed_image is not None:
-                gray = cv2.cvtColor(self.processed_image, cv2.COLOR_RGB2GRAY)
-                # 8 yönlü Kirsch kernel'leri
-                kernels = [
-                    np.array([[-3,-3,5],[-3,0,5],[-3,-3,5]]),
-                    np.array([[-3,5,5],[-3,0,5],[-3,-3,-3]]),
-                    np.array([[5,5,5],[-3,0,-3],[-3,-3,-3]]),
-                    np.array([[5,5,-3],[5,0,-3],[-3,-3,-3]]),
-                    np.array([[5,-3,-3],[5,0,-3],[5,-3,-3]]),
-                    np.array([[-3,-3,-3],[5,0,-3],[5,5,-3]]),
-                    np.array([[-3,-3,-3],[-3,0,-3],[5,5,5]]),
-                    np.array([[-3,-3,-3],[-3,0,5],[-3,5,5]])
-                ]
-                max_response = np.zeros_like(gray, dtype=np.float32)
-                for k in kernels:
-                    response = cv2.filter2D(gray, -1, k)
-                    max_response = np.maximum(max_response, response.astype(np.float32))
-                max_response = cv2.normalize(max_response, None, 0, 255, cv2.NORM_MINMAX)
-                self.processed_image = cv2.cvtColor(max_response.astype(np.uint8), cv2.COLOR_GRAY2RGB)
-                self.update_display()
+                self.run_operation("compass", family=self.compass_family.currentData())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Compass uygulanırken hata: {str(e)}")
 
+    def apply_compass_directions(self):
+        try:
+            if self.processed_image is not None:
+                self.run_operation("compass_directions",
+                                   family=self.compass_family.currentData())
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Compass yön haritası oluşturulurken hata: {str(e)}")
+
     def apply_canny(self):
         try:
             if self.processed_image is not None:
-                gray = cv2.cvtColor(self.processed_image, cv2.COLOR_RGB2GRAY)
-                edges = cv2.Canny(gray, 100, 200)
-                self.processed_image = cv2.cvtColor(edges, cv2.COLOR_GRAY2RGB)
-                self.update_display()
+                self.run_operation("canny", low=100, high=200)
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Canny uygulanırken hata: {str(e)}")
 
     def apply_laplace(self):
         try:
             if self.processed_image is not None:
-                gray = cv2.cvtColor(self.processed_image, cv2.COLOR_RGB2GRAY)
-                laplace = cv2.Laplacian(gray, cv2.CV_64F)
-                laplace = np.abs(laplace)
-                laplace = cv2.normalize(laplace, None, 0, 255, cv2.NORM_MINMAX)
-                self.processed_image = cv2.cvtColor(laplace.astype(np.uint8), cv2.COLOR_GRAY2RGB)
-                self.update_display()
+                self.run_operation("laplace")
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Laplace uygulanırken hata: {str(e)}")
 
     def apply_gabor(self):
         try:
             if self.processed_image is not None:
-                gray = cv2.cvtColor(self.processed_image, cv2.COLOR_RGB2GRAY)
-                kernel = cv2.getGaborKernel((21, 21), 8.0, np.pi/4, 10.0, 0.5, 0, ktype=cv2.CV_32F)
-                gabor = cv2.filter2D(gray, cv2.CV_8UC3, kernel)
-                self.processed_image = cv2.cvtColor(gabor, cv2.COLOR_GRAY2RGB)
-                self.update_display()
+                self.run_operation("gabor")
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Gabor uygulanırken hata: {str(e)}")
 
     def apply_hough(self):
         try:
             if self.processed_image is not None:
-                gray = cv2.cvtColor(self.processed_image, cv2.COLOR_RGB2GRAY)
-                edges = cv2.Canny(gray, 50, 150, apertureSize=3)
-                lines = cv2.HoughLines(edges, 1, np.pi/180, 120)
-                hough_img = cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
-                if lines is not None:
-                    for i, line in enumerate(lines):
-                        if i > 100: break
-                        rho, theta = line[0]
-                        a = np.cos(theta)
-                        b = np.sin(theta)
-                        x0 = a * rho
-                        y0 = b * rho
-                        x1 = int(x0 + 1000 * (-b))
-                        y1 = int(y0 + 1000 * (a))
-                        x2 = int(x0 - 1000 * (-b))
-                        y2 = int(y0 - 1000 * (a))
-                        cv2.line(hough_img, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                self.processed_image = hough_img
-                self.update_display()
+                mode = self.hough_mode.currentData()
+                params = {"mode": mode,
+                          "canny_low": self.hough_canny_low.value(),
+                          "canny_high": self.hough_canny_high.value(),
+                          "threshold": self.hough_threshold.value(),
+                          "max_lines": self.hough_max_lines.value(),
+                          "downscale": self.hough_downscale.currentData()}
+                if mode == "probabilistic":
+                    params.update(min_length=self.hough_min_length.value(),
+                                  max_gap=self.hough_max_gap.value())
+                elif mode == "circles":
+                    params.update(min_radius=self.hough_min_radius.value(),
+                                  max_radius=self.hough_max_radius.value(),
+                                  min_distance=self.hough_min_distance.value())
+                self.run_operation("hough", on_details=self.show_hough_result, **params)
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Hough uygulanırken hata: {str(e)}")
 
-    def apply_erode(self):
+    def show_hough_result(self, detection):
+        self.hough_result = detection
+        kind = "çember" if detection.mode == "circles" else "doğru"
+        self.hough_summary.setText(f"{len(detection)} {kind} bulundu")
+        self.btn_hough_export.setEnabled(True)
+
+    def export_hough(self):
         try:
-            if self.processed_image is not None:
-                kernel = np.ones((3, 3), np.uint8)
-                eroded = cv2.erode(self.processed_image, kernel, iterations=1)
-                self.processed_image = eroded
-                self.update_display()
+            if self.hough_result is None:
+                return
+            file_name, _ = QFileDialog.getSaveFileName(self, "Hough Sonuçlarını Kaydet", "",
+                                                       "JSON (*.json)")
+            if file_name:
+                self.hough_result.save(file_name)
+                QMessageBox.information(self, "Başarılı", "Sonuçlar başarıyla kaydedildi!")
         except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Erode uygulanırken hata: {str(e)}")
+            QMessageBox.critical(self, "Hata", f"Hough sonuçları kaydedilirken hata: {str(e)}")
 
-    def apply_dilate(self):
+    def apply_morphology(self, op):
         try:
             if self.processed_image is not None:
-                kernel = np.ones((3, 3), np.uint8)
-                dilated = cv2.dilate(self.processed_image, kernel, iterations=1)
-                self.processed_image = dilated
-                self.update_display()
+                params = {"op": op, "shape": self.morph_shape.currentData(),
+                          "iterations": self.morph_iterations.value()}
+                if params["shape"] == "custom":
+                    params["kernel"] = self.morph_kernel.text()
+                else:
+                    params["ksize"] = self.morph_size.value()
+                self.run_operation("morphology", **params)
         except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Dilate uygulanırken hata: {str(e)}")
+            QMessageBox.critical(self, "Hata", f"Morfolojik işlem uygulanırken hata: {str(e)}")
 
     def apply_kmeans(self):
         try:
             if self.processed_image is not None:
-                img = self.processed_image.copy()
-                Z = img.reshape((-1, 3))
-                Z = np.float32(Z)
-                K = 4  # Sabit, istersen kullanıcıdan alabilirsin
-                criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 10, 1.0)
-                ret, label, center = cv2.kmeans(Z, K, None, criteria, 10, cv2.KMEANS_RANDOM_CENTERS)
-                center = np.uint8(center)
-                res = center[label.flatten()]
-                result_image = res.reshape((img.shape))
-                self.processed_image = result_image
-                self.update_display()
+                self.run_operation(
+                    "kmeans", on_details=self.show_kmeans_stats,
+                    k=self.kmeans_k.value(), seed=self.kmeans_seed.value(),
+                    warm_start=self.kmeans_warm_start.isChecked(),
+                    output="labels" if self.kmeans_labels.isChecked() else "colors")
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"K-means uygulanırken hata: {str(e)}")
 
+    def show_kmeans_stats(self, result):
+        # Küme başına renk örneği, renk ve piksel oranı
+        rows = []
+        for s in result.stats():
+            r, g, b = s["color"]
+            rows.append(f'<span style="color:#{r:02x}{g:02x}{b:02x}">■</span> '
+                        f'{s["label"]}: ({r}, {g}, {b}) %{s["ratio"] * 100:.1f}')
+        self.kmeans_stats.setText("<br>".join(rows))
+
     def apply_gaussian_lpf(self):
         try:
             if self.processed_image is not None:
-                gray = cv2.cvtColor(self.processed_image, cv2.COLOR_RGB2GRAY)
-                rows, cols = gray.shape
-                crow, ccol = rows // 2, cols // 2
-                f = np.fft.fft2(gray)
-                fshift = np.fft.fftshift(f)
-                sigma = 30
-                x = np.arange(-ccol, ccol)
-                y = np.arange(-crow, crow)
-                X, Y = np.meshgrid(x, y)
-                gaussian_lpf = np.exp(-(X**2 + Y**2) / (2 * sigma**2))
-                fshift = fshift * gaussian_lpf
-                f_ishift = np.fft.ifftshift(fshift)
-                img_back = np.fft.ifft2(f_ishift)
-                img_back = np.abs(img_back)
-                img_back = cv2.normalize(img_back, None, 0, 255, cv2.NORM_MINMAX)
-                self.processed_image = cv2.cvtColor(img_back.astype(np.uint8), cv2.COLOR_GRAY2RGB)
-                self.update_display()
+                self.run_operation("gaussian_lpf", sigma=30,
+                                   color_mode=self.frequency_color_mode.currentData())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Gaussian LPF uygulanırken hata: {str(e)}")
 
     def apply_gaussian_hpf(self):
         try:
             if self.processed_image is not None:
-                gray = cv2.cvtColor(self.processed_image, cv2.COLOR_RGB2GRAY)
-                rows, cols = gray.shape
-                crow, ccol = rows // 2, cols // 2
-                f = np.fft.fft2(gray)
-                fshift = np.fft.fftshift(f)
-                # Gaussian HPF maskesi
-                sigma = 30
-                x = np.arange(-ccol, ccol)
-                y = np.arange(-crow, crow)
-                X, Y = np.meshgrid(x, y)
-                gaussian_lpf = np.exp(-(X**2 + Y**2) / (2 * sigma**2))
-                gaussian_hpf = 1 - gaussian_lpf
-                fshift = fshift * gaussian_hpf
-                f_ishift = np.fft.ifftshift(fshift)
-                img_back = np.fft.ifft2(f_ishift)
-                img_back = np.abs(img_back)
-                img_back = cv2.normalize(img_back, None, 0, 255, cv2.NORM_MINMAX)
-                self.processed_image = cv2.cvtColor(img_back.astype(np.uint8), cv2.COLOR_GRAY2RGB)
-                self.update_display()
+                self.run_operation("gaussian_hpf", sigma=30,
+                                   color_mode=self.frequency_color_mode.currentData())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Gaussian HPF uygulanırken hata: {str(e)}")
 
+def print_startup_report(total):
+    # "ilk sekme" ImageProcessor() süresinin içindedir; toplam ayrıca ölçülür
+    print("Açılış süreleri:")
+    for label, elapsed in STARTUP_TIMINGS:
+        print(f"  {label:<22} {elapsed * 1000:8.1f} ms")
+    print(f"  {'ilk pencere (toplam)':<22} {total * 1000:8.1f} ms")
+    print(f"  {'ilk sekme öncesi yüklü':<22} {', '.join(STARTUP_LOADED) or 'yok'}")
+
+
 if __name__ == '__main__':
+    # --startup-report: ilk çizimden sonra açılış sürelerini yazdırıp kapanır
+    startup_report = "--startup-report" in sys.argv
+    start = time.perf_counter()
     app = QApplication(sys.argv)
+    STARTUP_TIMINGS.append(("QApplication", time.perf_counter() - start))
+    start = time.perf_counter()
     window = ImageProcessor()
+    STARTUP_TIMINGS.append(("ImageProcessor()", time.perf_counter() - start))
+    start = time.perf_counter()
     window.show()
+
+    def first_paint():
+        STARTUP_TIMINGS.append(("gösterme + ilk çizim", time.perf_counter() - start))
+        if startup_report:
+            print_startup_report(time.perf_counter() - _IMPORT_START)
+            app.quit()
+
+    # Sıfır gecikmeli zamanlayıcı olay döngüsü ilk çizimi yaptıktan sonra çalışır
+    QTimer.singleShot(0, first_paint)
     sys.exit(app.exec()) 
\ No newline at end of file
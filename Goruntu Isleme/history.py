@@ -0,0 +1,289 @@
+# Bellek bütçeli geri al / yinele geçmişi
+#
+# Her adım için görüntünün tam kopyası yerine bir önceki duruma dönmeyi
+# sağlayan küçük bir "fark" saklanır:
+#   - kendi tersi olan işlemler (negatif, çevirme) için yalnızca işlem adı,
+#   - boyutu değişmeyen işlemler için değişen alanın sınır kutusundaki pikseller,
+#   - boyutu değişen işlemler (kırpma, döndürme...) için görüntünün kendisi,
+#   - diske eşlenmiş (döşemeli moddaki) görüntüler için yalnızca dizinin kendisi.
+# En yeni fark sıkıştırılmadan tutulur; böylece tek adımlık geri alma anında
+# olur. Daha eski farklar zlib ile sıkıştırılır ve bellek bütçesi aşılınca
+# en eskilerden başlanarak diske taşınır. Küçük bir örnekte yeterince
+# küçülmeyen (gürültülü) veri sıkıştırılmadan tutulur: zlib onda yavaştır,
+# kazancı yoktur ve diskten ham okumak açmaktan çok daha hızlıdır.
+#
+# NumPy ve işlem modülü ilk fark hesaplanırken içe aktarılır; böylece geçmiş
+# nesnesi arayüzün açılışını yavaşlatmaz.
+import os
+import tempfile
+import zlib
+
+DEFAULT_BUDGET_MB = 256
+DEFAULT_MAX_STEPS = 100
+
+# Sıkıştırma denemesi: eşit aralıklı SAMPLE_CHUNKS parça, en az bu oranda
+# küçülmeyen veri ham saklanır
+SAMPLE_CHUNKS = 16
+SAMPLE_CHUNK_BYTES = 16 * 1024
+MIN_COMPRESSION_GAIN = 0.1
+
+# Kendi tersi olan işlemler: aynı parametrelerle yeniden uygulamak geri alır
+SELF_INVERSE = ("negative", "flip")
+
+
+class _InverseOp:
+    def __init__(self, name, params):
+        self.name = name
+        self.params = params
+
+    def nbytes(self):
+        return 0
+
+    def compact(self):
+        pass
+
+    def spill(self, directory):
+        pass
+
+    def apply(self, current):
+        import operations
+        return operations.apply(current, self.name, **self.params)
+
+
+class _Reference:
+    # Zaten diskte duran (memmap) bir görüntü; bellekte yer tutmaz
+    def __init__(self, array):
+        self.array = array
+
+    def nbytes(self):
+        return 0
+
+    def compact(self):
+        pass
+
+    def spill(self, directory):
+        pass
+
+    def apply(self, current):
+        return self.array
+
+
+def _compressible(raw):
+    import numpy as np
+    data = memoryview(raw.reshape(-1).view(np.uint8))
+    step = max(SAMPLE_CHUNK_BYTES, len(data) // SAMPLE_CHUNKS)
+    sample = b"".join(data[i:i + SAMPLE_CHUNK_BYTES] for i in range(0, len(data), step))
+    return len(zlib.compress(sample, 1)) <= (1 - MIN_COMPRESSION_GAIN) * len(sample)
+
+
+class Pixels:
+    # Görüntünün (ya da bir alanının) pikselleri: ham, sıkıştırılmış veya diskte.
+    # Belge oturumu (documents.py) da etkin olmayan belgeleri bununla diske taşır.
+    def __init__(self, data):
+        import numpy as np
+        self.shape = data.shape
+        self.dtype = data.dtype
+        self.raw = np.ascontiguousarray(data)
+        self.compressed = None
+        self.path = None
+        # Diskteki dosya sıkıştırılmış mı; None: henüz denenmedi
+        self.packed = None
+
+    def nbytes(self):
+        if self.raw is not None:
+            return self.raw.nbytes
+        if self.compressed is not None:
+            return len(self.compressed)
+        return 0
+
+    def disk_bytes(self):
+        return os.path.getsize(self.path) if self.path else 0
+
+    def compact(self):
+        if self.raw is None:
+            return
+        if self.packed is None:
+            self.packed = _compressible(self.raw)
+        if self.packed:
+            self.compressed = zlib.compress(self.raw, 1)
+            self.raw = None
+
+    def spill(self, directory):
+        self.compact()
+        data = self.compressed if self.compressed is not None else self.raw
+        if data is None:
+            return
+        fd, self.path = tempfile.mkstemp(suffix=".gecmis", dir=directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        self.compressed = None
+        self.raw = None
+
+    def load(self):
+        import numpy as np
+        if self.raw is not None:
+            return self.raw
+        data = self.compressed
+        if data is None and not self.packed:
+            return np.fromfile(self.path, self.dtype).reshape(self.shape)
+        if data is None:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        return np.frombuffer(zlib.decompress(data), self.dtype).reshape(self.shape)
+
+    def discard(self):
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+class _Patch(Pixels):
+    def __init__(self, data, box):
+        super().__init__(data)
+        self.box = box
+
+    def apply(self, current):
+        y0, y1, x0, x1 = self.box
+        restored = current.copy()
+        restored[y0:y1, x0:x1] = self.load()
+        return restored
+
+
+class _Snapshot(Pixels):
+    def apply(self, current):
+        return self.load().copy()
+
+
+def make_delta(current, target, name=None, params=None):
+    # current görüntüsünden target görüntüsüne dönmeyi sağlayan en küçük fark.
+    # name/params current'ı target'tan üreten işlemdir.
+    import numpy as np
+    if name in SELF_INVERSE:
+        return _InverseOp(name, params or {})
+    if isinstance(target, np.memmap):
+        return _Reference(target)
+    if current.shape != target.shape:
+        return _Snapshot(target)
+    changed = current != target
+    if changed.ndim == 3:
+        changed = changed.any(axis=2)
+    rows = np.flatnonzero(changed.any(axis=1))
+    if len(rows) == 0:
+        return _Patch(target[:0, :0], (0, 0, 0, 0))
+    cols = np.flatnonzero(changed.any(axis=0))
+    box = (rows[0], rows[-1] + 1, cols[0], cols[-1] + 1)
+    return _Patch(target[box[0]:box[1], box[2]:box[3]], box)
+
+
+def _reverse(delta, current):
+    # delta uygulanıp current'tan çıkılırken current'a geri dönmeyi sağlayan
+    # fark. Görüntüler yeniden karşılaştırılmaz: yama yalnızca kendi kutusunu
+    # değiştirdiği için tersi aynı kutudaki current pikselleridir.
+    import numpy as np
+    if isinstance(current, np.memmap):
+        return _Reference(current)
+    if isinstance(delta, _Patch):
+        y0, y1, x0, x1 = delta.box
+        return _Patch(current[y0:y1, x0:x1], delta.box)
+    return _Snapshot(current)
+
+
+class _Entry:
+    def __init__(self, label, delta, meta):
+        self.label = label
+        self.delta = delta
+        # Bu adıma dönüldüğünde geri yüklenecek ek durum (ör. tarif adımları)
+        self.meta = meta
+
+
+class History:
+    def __init__(self, budget_mb=DEFAULT_BUDGET_MB, max_steps=DEFAULT_MAX_STEPS):
+        self.budget = budget_mb * 1024 * 1024
+        self.max_steps = max_steps
+        self._undo = []
+        self._redo = []
+        self._directory = None
+
+    def __len__(self):
+        return len(self._undo)
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def set_budget(self, budget_mb):
+        self.budget = budget_mb * 1024 * 1024
+        self._enforce_budget()
+
+    def memory_bytes(self):
+        return sum(e.delta.nbytes() for e in self._undo + self._redo)
+
+    def disk_bytes(self):
+        return sum(e.delta.disk_bytes() for e in self._undo + self._redo
+                   if isinstance(e.delta, Pixels))
+
+    def push(self, label, before, after, meta=None, delta=None, params=None):
+        # after <- label(before). delta önceden (ör. arka planda) hesaplanmışsa
+        # verilebilir; yoksa burada hesaplanır. meta geri alınınca döndürülür.
+        if delta is None:
+            delta = make_delta(after, before, label, params)
+        self._discard(self._redo)
+        self._redo = []
+        self._undo.append(_Entry(label, delta, meta))
+        if len(self._undo) > self.max_steps:
+            self._discard(self._undo[:1])
+            del self._undo[0]
+        self._enforce_budget()
+
+    def undo(self, current, current_meta=None):
+        # (önceki görüntü, önceki meta) döndürür
+        return self._step(self._undo, self._redo, current, current_meta)
+
+    def redo(self, current, current_meta=None):
+        return self._step(self._redo, self._undo, current, current_meta)
+
+    def _step(self, source, target, current, current_meta):
+        if not source:
+            return None
+        entry = source.pop()
+        image = entry.delta.apply(current)
+        if isinstance(entry.delta, _InverseOp):
+            back = entry.delta
+        else:
+            back = _reverse(entry.delta, current)
+            if isinstance(entry.delta, Pixels):
+                entry.delta.discard()
+        target.append(_Entry(entry.label, back, current_meta))
+        self._enforce_budget()
+        return image, entry.meta
+
+    def clear(self):
+        self._discard(self._undo + self._redo)
+        self._undo = []
+        self._redo = []
+
+    def _discard(self, entries):
+        for e in entries:
+            if isinstance(e.delta, Pixels):
+                e.delta.discard()
+
+    def _enforce_budget(self):
+        # Yığınların tepesi dışındaki farkları sıkıştır, bütçe aşılıyorsa en
+        # eskilerden başlayarak diske taşı
+        for stack in (self._undo, self._redo):
+            for e in stack[:-1]:
+                e.delta.compact()
+        if self.memory_bytes() <= self.budget:
+            return
+        if self._directory is None:
+            import tiled
+            self._directory = tiled.scratch_directory()
+        # En eski geri alma adımları, sonra en uzak yineleme adımları
+        for e in self._undo + self._redo[::-1]:
+            if self.memory_bytes() <= self.budget:
+                break
+            e.delta.spill(self._directory)
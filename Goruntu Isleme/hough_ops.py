@@ -0,0 +1,152 @@
+# Hough dönüşümü: doğru, doğru parçası ve çember bulma
+#
+# Üç mod vardır:
+#   - "standard": cv2.HoughLines; sonsuz doğrular görüntü sınırlarına
+#     kırpılarak parça olarak verilir,
+#   - "probabilistic": cv2.HoughLinesP; doğrudan doğru parçaları,
+#   - "circles": cv2.HoughCircles.
+# Sonuçlar Detection nesnesinde yapılandırılmış veri olarak döner ve JSON
+# olarak kaydedilebilir; çizim ayrı bir adımdır.
+#
+# downscale < 1 ise oylama küçültülmüş kenar haritası üzerinde yapılır ve
+# koordinatlar tam çözünürlüğe geri ölçeklenir. Doğrularda oy sayısı
+# uzunlukla orantılı olduğundan eşik, en küçük uzunluk ve boşluk da aynı
+# oranla küçültülür; böylece aynı parametreler her ölçekte benzer sonuç
+# verir. Çember biriktiricisinin eşiği ölçekle düzgün değişmediği için
+# olduğu gibi kullanılır.
+import json
+
+import cv2
+import numpy as np
+
+MODES = ("standard", "probabilistic", "circles")
+# Mod -> varsayılan biriktirici eşiği
+DEFAULT_THRESHOLDS = {"standard": 120, "probabilistic": 80, "circles": 30}
+
+
+class Detection:
+    def __init__(self, mode, shape, items, params):
+        self.mode = mode
+        # (yükseklik, genişlik)
+        self.shape = shape
+        # Doğrular: {"x1", "y1", "x2", "y2", ...}; çemberler: {"x", "y", "r"}
+        self.items = items
+        self.params = params
+
+    def __len__(self):
+        return len(self.items)
+
+    def to_dict(self):
+        return {"mode": self.mode, "size": list(self.shape), "params": self.params,
+                "items": self.items}
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+
+def _downscale(image, factor):
+    if factor >= 1:
+        return image
+    height, width = image.shape[:2]
+    size = (max(1, int(round(width * factor))), max(1, int(round(height * factor))))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+def _edge_map(gray, low, high, factor):
+    # Görüntü önce küçültülür; Canny de oylama da küçük görüntüde çalışır
+    return cv2.Canny(_downscale(gray, factor), low, high, apertureSize=3)
+
+
+def _clip_to_image(rho, theta, width, height):
+    # rho/theta doğrusunun görüntü dikdörtgeni içinde kalan parçası; doğru
+    # görüntüyü kesmiyorsa None
+    a, b = np.cos(theta), np.sin(theta)
+    x0, y0 = a * rho, b * rho
+    reach = float(np.hypot(width, height)) + 1
+    p1 = (int(round(x0 - reach * b)), int(round(y0 + reach * a)))
+    p2 = (int(round(x0 + reach * b)), int(round(y0 - reach * a)))
+    inside, p1, p2 = cv2.clipLine((0, 0, width, height), p1, p2)
+    return (p1, p2) if inside else None
+
+
+def detect(image, mode="standard", canny_low=50, canny_high=150, threshold=120,
+           max_lines=100, min_length=50, max_gap=10, min_radius=0, max_radius=0,
+           min_distance=20, downscale=1.0):
+    # RGB (ya da gri) uint8 görüntüde doğru/çember arar; Detection döndürür.
+    # max_lines en güçlü (standart), en uzun (olasılıksal) ya da en çok oy
+    # alan (çember) sonuçları sınırlar; 0 sınırsızdır.
+    if mode not in MODES:
+        raise ValueError(f"Bilinmeyen Hough modu: {mode}")
+    if not 0 < downscale <= 1:
+        raise ValueError("Küçültme oranı 0 ile 1 arasında olmalı")
+    gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY) if image.ndim == 3 else image
+    height, width = gray.shape
+    params = {"canny_low": canny_low, "canny_high": canny_high, "threshold": threshold,
+              "max_lines": max_lines, "downscale": downscale}
+    back = 1.0 / downscale
+    votes = max(1, int(round(threshold * downscale)))
+    items = []
+
+    if mode == "standard":
+        lines = cv2.HoughLines(_edge_map(gray, canny_low, canny_high, downscale),
+                               1, np.pi / 180, votes)
+        # OpenCV doğruları oy sayısına göre azalan sırada verir; düşük eşikte
+        # binlerce zayıf aday olabileceğinden sınıra ulaşınca durulur
+        for rho, theta in ([] if lines is None else lines.reshape(-1, 2)):
+            if max_lines and len(items) >= max_lines:
+                break
+            segment = _clip_to_image(rho * back, theta, width, height)
+            if segment is None:
+                continue
+            (x1, y1), (x2, y2) = segment
+            items.append({"x1": x1, "y1": y1, "x2": x2, "y2": y2,
+                          "rho": round(float(rho * back), 2),
+                          "theta": round(float(np.degrees(theta)), 2)})
+    elif mode == "probabilistic":
+        params.update(min_length=min_length, max_gap=max_gap)
+        lines = cv2.HoughLinesP(_edge_map(gray, canny_low, canny_high, downscale),
+                                1, np.pi / 180, votes,
+                                minLineLength=min_length * downscale,
+                                maxLineGap=max_gap * downscale)
+        for x1, y1, x2, y2 in ([] if lines is None else lines.reshape(-1, 4)):
+            x1, y1, x2, y2 = (int(round(v * back)) for v in (x1, y1, x2, y2))
+            items.append({"x1": x1, "y1": y1, "x2": x2, "y2": y2,
+                          "length": round(float(np.hypot(x2 - x1, y2 - y1)), 2)})
+        items.sort(key=lambda line: line["length"], reverse=True)
+    else:
+        params.update(min_radius=min_radius, max_radius=max_radius,
+                      min_distance=min_distance)
+        # HoughCircles kenarları kendi bulur (param1 Canny'nin üst eşiğidir);
+        # gri görüntü küçültülür ve hafifçe yumuşatılır
+        small = cv2.medianBlur(_downscale(gray, downscale), 5)
+        circles = cv2.HoughCircles(small, cv2.HOUGH_GRADIENT, 1,
+                                   max(1.0, min_distance * downscale),
+                                   param1=canny_high, param2=max(1, threshold),
+                                   minRadius=int(min_radius * downscale),
+                                   maxRadius=int(max_radius * downscale))
+        for x, y, r in ([] if circles is None else circles.reshape(-1, 3)):
+            items.append({"x": round(float(x * back), 1), "y": round(float(y * back), 1),
+                          "r": round(float(r * back), 1)})
+
+    if max_lines:
+        items = items[:max_lines]
+    return Detection(mode, (height, width), items, params)
+
+
+def draw(image, detection, color=(0, 255, 0), thickness=2):
+    # Sonuçları görüntünün gri kopyası üzerine çizer
+    gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY) if image.ndim == 3 else image
+    overlay = cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
+    for item in detection.items:
+        if detection.mode == "circles":
+            center = (int(round(item["x"])), int(round(item["y"])))
+            cv2.circle(overlay, center, int(round(item["r"])), color, thickness)
+            cv2.circle(overlay, center, 2, (255, 0, 0), -1)
+        else:
+            cv2.line(overlay, (item["x1"], item["y1"]), (item["x2"], item["y2"]),
+                     color, thickness)
+    return overlay
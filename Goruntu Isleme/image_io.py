@@ -0,0 +1,322 @@
+# Arayüzden bağımsız görüntü okuma/yazma
+#
+# Uygulama içinde görüntüler her zaman RGB uint8 olarak tutulur. Dosya yolları
+# np.fromfile/tofile ile okunup yazılır; böylece Türkçe karakterli yollar da
+# OpenCV ile sorunsuz çalışır.
+#
+# JPEG'ler DCT ölçeklemesiyle (IMREAD_REDUCED_*) 1/2, 1/4 ya da 1/8 boyutta
+# doğrudan çözülebilir; tam çözmenin küçük bir kesri kadar sürer ve yükleme
+# sırasında önizleme için kullanılır. EXIF yönü (Orientation etiketi) tüm
+# yollarda aynı şekilde uygulanır: OpenCV'ye yönü yok saymasını söyleyip etiket
+# burada okunur (JPEG başlığı doğrudan, TIFF/WebP Pillow ile).
+#
+# OpenCV kodlayıcıları BGR bekler. Çağıran görüntünün gri olduğunu biliyorsa
+# (bkz. Recipe.is_gray) tek kanal kodlanır: kanal değişimi gerekmez ve
+# kodlanacak veri üçte birine iner. Görüntü çağırana aitse (toplu işler)
+# kanallar yerinde değiştirilir; arayüzde görüntü ekranda ve geçmişte
+# kullanıldığı için tek bir BGR kopyası alınır. (Pillow RGB'yi doğrudan
+# alır ama piksel başına 4 baytlık kendi kopyasını oluşturur ve burada
+# OpenCV'den yavaş kodlar.)
+import io
+import os
+import struct
+import time
+
+import cv2
+import numpy as np
+
+# Büyükten küçüğe JPEG'in doğrudan çözülebildiği küçültme oranları
+REDUCED_SCALES = (8, 4, 2)
+_REDUCED_FLAGS = {
+    (2, False): cv2.IMREAD_REDUCED_COLOR_2,
+    (4, False): cv2.IMREAD_REDUCED_COLOR_4,
+    (8, False): cv2.IMREAD_REDUCED_COLOR_8,
+    (2, True): cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    (4, True): cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    (8, True): cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+# JPEG boyut bilgisini taşıyan SOF işaretçileri (DHT, JPG ve DAC hariç)
+_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+_ORIENTATION_TAG = 0x0112
+
+# Kayıpsız TIFF sıkıştırmaları
+TIFF_COMPRESSIONS = {
+    "lzw": cv2.IMWRITE_TIFF_COMPRESSION_LZW,
+    "deflate": cv2.IMWRITE_TIFF_COMPRESSION_ADOBE_DEFLATE,
+    "none": cv2.IMWRITE_TIFF_COMPRESSION_NONE,
+}
+
+# EXIF yönü -> görüntüyü dik hale getiren dönüşüm
+_ORIENTATIONS = {
+    2: lambda image: cv2.flip(image, 1),
+    3: lambda image: cv2.rotate(image, cv2.ROTATE_180),
+    4: lambda image: cv2.flip(image, 0),
+    5: lambda image: cv2.transpose(image),
+    6: lambda image: cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE),
+    7: lambda image: cv2.rotate(cv2.transpose(image), cv2.ROTATE_180),
+    8: lambda image: cv2.rotate(image, cv2.ROTATE_90_COUNTERCLOCKWISE),
+}
+
+
+class Decoded:
+    # Çözülmüş görüntü ve ölçümleri; süreler saniyedir. full_size, yön
+    # uygulandıktan sonra dosyadaki tam çözünürlüktür (genişlik, yükseklik).
+    def __init__(self, image, bytes_read, read_seconds, decode_seconds, scale, full_size,
+                 orientation):
+        self.image = image
+        self.bytes_read = bytes_read
+        self.read_seconds = read_seconds
+        self.decode_seconds = decode_seconds
+        self.scale = scale
+        self.full_size = full_size
+        self.orientation = orientation
+
+    def summary(self):
+        height, width = self.image.shape[:2]
+        text = f"{width}x{height}"
+        if self.scale > 1:
+            text += f" (1/{self.scale} ölçek)"
+        return (f"{text}, {self.bytes_read / 2**20:.1f} MB okundu, okuma "
+                f"{self.read_seconds * 1000:.0f} ms, çözme {self.decode_seconds * 1000:.0f} ms")
+
+
+class Encoded:
+    # Kodlama ölçümleri; süreler saniyedir
+    def __init__(self, bytes_written, channels, encode_seconds, write_seconds):
+        self.bytes_written = bytes_written
+        self.channels = channels
+        self.encode_seconds = encode_seconds
+        self.write_seconds = write_seconds
+
+    def summary(self):
+        kind = "gri" if self.channels == 1 else "renkli"
+        return (f"{self.bytes_written / 2**20:.1f} MB ({kind}), kodlama "
+                f"{self.encode_seconds * 1000:.0f} ms, yazma {self.write_seconds * 1000:.0f} ms")
+
+
+def _exif_orientation(view, start, end):
+    # TIFF yapısındaki EXIF bloğunun ilk IFD'sinden Orientation etiketi
+    order = bytes(view[start:start + 2])
+    if order not in (b"II", b"MM"):
+        return 1
+    endian = "<" if order == b"II" else ">"
+    ifd = start + struct.unpack_from(endian + "I", view, start + 4)[0]
+    count = struct.unpack_from(endian + "H", view, ifd)[0]
+    for i in range(count):
+        entry = ifd + 2 + 12 * i
+        if entry + 12 > end:
+            break
+        tag, _, _, value = struct.unpack_from(endian + "HHIH", view, entry)
+        if tag == _ORIENTATION_TAG:
+            return value if value in _ORIENTATIONS else 1
+    return 1
+
+
+def jpeg_header(data):
+    # JPEG başlığından (genişlik, yükseklik, EXIF yönü); JPEG değilse None.
+    # Yalnızca SOF işaretçisine kadar olan segmentler okunur.
+    view = memoryview(data)
+    if bytes(view[:2]) != b"\xff\xd8":
+        return None
+    orientation = 1
+    pos = 2
+    try:
+        while pos + 4 <= len(view):
+            if view[pos] != 0xFF:
+                return None
+            marker = view[pos + 1]
+            if marker == 0xFF:
+                # Dolgu baytı
+                pos += 1
+                continue
+            length = struct.unpack_from(">H", view, pos + 2)[0]
+            if marker == 0xE1 and bytes(view[pos + 4:pos + 10]) == b"Exif\x00\x00":
+                orientation = _exif_orientation(view, pos + 10, pos + 2 + length)
+            elif marker in _SOF_MARKERS:
+                height, width = struct.unpack_from(">HH", view, pos + 5)
+                return width, height, orientation
+            pos += 2 + length
+    except struct.error:
+        pass
+    return None
+
+
+def _pil_orientation(data):
+    # TIFF ve WebP'de EXIF yönü; Pillow yalnızca başlığı okur
+    header = bytes(data[:12])
+    if header[:4] not in (b"II*\x00", b"MM\x00*") and not (header[:4] == b"RIFF"
+                                                         and header[8:12] == b"WEBP"):
+        return 1
+    from PIL import Image
+    try:
+        with Image.open(io.BytesIO(data)) as pil_image:
+            orientation = pil_image.getexif().get(_ORIENTATION_TAG, 1)
+    except Exception:
+        return 1
+    return orientation if orientation in _ORIENTATIONS else 1
+
+
+def reduced_scale(size, max_size):
+    # Uzun kenarı max_size'dan küçük kalmayan en büyük JPEG küçültme oranı
+    longest = max(size)
+    for scale in REDUCED_SCALES:
+        if -(-longest // scale) >= max_size:
+            return scale
+    return 1
+
+
+def _to_rgb(decoded):
+    # OpenCV'nin BGR/BGRA/gri çıktısını RGB uint8'e çevirir
+    if decoded.dtype == np.uint16:
+        decoded = (decoded >> 8).astype(np.uint8)
+    if decoded.ndim == 2:
+        return cv2.cvtColor(decoded, cv2.COLOR_GRAY2RGB)
+    if decoded.shape[2] == 4:
+        # Saydam alanları beyaz arka plan üzerine yerleştir
+        rgb = cv2.cvtColor(decoded, cv2.COLOR_BGRA2RGB).astype(np.float32)
+        alpha = decoded[:, :, 3:4].astype(np.float32) / 255.0
+        return (rgb * alpha + 255.0 * (1.0 - alpha) + 0.5).astype(np.uint8)
+    return cv2.cvtColor(decoded, cv2.COLOR_BGR2RGB)
+
+
+def _pil_decode(data, grayscale):
+    # OpenCV'nin çözemediği biçimler (ör. GIF) için Pillow
+    from PIL import Image
+    with Image.open(io.BytesIO(data)) as pil_image:
+        pil_image = pil_image.convert('L' if grayscale else 'RGBA')
+        decoded = np.array(pil_image)
+    if not grayscale:
+        decoded = cv2.cvtColor(decoded, cv2.COLOR_RGBA2BGRA)
+    return decoded
+
+
+def _read(path):
+    start = time.perf_counter()
+    data = np.fromfile(path, dtype=np.uint8)
+    return data, time.perf_counter() - start
+
+
+def _decode(data, read_seconds, grayscale, max_size):
+    start = time.perf_counter()
+    header = jpeg_header(data)
+    scale = 1
+    if header is not None:
+        orientation = header[2]
+        if max_size is not None:
+            scale = reduced_scale(header[:2], max_size)
+    else:
+        orientation = _pil_orientation(data)
+    if scale > 1:
+        flags = _REDUCED_FLAGS[(scale, grayscale)] | cv2.IMREAD_IGNORE_ORIENTATION
+    elif grayscale:
+        flags = cv2.IMREAD_GRAYSCALE | cv2.IMREAD_IGNORE_ORIENTATION
+    else:
+        # IMREAD_UNCHANGED (alfa kanalı korunur) yönü zaten uygulamaz
+        flags = cv2.IMREAD_UNCHANGED
+    decoded = cv2.imdecode(data, flags)
+    if decoded is None:
+        decoded = _pil_decode(data, grayscale)
+        scale = 1
+    if orientation in _ORIENTATIONS:
+        # Gri görüntü RGB'ye çevrilmeden önce döndürülür (üçte bir veri)
+        decoded = _ORIENTATIONS[orientation](decoded)
+    image = _to_rgb(decoded)
+    decode_seconds = time.perf_counter() - start
+
+    if header is not None:
+        width, height = header[:2]
+        full_size = (height, width) if orientation in (5, 6, 7, 8) else (width, height)
+    else:
+        full_size = (image.shape[1], image.shape[0])
+    return Decoded(image, data.size, read_seconds, decode_seconds, scale, full_size,
+                   orientation)
+
+
+def decode(path, grayscale=False, max_size=None):
+    # Dosyayı okuyup RGB uint8 olarak çözer; Decoded döndürür. max_size
+    # verilirse JPEG'ler uzun kenarı max_size'dan küçük olmayan en küçük
+    # DCT ölçeğinde çözülür (diğer biçimler tam boyutta).
+    data, read_seconds = _read(path)
+    return _decode(data, read_seconds, grayscale, max_size)
+
+
+def _preview(data, read_seconds, grayscale, max_size):
+    header = jpeg_header(data)
+    if header is None or reduced_scale(header[:2], max_size) == 1:
+        return None
+    return _decode(data, read_seconds, grayscale, max_size)
+
+
+def preview(path, grayscale=False, max_size=1024):
+    # Görüntü küçültülerek çözülebiliyorsa (uzun kenarı en az 2*max_size olan
+    # JPEG) hızlı önizleme; değilse None
+    data, read_seconds = _read(path)
+    return _preview(data, read_seconds, grayscale, max_size)
+
+
+def decode_with_preview(path, grayscale=False, max_size=None, preview_size=1024,
+                        report=None):
+    # decode() gibi; dosya bir kez okunur ve önizleme mümkünse tam çözmeden
+    # önce aynı baytlardan çözülüp report'a verilir
+    data, read_seconds = _read(path)
+    if report is not None:
+        small = _preview(data, read_seconds, grayscale, preview_size)
+        if small is not None:
+            report(small)
+    return _decode(data, read_seconds, grayscale, max_size)
+
+
+def read_image(path, grayscale=False):
+    return decode(path, grayscale).image
+
+
+def write_params(ext, png_compression=3, jpeg_quality=95, jpeg_progressive=False,
+                 webp_quality=90, webp_lossless=False, tiff_compression="lzw"):
+    # Uzantıya göre cv2.imencode parametreleri; diğer biçimlerin ayarları yok sayılır
+    ext = ext.lower()
+    if ext == ".png":
+        if not 0 <= png_compression <= 9:
+            raise ValueError("PNG sıkıştırma düzeyi 0 ile 9 arasında olmalı")
+        return [cv2.IMWRITE_PNG_COMPRESSION, png_compression]
+    if ext in (".jpg", ".jpeg"):
+        if not 1 <= jpeg_quality <= 100:
+            raise ValueError("JPEG kalitesi 1 ile 100 arasında olmalı")
+        return [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality,
+                cv2.IMWRITE_JPEG_PROGRESSIVE, int(jpeg_progressive)]
+    if ext == ".webp":
+        if webp_lossless:
+            return [cv2.IMWRITE_WEBP_LOSSLESS_MODE, cv2.IMWRITE_WEBP_LOSSLESS_ON]
+        if not 1 <= webp_quality <= 100:
+            raise ValueError("WebP kalitesi 1 ile 100 arasında olmalı")
+        return [cv2.IMWRITE_WEBP_QUALITY, webp_quality]
+    if ext in (".tif", ".tiff"):
+        if tiff_compression not in TIFF_COMPRESSIONS:
+            raise ValueError(f"Bilinmeyen TIFF sıkıştırması: {tiff_compression}")
+        return [cv2.IMWRITE_TIFF_COMPRESSION, TIFF_COMPRESSIONS[tiff_compression]]
+    return []
+
+
+def encode(path, image, params=None, gray=False, owned=False):
+    # RGB uint8 görüntüyü uzantının biçiminde kodlayıp yazar; Encoded döndürür.
+    # gray: üç kanal eşit, yalnızca ilki kodlanır; owned: görüntü bu çağrıdan
+    # sonra kullanılmayacak, kanallar yerinde değiştirilebilir
+    ext = os.path.splitext(path)[1] or ".png"
+    start = time.perf_counter()
+    if image.ndim == 2 or gray:
+        data = image if image.ndim == 2 else image[:, :, 0]
+    elif owned:
+        data = cv2.cvtColor(image, cv2.COLOR_RGB2BGR, dst=image)
+    else:
+        data = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+    ok, encoded = cv2.imencode(ext, data, params or [])
+    if not ok:
+        raise ValueError(f"Görüntü kodlanamadı: {path}")
+    encode_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    encoded.tofile(path)
+    return Encoded(encoded.size, 1 if data.ndim == 2 else 3, encode_seconds,
+                   time.perf_counter() - start)
+
+
+def write_image(path, image, params=None, gray=False, owned=False):
+    return encode(path, image, params, gray, owned).bytes_written
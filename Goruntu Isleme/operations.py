@@ -0,0 +1,484 @@
+# Arayüzden bağımsız görüntü işleme fonksiyonları
+#
+# Her fonksiyon RGB uint8 bir ndarray alır, açık parametrelerle çalışır ve
+# yeni bir ndarray döndürür. Bu modül PyQt6 veya matplotlib içe aktarmaz;
+# böylece ekran olmayan sunucularda ve toplu işlerde hızlıca kullanılabilir.
+# Hatalar istisna olarak yükseltilir, kullanıcıya gösterilmesi arayüzün işidir.
+# scipy.fft'i yükleyen frekans modülü yalnızca frekans işlemlerinde içe aktarılır.
+import cv2
+import numpy as np
+
+import compass_ops
+import convolution
+import hough_ops
+import morph_ops
+import point_ops
+import segmentation
+import smooth_ops
+
+
+class OperationCancelled(Exception):
+    # Çok adımlı işler (tarifler, yinelemeli filtreler) iptal edildiğinde
+    pass
+
+
+def _gray_to_rgb(gray):
+    return cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
+
+
+def _normalize_to_rgb(data):
+    # Kenar/frekans sonuçlarını 0-255 aralığına yayıp RGB'ye çevirir
+    data = cv2.normalize(data, None, 0, 255, cv2.NORM_MINMAX)
+    return _gray_to_rgb(data.astype(np.uint8))
+
+
+# --- Temel işlemler ---
+
+def grayscale(image):
+    return _gray_to_rgb(cv2.cvtColor(image, cv2.COLOR_RGB2GRAY))
+
+
+# Nokta işlemleri tablo motoruyla tek geçişte uygulanır (bkz. point_ops)
+
+def negative(image):
+    return point_ops.apply_chain(image, [("negative", {})])
+
+
+def brightness(image, value=0):
+    return point_ops.apply_chain(image, [("brightness", {"value": value})])
+
+
+def contrast(image, value=0):
+    return point_ops.apply_chain(image, [("contrast", {"value": value})])
+
+
+def threshold(image, value=127):
+    return point_ops.apply_chain(image, [("threshold", {"value": value})])
+
+
+def equalize_histogram(image):
+    # Her kanal için histogram eşitleme uygula
+    return point_ops.apply_chain(image, [("equalize_histogram", {})])
+
+
+# --- Geometrik işlemler ---
+
+def flip(image, direction=1):
+    # direction: 1 yatay, 0 dikey
+    return cv2.flip(image, direction)
+
+
+def rotate(image):
+    return cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE)
+
+
+def translate(image, tx=0, ty=0):
+    M = np.float32([[1, 0, tx], [0, 1, ty]])
+    height, width = image.shape[:2]
+    return cv2.warpAffine(image, M, (width, height))
+
+
+def scale(image, factor=1.0):
+    height, width = image.shape[:2]
+    new_size = (max(1, int(width * factor)), max(1, int(height * factor)))
+    return cv2.resize(image, new_size, interpolation=cv2.INTER_LINEAR)
+
+
+def shear(image, factor=0.0):
+    height, width = image.shape[:2]
+    M = np.float32([[1, factor, 0], [0, 1, 0]])
+    new_width = int(width + abs(factor * height))
+    return cv2.warpAffine(image, M, (new_width, height))
+
+
+def perspective(image, points):
+    # points: saat yönünde seçilmiş 4 köşe [(x, y), ...]
+    src_points = np.float32(points)
+    width = max(
+        np.linalg.norm(src_points[0] - src_points[1]),
+        np.linalg.norm(src_points[2] - src_points[3])
+    )
+    height = max(
+        np.linalg.norm(src_points[1] - src_points[2]),
+        np.linalg.norm(src_points[3] - src_points[0])
+    )
+    dst_points = np.float32([
+        [0, 0],
+        [width-1, 0],
+        [width-1, height-1],
+        [0, height-1]
+    ])
+    M = cv2.getPerspectiveTransform(src_points, dst_points)
+    return cv2.warpPerspective(image, M, (int(width), int(height)))
+
+
+def crop(image, x1, y1, x2, y2):
+    x1, y1 = max(0, x1), max(0, y1)
+    x2, y2 = min(image.shape[1]-1, x2), min(image.shape[0]-1, y2)
+    if x2 <= x1 or y2 <= y1:
+        raise ValueError("Geçerli bir alan seçilmedi!")
+    return image[y1:y2, x1:x2]
+
+
+# --- Uzamsal filtreler ---
+# Büyük yarıçaplarda da sabit maliyetli yumuşatma için bkz. smooth_ops
+
+def average_filter(image, ksize=3):
+    return smooth_ops.box(image, ksize)
+
+
+def median_filter(image, ksize=3):
+    return smooth_ops.median(image, ksize)
+
+
+def gaussian_filter(image, ksize=3):
+    return smooth_ops.gaussian(image, ksize)
+
+
+def _ring_kernel(ksize):
+    # Merkez pikseli hariç ksize x ksize komşuluk
+    if ksize < 3 or ksize % 2 == 0:
+        raise ValueError("Çekirdek boyutu 3 veya daha büyük tek sayı olmalı")
+    kernel = np.ones((ksize, ksize), np.uint8)
+    kernel[ksize // 2, ksize // 2] = 0
+    return kernel
+
+
+def conservative_filter(image, ksize=3):
+    # Konservatif filtre: piksel, komşularının (kendisi hariç) min-maks
+    # aralığına sıkıştırılır; yalnızca tek başına aşırı olan (darbe gürültüsü)
+    # pikseller değişir. Merkez çekirdeğe dahil olsaydı aralık pikseli her
+    # zaman kapsardı. Aşındırma/genişletme üç kanalı tek çağrıda işler.
+    kernel = _ring_kernel(ksize)
+    low = cv2.erode(image, kernel)
+    high = cv2.dilate(image, kernel)
+    cv2.max(image, low, dst=low)
+    return cv2.min(low, high, dst=low)
+
+
+# Crimmins için dört yön: (önceki komşu, piksel, sonraki komşu) dilimleri.
+# Yalnızca iki komşusu da görüntü içinde olan pikseller güncellenir; kenarlar
+# başa sarmaz. Dilimler kanal eksenine dokunmadığı için gri ve RGB aynıdır.
+_CRIMMINS_DIRECTIONS = (
+    ((slice(None, -2), slice(None)), (slice(1, -1), slice(None)), (slice(2, None), slice(None))),
+    ((slice(None), slice(None, -2)), (slice(None), slice(1, -1)), (slice(None), slice(2, None))),
+    ((slice(None, -2), slice(None, -2)), (slice(1, -1), slice(1, -1)), (slice(2, None), slice(2, None))),
+    ((slice(None, -2), slice(2, None)), (slice(1, -1), slice(1, -1)), (slice(2, None), slice(None, -2))),
+)
+# "Kararlı olana kadar" modunda en fazla bu kadar yineleme yapılır
+CRIMMINS_MAX_ITERATIONS = 100
+
+
+def _crimmins_dark(data, diff, mask, other):
+    # Koyu piksel düzeltmesi; a, b, c bir yön boyunca ardışık üç piksel ve b
+    # güncellenen pikseldir. Her adım tüm görüntüye bir önceki adımın sonucu
+    # üzerinden uygulanır (maske b değişmeden önce hesaplanır).
+    for before, center, after in _CRIMMINS_DIRECTIONS:
+        a, b, c = data[before], data[center], data[after]
+        d = diff[:b.size].reshape(b.shape)
+        m = mask[:b.size].reshape(b.shape)
+        o = other[:b.size].reshape(b.shape)
+        # 1) a >= b + 2 ise b += 1
+        np.greater_equal(np.subtract(a, b, out=d), 2, out=m)
+        b += m
+        # 2) a > b ve b <= c ise b += 1
+        np.greater(a, b, out=m)
+        m &= np.greater_equal(c, b, out=o)
+        b += m
+        # 3) c > b ve b <= a ise b += 1
+        np.greater(c, b, out=m)
+        m &= np.greater_equal(a, b, out=o)
+        b += m
+        # 4) c >= b + 2 ise b += 1
+        np.greater_equal(np.subtract(c, b, out=d), 2, out=m)
+        b += m
+
+
+def crimmins(image, iterations=1, should_stop=None):
+    # Crimmins benek (speckle) azaltma filtresi. Her yinelemede dört yönde
+    # önce koyu, sonra açık piksel düzeltmesi yapılır. iterations=None ise
+    # görüntü değişmeyene kadar (en fazla CRIMMINS_MAX_ITERATIONS) sürer.
+    # Hesap int16'da, tek dizide yerinde yapılır; kanallar birlikte işlenir.
+    # should_stop True döndürürse yinelemeler arasında iptal edilir.
+    data = image.astype(np.int16)
+    size = data.size
+    diff = np.empty(size, np.int16)
+    mask = np.empty(size, bool)
+    other = np.empty(size, bool)
+    until_stable = iterations is None
+    for _ in range(CRIMMINS_MAX_ITERATIONS if until_stable else iterations):
+        if should_stop is not None and should_stop():
+            raise OperationCancelled()
+        previous = data.copy() if until_stable else None
+        _crimmins_dark(data, diff, mask, other)
+        # Açık piksel düzeltmesi, ters çevrilmiş görüntünün koyu düzeltmesidir
+        np.negative(data, out=data)
+        _crimmins_dark(data, diff, mask, other)
+        np.negative(data, out=data)
+        if until_stable and np.array_equal(previous, data):
+            break
+    return data.astype(np.uint8)
+
+
+# --- Frekans alanı filtreleri ---
+
+def frequency_filter(image, filter_type="lpf", color_mode="gray", **params):
+    # filter_type: lpf, hpf, band_pass, band_stop, gaussian, gaussian_hpf, butterworth
+    from frequency import filter_image, to_filter_input, from_filter_output
+    data, ycrcb = to_filter_input(image, color_mode)
+    img_back = np.abs(filter_image(data, filter_type, **params))
+    img_back = cv2.normalize(img_back, None, 0, 255, cv2.NORM_MINMAX)
+    return from_filter_output(img_back.astype(np.uint8), color_mode, ycrcb)
+
+
+def butterworth(image, cutoff=30, order=2, color_mode="gray"):
+    return frequency_filter(image, "butterworth", color_mode, cutoff=cutoff, order=order)
+
+
+def gaussian_lpf(image, sigma=30, color_mode="gray"):
+    return frequency_filter(image, "gaussian", color_mode, sigma=sigma)
+
+
+def gaussian_hpf(image, sigma=30, color_mode="gray"):
+    return frequency_filter(image, "gaussian_hpf", color_mode, sigma=sigma)
+
+
+def homomorphic(image, high=2.5, low=0.5, cutoff=10, c=1, color_mode="gray"):
+    # high: yüksek frekans kazancı, low: düşük frekans kazancı,
+    # cutoff: kesme frekansı, c: keskinlik kontrolü
+    from frequency import filter_image, to_filter_input, from_filter_output
+    data, ycrcb = to_filter_input(image, color_mode)
+    # Sıfır değerlerini küçük bir sayı ile değiştir (log(0) tanımsız olduğu için)
+    data = np.maximum(data.astype(np.float32), 0.001)
+    img_log = np.log(data)
+    img_back = np.abs(filter_image(img_log, "homomorphic",
+                                   high=high, low=low, cutoff=cutoff, c=c))
+    img_exp = np.exp(img_back)
+    img_norm = cv2.normalize(img_exp, None, 0, 255, cv2.NORM_MINMAX)
+    return from_filter_output(img_norm.astype(np.uint8), color_mode, ycrcb)
+
+
+# --- Kenar bulma ---
+#
+# Genel çekirdekli filtreler (Prewitt, Roberts, Gabor) convolution.convolve
+# üzerinden çalışır; doğrudan, ayrıştırılmış ya da FFT yolu çekirdek ve
+# görüntü boyutuna göre seçilir. Sobel, Laplace ve pusula OpenCV'nin ya da
+# compass_ops'un kendi özel yollarını kullanır.
+#
+# Normalize edilen kenar bulucular iki adımdır: gri görüntüden ham yanıt
+# (EDGE_RESPONSES) ve tüm görüntünün min/maks değerine göre 0-255'e yayma.
+# Döşemeli işleme (tiled.py) yanıtları döşeme döşeme hesaplayıp yaymayı
+# global min/maks ile ayrıca yapar.
+
+def _to_gray(image):
+    return cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+
+
+def sobel_response(gray):
+    sobelx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
+    sobely = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
+    return cv2.magnitude(sobelx, sobely)
+
+
+def prewitt_response(gray):
+    kernelx = np.array([[1,0,-1],[1,0,-1],[1,0,-1]], dtype=np.float32)
+    kernely = np.array([[1,1,1],[0,0,0],[-1,-1,-1]], dtype=np.float32)
+    prewittx = convolution.convolve(gray, kernelx, label="prewitt")
+    prewitty = convolution.convolve(gray, kernely, label="prewitt")
+    return cv2.magnitude(prewittx.astype(np.float32), prewitty.astype(np.float32))
+
+
+def roberts_response(gray):
+    kernelx = np.array([[1, 0], [0, -1]], dtype=np.float32)
+    kernely = np.array([[0, 1], [-1, 0]], dtype=np.float32)
+    robertsx = convolution.convolve(gray, kernelx, label="roberts")
+    robertsy = convolution.convolve(gray, kernely, label="roberts")
+    return cv2.magnitude(robertsx.astype(np.float32), robertsy.astype(np.float32))
+
+
+def compass_response(gray, family="kirsch"):
+    # 8 yönlü pusula operatörünün en büyük yanıtı (Kirsch, Robinson, Prewitt)
+    return compass_ops.edges(gray, family)[0]
+
+
+def laplace_response(gray):
+    return np.abs(cv2.Laplacian(gray, cv2.CV_64F))
+
+
+EDGE_RESPONSES = {
+    "sobel": sobel_response,
+    "prewitt": prewitt_response,
+    "roberts": roberts_response,
+    "compass": compass_response,
+    "laplace": laplace_response,
+}
+
+
+def sobel(image):
+    return _normalize_to_rgb(sobel_response(_to_gray(image)))
+
+
+def prewitt(image):
+    return _normalize_to_rgb(prewitt_response(_to_gray(image)))
+
+
+def roberts(image):
+    return _normalize_to_rgb(roberts_response(_to_gray(image)))
+
+
+def compass(image, family="kirsch"):
+    return _normalize_to_rgb(compass_response(_to_gray(image), family))
+
+
+def compass_directions(image, family="kirsch"):
+    # Kenar yönü renk tonu, kenar şiddeti parlaklık olarak
+    return compass_ops.direction_image(*compass_ops.edges(_to_gray(image), family))
+
+
+def canny(image, low=100, high=200):
+    gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    return _gray_to_rgb(cv2.Canny(gray, low, high))
+
+
+def laplace(image):
+    return _normalize_to_rgb(laplace_response(_to_gray(image)))
+
+
+def gabor(image):
+    gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    kernel = cv2.getGaborKernel((21, 21), 8.0, np.pi/4, 10.0, 0.5, 0, ktype=cv2.CV_32F)
+    return _gray_to_rgb(convolution.convolve(gray, kernel, label="gabor"))
+
+
+def hough_detect(image, **params):
+    # (çizilmiş görüntü, hough_ops.Detection); parametreler için bkz. hough_ops.detect
+    detection = hough_ops.detect(image, **params)
+    return hough_ops.draw(image, detection), detection
+
+
+def hough(image, **params):
+    return hough_detect(image, **params)[0]
+
+
+# --- Morfolojik işlemler ---
+
+# Yapı elemanları ve büyük dikdörtgen çekirdeklerin hızlı yolu için bkz. morph_ops
+
+def erode(image, ksize=3, iterations=1, shape="rect", kernel=None):
+    return morph_ops.morphology(image, "erode", shape, ksize, iterations, kernel)
+
+
+def dilate(image, ksize=3, iterations=1, shape="rect", kernel=None):
+    return morph_ops.morphology(image, "dilate", shape, ksize, iterations, kernel)
+
+
+def morphology(image, op="open", shape="rect", ksize=3, iterations=1, kernel=None):
+    # op: erode, dilate, open, close, gradient, tophat, blackhat;
+    # shape: rect, ellipse, cross ya da custom (kernel: "010;111;010")
+    return morph_ops.morphology(image, op, shape, ksize, iterations, kernel)
+
+
+# --- Segmentasyon ---
+
+def kmeans_segment(image, k=4, attempts=3, seed=0, warm_start=False, output="colors"):
+    # (görüntü, segmentation.Segmentation); output="labels" etiket haritasını
+    # gri görüntü olarak döndürür
+    result = segmentation.segment(image, k, seed, attempts, warm_start=warm_start)
+    if output == "labels":
+        return result.label_image(), result
+    if output != "colors":
+        raise ValueError(f"Bilinmeyen k-means çıktısı: {output}")
+    return result.image, result
+
+
+def kmeans(image, k=4, attempts=3, seed=0, warm_start=False, output="colors"):
+    return kmeans_segment(image, k, attempts, seed, warm_start, output)[0]
+
+
+# should_stop parametresi alan, adımlar arasında iptal edilebilen işlemler
+CANCELLABLE = ("crimmins",)
+
+# İsimle çağrılabilen işlemler (toplu işler ve tarifler için)
+OPERATIONS = {
+    "grayscale": grayscale,
+    "negative": negative,
+    "brightness": brightness,
+    "contrast": contrast,
+    "threshold": threshold,
+    "equalize_histogram": equalize_histogram,
+    "flip": flip,
+    "rotate": rotate,
+    "translate": translate,
+    "scale": scale,
+    "shear": shear,
+    "perspective": perspective,
+    "crop": crop,
+    "average_filter": average_filter,
+    "median_filter": median_filter,
+    "gaussian_filter": gaussian_filter,
+    "conservative_filter": conservative_filter,
+    "crimmins": crimmins,
+    "frequency_filter": frequency_filter,
+    "butterworth": butterworth,
+    "gaussian_lpf": gaussian_lpf,
+    "gaussian_hpf": gaussian_hpf,
+    "homomorphic": homomorphic,
+    "sobel": sobel,
+    "prewitt": prewitt,
+    "roberts": roberts,
+    "compass": compass,
+    "compass_directions": compass_directions,
+    "canny": canny,
+    "laplace": laplace,
+    "gabor": gabor,
+    "hough": hough,
+    "erode": erode,
+    "dilate": dilate,
+    "morphology": morphology,
+    "kmeans": kmeans,
+}
+
+
+# Sonucun yanında ayrıntı da (ör. küme istatistikleri) döndüren sürümler
+DETAILED = {
+    "kmeans": kmeans_segment,
+    "hough": hough_detect,
+}
+
+
+# Kanalları eşit (gri) sonuç veren işlemler: girdi ne olursa olsun gri
+# çıktı verenler ve gri girdiyi renklendirenler (çizim, küme ya da yön
+# renkleri). Diğer işlemler her kanala aynı şeyi yaptığı için gri girdiyi
+# gri bırakır; frekans işlemleri "gray" renk modunda gri çıktı verir.
+GRAY_OUTPUT = ("grayscale", "sobel", "prewitt", "roberts", "compass", "canny", "laplace",
+               "gabor")
+COLOR_OUTPUT = ("compass_directions", "hough", "kmeans")
+FREQUENCY_OPERATIONS = ("frequency_filter", "butterworth", "gaussian_lpf", "gaussian_hpf",
+                        "homomorphic")
+
+
+def output_is_gray(name, params, gray_input=False):
+    # İşlemin sonucu kesin griyse True; görüntüye bakmadan, yalnızca işlemden
+    # ve girdinin gri olup olmadığından karar verir (kodlayıcı tek kanal yazar)
+    if name in GRAY_OUTPUT:
+        return True
+    if name in COLOR_OUTPUT:
+        return name == "kmeans" and params.get("output") == "labels"
+    if name in FREQUENCY_OPERATIONS and params.get("color_mode", "gray") == "gray":
+        return True
+    return gray_input
+
+
+def apply(image, name, **params):
+    operation = OPERATIONS.get(name)
+    if operation is None:
+        raise ValueError(f"Bilinmeyen işlem: {name}")
+    return operation(image, **params)
+
+
+def apply_detailed(image, name, **params):
+    # (sonuç, ayrıntı); ayrıntılı sürümü olmayan işlemlerde ayrıntı None'dır
+    operation = DETAILED.get(name)
+    if operation is None:
+        return apply(image, name, **params), None
+    return operation(image, **params)
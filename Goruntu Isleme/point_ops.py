@@ -0,0 +1,146 @@
+# Nokta işlemleri için birleşik tablo (LUT) motoru
+#
+# Parlaklık, kontrast, negatif, eşikleme ve histogram eşitleme her pikseli
+# yalnızca kendi değerine göre dönüştürür. Ardışık nokta işlemleri bu yüzden
+# kanal başına 256 girişlik tek bir tabloda birleştirilir ve görüntüye tek bir
+# cv2.LUT geçişiyle uygulanır; ara görüntüler oluşturulmaz.
+#
+# Histogram eşitlemenin tablosu verinin histogramına bağlıdır. Girdinin
+# histogramı bir kez hesaplanır, önceki tablolardan geçirilerek eşitlemenin
+# göreceği histogram piksellere dokunmadan elde edilir.
+#
+# Eşikleme önce gri tona çevirir; bu kanal karıştırma adımı tabloyla ifade
+# edilemediği için zincir burada bölünür ve sonrası gri görüntü üzerinde tek
+# tabloyla devam eder.
+import cv2
+import numpy as np
+
+# cv2.convertScaleAbs ile aynı sonuç için float32'de hesaplanır: doygun |a*x + b|
+def _brightness(lut, value=0):
+    return np.abs(lut.astype(np.float32) + np.float32(value))
+
+
+def _contrast(lut, value=0):
+    alpha = 1.0 + (value / 100.0)
+    return np.abs(lut.astype(np.float32) * np.float32(alpha))
+
+
+def _negative(lut):
+    return 255 - lut
+
+
+def _threshold_map(lut, value=127):
+    return np.where(lut > value, 255, 0)
+
+
+def _equalize_map(hist):
+    # cv2.equalizeHist ile aynı tablo; hist tek kanal için 256 sayım
+    lut = np.zeros(256, np.float64)
+    nonzero = np.flatnonzero(hist)
+    if len(nonzero) == 0:
+        return lut
+    hist = np.rint(hist).astype(np.int64)
+    first = nonzero[0]
+    total = hist.sum()
+    if hist[first] == total:
+        return np.full(256, first, np.float64)
+    scale = np.float32(255.0) / np.float32(total - hist[first])
+    cumulative = np.cumsum(hist) - hist[first]
+    lut[first:] = cumulative[first:].astype(np.float32) * scale
+    return lut
+
+
+def _saturate(lut):
+    return np.clip(np.rint(lut), 0, 255).astype(np.uint8)
+
+
+_MAPPINGS = {
+    "brightness": _brightness,
+    "contrast": _contrast,
+    "negative": _negative,
+}
+
+POINT_OPERATIONS = ("brightness", "contrast", "negative", "threshold", "equalize_histogram")
+
+
+def histograms(image, max_pixels=None):
+    # Kanal başına histogram, (kanal, 256). max_pixels verilirse büyük
+    # görüntülerde yalnızca her n. satır sayılır ve sonuç tüm görüntüye
+    # ölçeklenir (histogram paneli için yeterince doğru ve sabit maliyetli).
+    step = 1
+    if max_pixels:
+        height, width = image.shape[:2]
+        step = max(1, -(-height * width // max_pixels))
+    sample = image[::step]
+    channels = image.shape[2] if image.ndim == 3 else 1
+    return np.stack([cv2.calcHist([sample], [c], None, [256], [0, 256]).ravel()
+                     for c in range(channels)]) * step
+
+
+def _mapped_histogram(hist, lut):
+    # Tablodan geçirilmiş görüntünün histogramı: her giriş sayımı çıkış
+    # değerine taşınır
+    return np.bincount(lut, weights=hist, minlength=256)
+
+
+class _Segment:
+    # Tek bir cv2.LUT geçişiyle uygulanacak tablo (kanal başına)
+    def __init__(self, image):
+        self.image = image
+        self.channels = image.shape[2] if image.ndim == 3 else 1
+        self.lut = np.tile(np.arange(256, dtype=np.float64), (self.channels, 1))
+        self.identity = True
+        self.hist = None
+
+    def map(self, name, params):
+        mapping = _MAPPINGS[name]
+        self.lut = _saturate(np.stack([mapping(row, **params) for row in self.lut]))
+        self.identity = False
+
+    def threshold(self, value):
+        self.lut = _saturate(np.stack([_threshold_map(row, value) for row in self.lut]))
+        self.identity = False
+
+    def equalize(self):
+        if self.hist is None:
+            self.hist = histograms(self.image)
+        current = _saturate(self.lut)
+        self.lut = np.stack([
+            _equalize_map(_mapped_histogram(hist, row))[row]
+            for hist, row in zip(self.hist, current)])
+        self.lut = _saturate(self.lut)
+        self.identity = False
+
+    def apply(self):
+        if self.identity:
+            return self.image
+        lut = _saturate(self.lut)
+        if self.channels == 1:
+            return cv2.LUT(self.image, lut[0])
+        return cv2.LUT(self.image, np.ascontiguousarray(lut.T).reshape(256, 1, self.channels))
+
+
+def apply_chain(image, steps):
+    # steps: [(isim, {parametreler}), ...] sırayla uygulanacak nokta işlemleri.
+    # RGB uint8 görüntü döndürür; girdiyi değiştirmez.
+    segment = _Segment(image)
+    gray = False
+    for name, params in steps:
+        if name == "threshold":
+            if not gray:
+                # Önceki tabloyu uygula, gri tona geç ve zincire devam et
+                segment = _Segment(cv2.cvtColor(segment.apply(), cv2.COLOR_RGB2GRAY))
+                gray = True
+            segment.threshold(params.get("value", 127))
+        elif name == "equalize_histogram":
+            segment.equalize()
+        elif name in _MAPPINGS:
+            segment.map(name, params)
+        else:
+            raise ValueError(f"Nokta işlemi değil: {name}")
+    result = segment.apply()
+    if gray:
+        return cv2.cvtColor(result, cv2.COLOR_GRAY2RGB)
+    if result is image:
+        return image.copy()
+    return result
@@ -0,0 +1,194 @@
+# İşlem tarifleri
+#
+# Arayüzde uygulanan her işlem, adı ve parametreleriyle birlikte bir tarife
+# kaydedilir. Tarif JSON olarak saklanır ve arayüz olmadan başka bir görüntüye
+# (ör. küçük önizleme üzerinde ayarlanıp tam çözünürlüklü orijinale ya da
+# toplu işe) yeniden uygulanabilir.
+#
+# Piksel cinsinden parametreler, adımın kaydedildiği andaki görüntü boyutuna
+# göre ölçeklenir; böylece önizlemede ayarlanan adım tam çözünürlükte de aynı
+# sonucu verir:
+#   - konumlar (taşıma, kırpma, perspektif noktaları) eksen başına,
+#   - çekirdek boyutları (yumuşatma, konservatif, morfoloji) ortalama doğrusal
+#     oranla, en az 3 olan tek sayıya yuvarlanarak,
+#   - Hough uzunlukları (en kısa doğru, boşluk, yarıçaplar, merkez uzaklığı) ve
+#     doğru modlarında oy eşiği (oy sayısı doğru uzunluğuyla orantılıdır).
+# Bilerek ölçeklenmeyenler:
+#   - frekans filtrelerinin kesme/sigma değerleri: frequency.py bunları zaten
+#     görüntü başına devir (kutu indisi) cinsinden tanımlar; aynı içerik her
+#     çözünürlükte aynı kutuya düşer,
+#   - özel (elle girilmiş) yapı elemanları ve Gabor'un sabit çekirdeği,
+#   - Canny eşikleri (gradyan büyüklüğü), yineleme sayıları, ölçek/eğme oranları.
+#
+# Komut satırı:
+#   python recipe.py tarif.json girdi.png cikti.png
+#
+# İşlem modülleri (OpenCV/NumPy) tarif doğrulanırken ya da uygulanırken
+# içe aktarılır; arayüz boş bir tarifle açılırken yüklenmez.
+import json
+import sys
+import time
+
+RECIPE_VERSION = 1
+
+# İşlem -> görüntü boyutuyla ölçeklenmesi gereken parametreler
+# ("x"/"y": tek eksen, "xy": [x, y] nokta listesi, "length": doğrusal
+# uzunluk, "ksize": tek sayılı çekirdek boyutu, "votes": Hough doğru oyları)
+SPATIAL_PARAMS = {
+    "translate": {"tx": "x", "ty": "y"},
+    "crop": {"x1": "x", "y1": "y", "x2": "x", "y2": "y"},
+    "perspective": {"points": "xy"},
+    "average_filter": {"ksize": "ksize"},
+    "median_filter": {"ksize": "ksize"},
+    "gaussian_filter": {"ksize": "ksize"},
+    "conservative_filter": {"ksize": "ksize"},
+    "erode": {"ksize": "ksize"},
+    "dilate": {"ksize": "ksize"},
+    "morphology": {"ksize": "ksize"},
+    "hough": {"min_length": "length", "max_gap": "length", "min_radius": "length",
+              "max_radius": "length", "min_distance": "length", "threshold": "votes"},
+}
+
+
+def _scale_ksize(ksize, ratio):
+    # Tek sayı, en az 3; kaydedilen boyut zaten 3'ten küçükse (ör. morfolojide 1)
+    # küçültülmez
+    if ksize < 3:
+        return ksize
+    return max(3, 2 * int(round((ksize * ratio - 1) / 2)) + 1)
+
+
+def _scale_params(name, params, recorded_size, shape):
+    spatial = SPATIAL_PARAMS.get(name)
+    if not spatial or not recorded_size:
+        return params
+    sy = shape[0] / recorded_size[0]
+    sx = shape[1] / recorded_size[1]
+    ratio = (sx * sy) ** 0.5
+    scaled = dict(params)
+    for key, axis in spatial.items():
+        if key not in scaled:
+            continue
+        value = scaled[key]
+        if axis == "xy":
+            scaled[key] = [[x * sx, y * sy] for x, y in value]
+        elif axis == "ksize":
+            if name in ("erode", "dilate", "morphology") and params.get("shape") == "custom":
+                continue
+            scaled[key] = _scale_ksize(value, ratio)
+        elif axis == "length":
+            scaled[key] = int(round(value * ratio))
+        elif axis == "votes":
+            if params.get("mode", "standard") != "circles":
+                scaled[key] = max(1, int(round(value * ratio)))
+        elif name == "crop":
+            scaled[key] = int(round(value * (sx if axis == "x" else sy)))
+        else:
+            scaled[key] = value * (sx if axis == "x" else sy)
+    return scaled
+
+
+class Recipe:
+    def __init__(self, steps=None):
+        # Her adım: {"op": isim, "params": {...}, "size": [yükseklik, genişlik]}
+        self.steps = list(steps or [])
+
+    def __len__(self):
+        return len(self.steps)
+
+    def add(self, name, image_shape=None, **params):
+        step = {"op": name, "params": params}
+        if image_shape is not None:
+            step["size"] = [int(image_shape[0]), int(image_shape[1])]
+        self.steps.append(step)
+
+    def clear(self):
+        self.steps.clear()
+
+    def to_dict(self):
+        return {"version": RECIPE_VERSION, "steps": self.steps}
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    @classmethod
+    def from_dict(cls, data):
+        import operations
+        if data.get("version", RECIPE_VERSION) > RECIPE_VERSION:
+            raise ValueError(f"Desteklenmeyen tarif sürümü: {data['version']}")
+        steps = data.get("steps", [])
+        for step in steps:
+            if step.get("op") not in operations.OPERATIONS:
+                raise ValueError(f"Bilinmeyen işlem: {step.get('op')}")
+        return cls(steps)
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_json(f.read())
+
+    def is_gray(self, gray_input=False):
+        # Tarifin sonucu kesin gri mi (gray_input: başlangıç görüntüsü gri mi)
+        import operations
+        gray = gray_input
+        for step in self.steps:
+            gray = operations.output_is_gray(step["op"], step["params"], gray)
+        return gray
+
+    def replay(self, image, should_stop=None):
+        # Tarifi uygular; (sonuç, [(işlem, süre_sn), ...]) döndürür.
+        # should_stop True döndürürse adımlar arasında iptal edilir.
+        # Ardışık nokta işlemleri tek tabloda birleştirilip tek geçişte
+        # uygulanır; süreleri "parlaklık+kontrast" gibi tek satırda raporlanır.
+        import operations
+        import point_ops
+        timings = []
+        steps = self.steps
+        i = 0
+        while i < len(steps):
+            if should_stop is not None and should_stop():
+                raise operations.OperationCancelled()
+            start = time.perf_counter()
+            j = i
+            while j < len(steps) and steps[j]["op"] in point_ops.POINT_OPERATIONS:
+                j += 1
+            if j > i:
+                chain = [(step["op"], step["params"]) for step in steps[i:j]]
+                image = point_ops.apply_chain(image, chain)
+                name = "+".join(op for op, _ in chain)
+                i = j
+            else:
+                name = steps[i]["op"]
+                params = _scale_params(name, steps[i]["params"], steps[i].get("size"),
+                                       image.shape)
+                image = operations.apply(image, name, **params)
+                i += 1
+            timings.append((name, time.perf_counter() - start))
+        return image, timings
+
+
+def format_timings(timings):
+    lines = [f"{i + 1:2d}. {name:<20} {elapsed * 1000:8.1f} ms"
+             for i, (name, elapsed) in enumerate(timings)]
+    lines.append(f"    {'toplam':<20} {sum(t for _, t in timings) * 1000:8.1f} ms")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    from image_io import read_image, write_image
+
+    if len(sys.argv) != 4:
+        print("Kullanım: python recipe.py tarif.json girdi cikti", file=sys.stderr)
+        sys.exit(2)
+    recipe = Recipe.load(sys.argv[1])
+    result, timings = recipe.replay(read_image(sys.argv[2]))
+    write_image(sys.argv[3], result, gray=recipe.is_gray(), owned=True)
+    print(format_timings(timings))
@@ -0,0 +1,168 @@
+# Ölçeklenebilir k-means renk segmentasyonu
+#
+# Merkezler tüm pikseller yerine tohumlu rastgele bir piksel örneği üzerinde
+# k-means++ başlangıcı ve Lloyd yinelemeleriyle bulunur; aynı tohum her
+# zaman aynı renkleri verir. Piksellerin kümelere atanması piksel başına
+# uzaklık hesabıyla değil, nicemlenmiş renk küpü tablosuyla yapılır: her
+# kanalın üst CUBE_BITS biti bir küp hücresini seçer, hücre merkezine en
+# yakın küme önceden hesaplanır ve tüm görüntü tek bir tablo okumasıyla
+# etiketlenir. Atamanın maliyeti böylece K'den bağımsızdır.
+#
+# warm_start ile aynı süreçte aynı K için bulunan son merkezlerden
+# başlanır; benzer görüntülerden oluşan toplu işlerde yinelemeler kısalır
+# ve kümelerin renkleri görüntüler arasında tutarlı kalır.
+import cv2
+import numpy as np
+
+# Merkezlerin bulunduğu örnek piksel sayısı
+SAMPLE_SIZE = 100_000
+# Kanal başına küp biti (5 bit: 32x32x32 hücre)
+CUBE_BITS = 5
+MAX_ITERATIONS = 50
+# Merkezler bundan az kayınca (renk birimi) yineleme durur
+TOLERANCE = 0.5
+
+# K -> aynı süreçte bulunan son merkezler (warm_start için)
+_last_centers = {}
+
+
+class Segmentation:
+    # Segmentasyon sonucu: boyanmış görüntü, etiket haritası ve küme
+    # istatistikleri. Kümeler parlaklığa göre sıralıdır (0 en koyu).
+    def __init__(self, image, labels, centers, counts, iterations):
+        self.image = image
+        self.labels = labels
+        self.centers = centers
+        self.counts = counts
+        self.iterations = iterations
+
+    def stats(self):
+        # Küme başına renk, piksel sayısı ve oran
+        total = max(1, int(self.counts.sum()))
+        return [{"label": i, "color": tuple(int(c) for c in center),
+                 "pixels": int(count), "ratio": float(count) / total}
+                for i, (center, count) in enumerate(zip(self.centers, self.counts))]
+
+    def label_image(self):
+        # Etiketleri 0-255 aralığına yayılmış gri RGB görüntü olarak
+        scale = 255 // max(1, len(self.centers) - 1)
+        gray = self.labels * np.uint8(scale)
+        return cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
+
+
+def _sample(pixels, size, rng):
+    if len(pixels) <= size:
+        return pixels.astype(np.float32)
+    return pixels[rng.integers(0, len(pixels), size)].astype(np.float32)
+
+
+def _squared_distances(points, centers):
+    # (n, k) kare uzaklıklar: |x|^2 - 2 x.c + |c|^2
+    distances = points @ (-2 * centers.T)
+    distances += np.einsum("ij,ij->i", points, points)[:, None]
+    distances += np.einsum("ij,ij->i", centers, centers)[None, :]
+    return distances
+
+
+def _kmeans_plus_plus(points, k, rng):
+    centers = [points[rng.integers(len(points))]]
+    closest = _squared_distances(points, centers[0][None]).ravel()
+    for _ in range(1, k):
+        total = closest.sum()
+        if total <= 0:
+            # Örnekte k'den az farklı renk var
+            index = rng.integers(len(points))
+        else:
+            index = np.searchsorted(np.cumsum(closest), rng.random() * total)
+            index = min(index, len(points) - 1)
+        centers.append(points[index])
+        np.minimum(closest, _squared_distances(points, points[index][None]).ravel(), out=closest)
+    return np.array(centers, np.float32)
+
+
+def _lloyd(points, centers, max_iterations=MAX_ITERATIONS, tolerance=TOLERANCE):
+    # (merkezler, atalet, yineleme sayısı)
+    k = len(centers)
+    for iteration in range(1, max_iterations + 1):
+        distances = _squared_distances(points, centers)
+        labels = distances.argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.stack([np.bincount(labels, points[:, c], minlength=k) for c in range(3)], axis=1)
+        updated = centers.copy()
+        filled = counts > 0
+        updated[filled] = sums[filled] / counts[filled, None]
+        if not filled.all():
+            # Boş kalan kümeyi merkezine en uzak örneğe taşı
+            farthest = distances[np.arange(len(points)), labels].argsort()[::-1]
+            updated[~filled] = points[farthest[:np.count_nonzero(~filled)]]
+        shift = np.abs(updated - centers).max()
+        centers = updated
+        if shift < tolerance:
+            break
+    inertia = _squared_distances(points, centers).min(axis=1).sum()
+    return centers, inertia, iteration
+
+
+def fit(pixels, k=4, seed=0, attempts=3, sample_size=SAMPLE_SIZE, init=None):
+    # (N, 3) piksellerden (k, 3) float32 merkezler ve yineleme sayısı.
+    # init verilirse tek deneme o merkezlerden başlar.
+    if k < 1:
+        raise ValueError("Küme sayısı en az 1 olmalı")
+    rng = np.random.default_rng(seed)
+    points = _sample(pixels, sample_size, rng)
+    if init is not None:
+        centers, _, iterations = _lloyd(points, np.asarray(init, np.float32).copy())
+    else:
+        best = None
+        iterations = 0
+        for _ in range(max(1, attempts)):
+            result = _lloyd(points, _kmeans_plus_plus(points, k, rng))
+            iterations += result[2]
+            if best is None or result[1] < best[1]:
+                best = result
+        centers = best[0]
+    # Kümeleri parlaklığa göre sırala: etiketler ve renkler tekrarlanabilir olsun
+    order = np.argsort(centers @ np.array([0.299, 0.587, 0.114], np.float32), kind="stable")
+    return centers[order], iterations
+
+
+def cube_index(image, bits=CUBE_BITS):
+    # Her piksel için renk küpü hücresinin indisi (uint16/uint32)
+    shift = 8 - bits
+    dtype = np.uint16 if 3 * bits <= 16 else np.uint32
+    q = image >> shift
+    index = q[..., 0].astype(dtype) << (2 * bits)
+    index |= q[..., 1].astype(dtype) << bits
+    index |= q[..., 2]
+    return index
+
+
+def cube_table(centers, bits=CUBE_BITS):
+    # Küp hücresi -> hücre merkezine en yakın kümenin etiketi
+    levels = (np.arange(1 << bits, dtype=np.float32) + 0.5) * (1 << (8 - bits))
+    r, g, b = np.meshgrid(levels, levels, levels, indexing="ij")
+    cells = np.stack([r.ravel(), g.ravel(), b.ravel()], axis=1)
+    return _squared_distances(cells, centers.astype(np.float32)).argmin(axis=1).astype(np.uint8)
+
+
+def segment(image, k=4, seed=0, attempts=3, sample_size=SAMPLE_SIZE, warm_start=False,
+            bits=CUBE_BITS):
+    # RGB uint8 görüntüyü k renge ayırır; Segmentation döndürür
+    if not 1 <= k <= 256:
+        raise ValueError("Küme sayısı 1 ile 256 arasında olmalı")
+    pixels = image.reshape(-1, 3)
+    init = _last_centers.get(k) if warm_start else None
+    centers, iterations = fit(pixels, k, seed, attempts, sample_size, init)
+    if warm_start:
+        _last_centers[k] = centers
+
+    labels = np.take(cube_table(centers, bits), cube_index(image, bits))
+    counts = cv2.calcHist([labels], [0], None, [k], [0, k]).ravel().astype(np.int64)
+    palette = np.zeros((256, 1, 3), np.uint8)
+    palette[:k, 0] = np.clip(np.rint(centers), 0, 255)
+    recoloured = cv2.LUT(cv2.merge([labels, labels, labels]), palette)
+    return Segmentation(recoloured, labels, palette[:k, 0].copy(), counts, iterations)
+
+
+def reset_warm_start():
+    _last_centers.clear()
@@ -0,0 +1,70 @@
+# Her boyutta yumuşatma filtreleri
+#
+# Büyük taramalarda 25-100 piksel yarıçaplı filtreler gerekir; yoğun bir
+# çekirdekle evrişimin maliyeti yarıçapın karesiyle artar. Buradaki filtrelerin
+# piksel başına maliyeti yarıçaptan bağımsızdır:
+#   - ortalama (kutu): OpenCV'nin kayan toplamlı cv2.blur'u; her piksel için
+#     satırda ve sütunda birer ekleme/çıkarma yapılır,
+#   - medyan: 8 bitlik görüntülerde OpenCV büyük pencerelerde sütun
+#     histogramlarıyla sabit zamanlı algoritmayı (Perreault-Hébert) kullanır,
+#   - Gauss: küçük çekirdeklerde tam çekirdek convolution.convolve ile (rank-1
+#     olduğundan genellikle ayrıştırılmış yoldan); büyüklerde aynı varyansı
+#     veren üç ardışık kutu filtresi. Sonuç tam Gauss'tan en fazla birkaç gri
+#     düzeyi (keskin kenarlarda r=100'de 5) farklıdır.
+import math
+
+import cv2
+
+import convolution
+
+# Bu boyuttan itibaren Gauss filtresi kutu filtreleriyle yaklaşıklanır
+GAUSSIAN_BOX_MIN_SIZE = 31
+GAUSSIAN_BOX_PASSES = 3
+
+
+def _check_ksize(ksize):
+    if ksize < 1 or ksize % 2 == 0:
+        raise ValueError("Çekirdek boyutu pozitif tek sayı olmalı")
+
+
+def gaussian_sigma(ksize):
+    # cv2.GaussianBlur'un sigma=0 için kullandığı değer
+    return 0.3 * ((ksize - 1) * 0.5 - 1) + 0.8
+
+
+def box_widths(sigma, passes=GAUSSIAN_BOX_PASSES):
+    # Ardışık uygulandığında varyansları toplamı sigma^2 olan tek genişlikli
+    # kutular (Kovesi): önce daha dar olanlar, sonra iki piksel geniş olanlar
+    ideal = math.sqrt(12 * sigma * sigma / passes + 1)
+    narrow = max(1, int(ideal))
+    if narrow % 2 == 0:
+        narrow -= 1
+    wide = narrow + 2
+    count = round((12 * sigma * sigma - passes * narrow * narrow - 4 * passes * narrow
+                   - 3 * passes) / (-4 * narrow - 4))
+    return [narrow if i < count else wide for i in range(passes)]
+
+
+def box(image, ksize=3):
+    _check_ksize(ksize)
+    return cv2.blur(image, (ksize, ksize))
+
+
+def median(image, ksize=3):
+    _check_ksize(ksize)
+    return cv2.medianBlur(image, ksize)
+
+
+def gaussian(image, ksize=3, sigma=0, approximate=None):
+    # approximate: None ise çekirdek boyutuna göre seçilir,
+    # True/False karşılaştırma (benchmark) içindir
+    _check_ksize(ksize)
+    if approximate is None:
+        approximate = ksize >= GAUSSIAN_BOX_MIN_SIZE
+    if not approximate:
+        vector = cv2.getGaussianKernel(ksize, sigma, cv2.CV_32F)
+        return convolution.convolve(image, vector @ vector.T, label="gauss")
+    result = image
+    for width in box_widths(sigma or gaussian_sigma(ksize)):
+        result = cv2.blur(result, (width, width))
+    return result
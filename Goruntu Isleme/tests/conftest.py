@@ -0,0 +1,54 @@
+# Testler ekransız (offscreen) Qt ile ve uygulama klasörü içe aktarma
+# yolundayken çalışır
+import importlib.util
+import os
+import sys
+
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(APP_DIR, "goruntu isleme odev.py")
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    spec = importlib.util.spec_from_file_location("goruntu_isleme_odev", APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def qapp(app_module):
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def messages(monkeypatch):
+    # Kalıcı (modal) iletiler testi bekletmesin; metinleri toplanır
+    from PyQt6.QtWidgets import QMessageBox
+    shown = []
+    for name in ("information", "warning", "critical"):
+        monkeypatch.setattr(QMessageBox, name, staticmethod(
+            lambda parent, title, text, *args, **kwargs: shown.append(text)))
+    return shown
+
+
+@pytest.fixture
+def lazy_window(app_module, qapp, messages):
+    # Yalnızca ilk sekmesi kurulmuş pencere (uygulamanın açılıştaki hâli)
+    w = app_module.ImageProcessor()
+    yield w
+    w.runner.wait()
+    w.close()
+
+
+@pytest.fixture
+def window(lazy_window):
+    lazy_window.build_all_tabs()
+    return lazy_window
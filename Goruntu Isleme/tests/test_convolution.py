@@ -0,0 +1,53 @@
+# Evrişim maliyet modelinin kaydı ve ölçüm yapılmayan süreçlerdeki davranışı
+import json
+import os
+
+import pytest
+
+import batch
+import convolution
+
+
+@pytest.fixture
+def fresh_model(monkeypatch):
+    # Her test modeli sıfırdan arar; ölçüm yapılırsa test başarısız olur
+    monkeypatch.setattr(convolution, "_model", None)
+    monkeypatch.setattr(convolution, "CALIBRATE", True)
+
+    def no_calibration(*args, **kwargs):
+        raise AssertionError("ölçüm yapılmamalıydı")
+    monkeypatch.setattr(convolution, "calibrate", no_calibration)
+
+
+def test_save_is_atomic(tmp_path):
+    path = tmp_path / "model" / "convolution.json"
+    convolution._save(convolution.STATIC_MODEL, str(path))
+    assert json.loads(path.read_text(encoding="utf-8")) == convolution.STATIC_MODEL
+    assert os.listdir(path.parent) == ["convolution.json"]
+
+
+def test_static_model_without_calibration(fresh_model, tmp_path, monkeypatch):
+    monkeypatch.setattr(convolution, "CALIBRATE", False)
+    path = tmp_path / "convolution.json"
+    assert convolution.model(str(path)) is convolution.STATIC_MODEL
+    assert not path.exists()
+
+
+def test_saved_model_is_reused(fresh_model, tmp_path):
+    path = tmp_path / "convolution.json"
+    data = dict(convolution.STATIC_MODEL, machine=convolution._machine_key())
+    convolution._save(data, str(path))
+    assert convolution.model(str(path)) == data
+
+
+def test_worker_uses_parent_model(fresh_model, monkeypatch):
+    import frequency
+    monkeypatch.setattr(frequency, "FFT_WORKERS", frequency.FFT_WORKERS)
+    data = dict(convolution.STATIC_MODEL, machine="ana süreç")
+    batch._init_worker(data)
+    try:
+        assert convolution.CALIBRATE is False
+        assert convolution.model() is data
+    finally:
+        import cv2
+        cv2.setNumThreads(-1)
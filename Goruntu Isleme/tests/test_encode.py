@@ -0,0 +1,72 @@
+# Kaydetme: gri olup olmadığı işlemlerden bilinir, görüntü taranmaz
+import cv2
+import numpy as np
+import pytest
+
+import image_io
+import operations
+from recipe import Recipe
+
+# Zorunlu parametresi olan işlemler
+PARAMS = {
+    "crop": {"x1": 10, "y1": 5, "x2": 70, "y2": 50},
+    "perspective": {"points": [[0, 0], [79, 2], [77, 59], [3, 57]]},
+}
+
+
+def sample_image(gray):
+    rng = np.random.default_rng(0)
+    small = rng.integers(0, 256, (6, 8, 3), dtype=np.uint8)
+    image = cv2.resize(small, (80, 60), interpolation=cv2.INTER_CUBIC)
+    if gray:
+        image = cv2.cvtColor(cv2.cvtColor(image, cv2.COLOR_RGB2GRAY), cv2.COLOR_GRAY2RGB)
+    return image
+
+
+def channels_equal(image):
+    return (np.array_equal(image[:, :, 0], image[:, :, 1])
+            and np.array_equal(image[:, :, 0], image[:, :, 2]))
+
+
+# Sonucunun gri olduğu iddia edilen (işlem, girdi gri mi) çiftleri
+GRAY_CLAIMS = [(name, gray_input) for name in sorted(operations.OPERATIONS)
+               for gray_input in (False, True)
+               if operations.output_is_gray(name, PARAMS.get(name, {}), gray_input)]
+
+
+@pytest.mark.parametrize("name, gray_input", GRAY_CLAIMS)
+def test_gray_claims_hold(name, gray_input):
+    # Gri denilen sonuç gerçekten gri olmalı; yoksa kaydederken renk kaybolur
+    params = PARAMS.get(name, {})
+    result = operations.apply(sample_image(gray_input), name, **params)
+    assert channels_equal(result)
+
+
+def test_recipe_gray_tracking():
+    recipe = Recipe()
+    recipe.add("gaussian_filter", ksize=5)
+    assert not recipe.is_gray()
+    assert recipe.is_gray(gray_input=True)
+    recipe.add("sobel")
+    assert recipe.is_gray()
+    recipe.add("hough")
+    assert not recipe.is_gray()
+
+
+@pytest.mark.parametrize("owned", [False, True])
+def test_encode_colour(tmp_path, owned):
+    image = sample_image(False)
+    original = image.copy()
+    path = str(tmp_path / "renkli.png")
+    encoded = image_io.encode(path, image, owned=owned)
+    assert encoded.channels == 3
+    assert np.array_equal(image_io.read_image(path), original)
+    if not owned:
+        assert np.array_equal(image, original)
+
+
+def test_encode_gray(tmp_path):
+    image = sample_image(True)
+    path = str(tmp_path / "gri.png")
+    assert image_io.encode(path, image, gray=True).channels == 1
+    assert np.array_equal(image_io.read_image(path), image)
@@ -0,0 +1,48 @@
+# Geri al / yinele: adımlar görüntüyü yeniden karşılaştırmadan tersine çevrilir
+import numpy as np
+import pytest
+
+import history
+import operations
+from history import History
+
+
+def _image():
+    return np.random.default_rng(0).integers(0, 256, (60, 80, 3), dtype=np.uint8)
+
+
+def _edit(image):
+    edited = image.copy()
+    edited[10:20, 30:45] = 0
+    return edited
+
+
+@pytest.mark.parametrize("name, after", [
+    ("fill", _edit),
+    ("crop", lambda image: operations.crop(image, 5, 5, 50, 40)),
+])
+def test_undo_redo_without_diff(monkeypatch, name, after):
+    before = _image()
+    result = after(before)
+    stack = History()
+    stack.push(name, before, result)
+
+    def no_diff(*args, **kwargs):
+        raise AssertionError("geri almada görüntü yeniden karşılaştırılmamalı")
+    monkeypatch.setattr(history, "make_delta", no_diff)
+
+    for _ in range(3):
+        undone, _ = stack.undo(result)
+        assert np.array_equal(undone, before)
+        redone, _ = stack.redo(undone)
+        assert np.array_equal(redone, result)
+
+
+def test_reverse_patch_stays_in_box():
+    before = _image()
+    result = _edit(before)
+    stack = History()
+    stack.push("fill", before, result)
+    stack.undo(result)
+    # Yineleme farkı yalnızca değişen kutuyu tutar
+    assert stack.memory_bytes() == 10 * 15 * 3
@@ -0,0 +1,22 @@
+# Sekmeler ilk açıldıklarında kurulur; bir sekmenin işlemleri diğer
+# sekmeler hiç açılmamışken de çalışmalı
+import numpy as np
+import pytest
+
+ADVANCED_TAB = 9
+
+
+@pytest.mark.parametrize("handler", ["apply_gaussian_lpf", "apply_gaussian_hpf"])
+def test_advanced_tab_alone(lazy_window, qapp, messages, handler):
+    image = np.random.default_rng(0).integers(0, 256, (120, 160, 3), dtype=np.uint8)
+    lazy_window.original_image = image
+    lazy_window.processed_image = image.copy()
+    lazy_window.tab_widget.setCurrentIndex(ADVANCED_TAB)
+    assert set(lazy_window.tab_builders) == set(range(1, ADVANCED_TAB))
+
+    getattr(lazy_window, handler)()
+    lazy_window.runner.wait()
+    qapp.processEvents()
+
+    assert messages == []
+    assert lazy_window.recipe.steps[-1]["op"] == handler[len("apply_"):]
@@ -0,0 +1,28 @@
+# Yükleme: dosya işçide bir kez okunur, önizleme de aynı baytlardan çözülür
+import threading
+
+import cv2
+import numpy as np
+
+import image_io
+
+
+def test_preview_decoded_in_worker_from_one_read(window, qapp, tmp_path, monkeypatch):
+    small = np.random.default_rng(0).integers(0, 256, (30, 40, 3), dtype=np.uint8)
+    path = str(tmp_path / "buyuk.jpg")
+    cv2.imwrite(path, cv2.resize(small, (2400, 1800), interpolation=cv2.INTER_CUBIC))
+    # Her okumada arayüz iş parçacığında mı okunduğu
+    reads = []
+    read = image_io._read
+    monkeypatch.setattr(image_io, "_read", lambda p: reads.append(
+        threading.current_thread() is threading.main_thread()) or read(p))
+
+    window.start_loading(path, False, False)
+    while window.loader.is_busy():
+        window.loader.wait()
+        qapp.processEvents()
+
+    assert reads == [False]
+    assert window.original_image.shape == (1800, 2400, 3)
+    # Önizleme gösterildiyse süresi durum çubuğuna eklenir
+    assert "önizleme" in window.status_label.text()
@@ -0,0 +1,77 @@
+import cv2
+import numpy as np
+import pytest
+
+from recipe import Recipe, _scale_params
+
+
+def _photo(shape, seed=0):
+    # Düzgün bölgeler ve kenarlar içeren sentetik görüntü
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 256, (48, 64, 3), dtype=np.uint8)
+    return cv2.resize(small, (shape[1], shape[0]), interpolation=cv2.INTER_NEAREST)
+
+
+def _replay_on_proxy_and_full(op, params, factor=4):
+    full = _photo((960, 1280))
+    proxy = cv2.resize(full, None, fx=1 / factor, fy=1 / factor, interpolation=cv2.INTER_AREA)
+    recipe = Recipe()
+    recipe.add(op, proxy.shape, **params)
+    on_proxy, _ = recipe.replay(proxy)
+    on_full, _ = recipe.replay(full)
+    reduced = cv2.resize(on_full, (proxy.shape[1], proxy.shape[0]), interpolation=cv2.INTER_AREA)
+    return on_proxy.astype(np.float32), reduced.astype(np.float32)
+
+
+@pytest.mark.parametrize("ksize, ratio, expected", [
+    (3, 4, 13), (5, 4, 21), (7, 2, 13), (9, 0.25, 3), (3, 0.5, 3), (1, 4, 1),
+])
+def test_ksize_scaled_to_odd(ksize, ratio, expected):
+    scaled = _scale_params("median_filter", {"ksize": ksize}, [100, 100],
+                           (int(100 * ratio), int(100 * ratio)))
+    assert scaled["ksize"] == expected
+    assert scaled["ksize"] % 2 == 1
+
+
+def test_custom_structuring_element_left_unscaled():
+    params = {"op": "open", "shape": "custom", "ksize": 3, "kernel": "010;111;010"}
+    assert _scale_params("morphology", params, [100, 100], (400, 400)) == params
+
+
+def test_hough_lengths_and_line_votes_scaled():
+    params = {"mode": "probabilistic", "threshold": 30, "min_length": 20, "max_gap": 5,
+              "canny_low": 50, "canny_high": 150}
+    scaled = _scale_params("hough", params, [250, 250], (1000, 1000))
+    assert (scaled["threshold"], scaled["min_length"], scaled["max_gap"]) == (120, 80, 20)
+    assert (scaled["canny_low"], scaled["canny_high"]) == (50, 150)
+
+
+def _difference(op, params):
+    on_proxy, reduced = _replay_on_proxy_and_full(op, params)
+    return np.abs(on_proxy - reduced).mean()
+
+
+@pytest.mark.parametrize("op, params", [
+    ("average_filter", {"ksize": 7}),
+    ("median_filter", {"ksize": 7}),
+    ("gaussian_filter", {"ksize": 7}),
+    ("morphology", {"op": "open", "ksize": 7}),
+])
+def test_proxy_preview_matches_full_resolution(monkeypatch, op, params):
+    # Önizlemede ayarlanan çekirdek tam çözünürlükte ölçeklenmeden
+    # uygulanırsa etkisi dört kat küçük kalır
+    scaled = _difference(op, params)
+    monkeypatch.setattr("recipe._scale_params", lambda name, params, size, shape: params)
+    unscaled = _difference(op, params)
+    assert scaled < 8.0
+    assert scaled < 0.5 * unscaled
+
+
+def test_frequency_cutoff_is_resolution_independent(monkeypatch):
+    # Kesme frekansları görüntü başına devir cinsindedir; doğrusal oranla
+    # ölçeklemek önizlemeden uzaklaştırır
+    assert _scale_params("gaussian_lpf", {"sigma": 10}, [240, 320], (960, 1280)) == {"sigma": 10}
+    unscaled = _difference("gaussian_lpf", {"sigma": 10})
+    monkeypatch.setattr("recipe._scale_params", lambda name, params, size, shape: {"sigma": 40})
+    assert unscaled < 1.0
+    assert unscaled < 0.5 * _difference("gaussian_lpf", {"sigma": 10})
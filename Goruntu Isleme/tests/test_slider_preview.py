@@ -0,0 +1,56 @@
+import time
+
+import numpy as np
+import pytest
+
+
+def wait(qapp, milliseconds):
+    end = time.perf_counter() + milliseconds / 1000
+    while time.perf_counter() < end:
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+@pytest.mark.parametrize("name", ["brightness", "contrast", "threshold"])
+def test_drag_commits_once(window, qapp, app_module, monkeypatch, name):
+    image = np.random.default_rng(0).integers(0, 256, (600, 800, 3), dtype=np.uint8)
+    window.original_image = image
+    window.processed_image = image.copy()
+    submitted = []
+    submit = window.runner.submit
+    monkeypatch.setattr(window.runner, "submit",
+                        lambda label, *args, **kwargs: submitted.append(label)
+                        or submit(label, *args, **kwargs))
+    slider = window.slider_operations[name][0]
+
+    slider.setSliderDown(True)
+    for value in range(slider.value() + 1, slider.value() + 30):
+        slider.setValue(value)
+        qapp.processEvents()
+    assert submitted == []
+    # Bırakırken önizleme zamanlayıcısı hâlâ bekliyor olabilir
+    slider.setValue(slider.value() + 1)
+    slider.setSliderDown(False)
+    wait(qapp, 5 * app_module.PREVIEW_INTERVAL_MS)
+    window.runner.wait()
+    qapp.processEvents()
+
+    assert submitted == [name]
+    assert window.recipe.steps[-1]["params"]["value"] == slider.value()
+
+
+def test_keyboard_change_commits_once(window, qapp, app_module, monkeypatch):
+    image = np.full((200, 300, 3), 100, np.uint8)
+    window.original_image = image
+    window.processed_image = image.copy()
+    submitted = []
+    submit = window.runner.submit
+    monkeypatch.setattr(window.runner, "submit",
+                        lambda label, *args, **kwargs: submitted.append(label)
+                        or submit(label, *args, **kwargs))
+    for value in (5, 10, 15):
+        window.brightness_slider.setValue(value)
+    wait(qapp, 5 * app_module.PREVIEW_INTERVAL_MS)
+    window.runner.wait()
+    qapp.processEvents()
+    assert submitted == ["brightness"]
@@ -0,0 +1,36 @@
+# Açılış bütçesi: uygulama ayrı bir süreçte --startup-report ile açılır
+import os
+import re
+import subprocess
+import sys
+
+from benchmarks import STARTUP_LIMIT_MS
+from conftest import APP_DIR, APP_PATH
+
+
+def startup_report():
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run(
+        [sys.executable, APP_PATH, "--startup-report"], cwd=APP_DIR, env=env,
+        capture_output=True, text=True, encoding="utf-8", timeout=60, check=True)
+    return result.stdout
+
+
+def test_startup_within_limit():
+    # Soğuk önbellek ya da meşgul makine tek ölçümü şişirebilir; en iyisi alınır
+    totals = []
+    for _ in range(3):
+        report = startup_report()
+        match = re.search(r"ilk pencere \(toplam\)\s+([\d.]+) ms", report)
+        assert match is not None, report
+        totals.append(float(match.group(1)))
+        if totals[-1] <= STARTUP_LIMIT_MS:
+            break
+    assert min(totals) <= STARTUP_LIMIT_MS, report
+
+
+def test_heavy_modules_not_loaded_before_first_tab():
+    report = startup_report()
+    match = re.search(r"ilk sekme öncesi yüklü\s+(.+)", report)
+    assert match is not None, report
+    assert match.group(1).strip() == "yok", report
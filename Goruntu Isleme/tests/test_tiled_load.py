@@ -0,0 +1,65 @@
+# Döşemeli yükleme: uygun TIFF'ler bütün olarak çözülmeden diske aktarılır
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+import image_io
+import tiled
+
+CASES = {
+    "sıkıştırmasız": [cv2.IMWRITE_TIFF_COMPRESSION, 1, cv2.IMWRITE_TIFF_ROWSPERSTRIP, 37],
+    "deflate": [cv2.IMWRITE_TIFF_COMPRESSION, 8, cv2.IMWRITE_TIFF_PREDICTOR, 2,
+                cv2.IMWRITE_TIFF_ROWSPERSTRIP, 50],
+}
+
+
+def _photo():
+    rng = np.random.default_rng(0)
+    small = rng.integers(0, 256, (30, 40, 3), dtype=np.uint8)
+    return cv2.resize(small, (1000, 700), interpolation=cv2.INTER_CUBIC)
+
+
+@pytest.fixture
+def no_full_decode(monkeypatch):
+    def read_image(*args, **kwargs):
+        raise AssertionError("görüntü bütün olarak çözülmemeliydi")
+    monkeypatch.setattr(image_io, "read_image", read_image)
+
+
+def _strip_tiff(tmp_path, name, params):
+    path = str(tmp_path / f"{name}.tif")
+    image_io.write_image(path, _photo(), params)
+    return path
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_strips_streamed(tmp_path, name, no_full_decode):
+    path = _strip_tiff(tmp_path, name, CASES[name])
+    loaded = tiled.load(path)
+    assert isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, _photo())
+
+
+def test_gray_streamed(tmp_path, no_full_decode):
+    gray = cv2.cvtColor(_photo(), cv2.COLOR_RGB2GRAY)
+    path = str(tmp_path / "gri.tif")
+    cv2.imwrite(path, gray, [cv2.IMWRITE_TIFF_COMPRESSION, 1])
+    assert np.array_equal(tiled.load(path), cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB))
+
+
+def test_tiles_streamed(tmp_path, no_full_decode):
+    image = _photo()
+    path = str(tmp_path / "doseme.tif")
+    Image.fromarray(image).save(path, compression="tiff_adobe_deflate",
+                                tiffinfo={322: 256, 323: 256})
+    assert len(tiled._tiff_layout(path)[5]) > 1
+    assert np.array_equal(tiled.load(path), image)
+
+
+def test_too_large_refused(tmp_path, monkeypatch, no_full_decode):
+    # LZW parça parça okunamaz; bellek sınırını aşarsa yüklenmez
+    path = _strip_tiff(tmp_path, "lzw", [cv2.IMWRITE_TIFF_COMPRESSION, 5])
+    monkeypatch.setattr(tiled, "DECODE_LIMIT_BYTES", 1024**2)
+    with pytest.raises(ValueError, match="büyük"):
+        tiled.load(path)
@@ -0,0 +1,286 @@
+# Belleğe sığmayan görüntüler için döşemeli (tiled) işleme
+#
+# Görüntüler geçici klasördeki .npy dosyalarına bellek eşlemeli (memmap)
+# dizilerle tutulur. Komşuluk işlemleri görüntüyü TILE_SIZE boyutunda
+# döşemelere bölerek çalışır; her döşeme çekirdek yarıçapı kadar bir kenar
+# payıyla (halo) okunur ve yalnızca iç kısmı sonuca yazılır. Böylece döşeme
+# sınırlarında dikiş oluşmaz ve görüntü kenarında OpenCV'nin kendi kenar
+# davranışı korunur. Sonuç doğrudan diske yazılır; en yüksek bellek kullanımı
+# döşeme boyutuyla sınırlıdır.
+#
+# Yükleme: sıkıştırmasız ya da Deflate (zlib) sıkıştırmalı, şerit (strip) ya
+# da döşeme düzenindeki 8 bitlik TIFF'ler parça parça çözülüp doğrudan diske
+# yazılır; bellek kullanımı tek bir şerit/döşeme kadardır. Diğer dosyalar
+# (LZW/JPEG TIFF, PNG, JPEG...) bütün olarak çözülmek zorundadır; çözülmüş
+# boyutu DECODE_LIMIT_BYTES'ı aşanlar reddedilir.
+#
+# Normalize edilen kenar bulucular (Sobel, Prewitt...) iki geçişle çalışır:
+# önce ham yanıtlar diske yazılır ve global min/maks bulunur, sonra yanıtlar
+# döşeme döşeme 0-255 aralığına yayılır.
+import atexit
+import os
+import shutil
+import tempfile
+import warnings
+import weakref
+import zlib
+
+import cv2
+import numpy as np
+from numpy.lib.format import open_memmap
+
+import morph_ops
+import operations
+
+TILE_SIZE = 1024
+# Canny'nin histerezis adımı kenarları görüntü boyunca izleyebildiği için
+# yerel değildir; bu kenar payıyla döşeme sınırındaki farklar pratikte kaybolur
+CANNY_HALO = 16
+
+# İşlem -> parametrelerden kenar payı (piksel)
+HALOS = {
+    "average_filter": lambda ksize=3: ksize // 2,
+    "median_filter": lambda ksize=3: ksize // 2,
+    "gaussian_filter": lambda ksize=3: ksize // 2,
+    "conservative_filter": lambda ksize=3: ksize // 2,
+    "erode": lambda ksize=3, iterations=1, shape="rect", kernel=None:
+        morph_ops.halo("erode", shape, ksize, iterations, kernel),
+    "dilate": lambda ksize=3, iterations=1, shape="rect", kernel=None:
+        morph_ops.halo("dilate", shape, ksize, iterations, kernel),
+    "morphology": lambda op="open", shape="rect", ksize=3, iterations=1, kernel=None:
+        morph_ops.halo(op, shape, ksize, iterations, kernel),
+    "sobel": lambda: 1,
+    "prewitt": lambda: 1,
+    "roberts": lambda: 1,
+    "compass": lambda family="kirsch": 1,
+    "laplace": lambda: 1,
+    "gabor": lambda: 10,
+    "canny": lambda low=100, high=200: CANNY_HALO,
+}
+
+
+def _physical_memory():
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+# Bütün olarak çözülmesine izin verilen en büyük görüntü (bayt): fiziksel
+# belleğin yarısı, öğrenilemezse 2 GB
+DECODE_LIMIT_BYTES = (_physical_memory() or 4 * 1024**3) // 2
+
+# Parça parça okunabilen TIFF'ler: sıkıştırma kodu (1: yok, 8/32946: Deflate)
+# ve renk yorumu (1: gri, siyah sıfır; 2: RGB)
+_TIFF_COMPRESSIONS = {1: None, 8: zlib.decompress, 32946: zlib.decompress}
+_TIFF_PHOTOMETRICS = {1: (1,), 2: (3,)}
+
+_scratch_dir = None
+
+
+def scratch_directory():
+    global _scratch_dir
+    if _scratch_dir is None:
+        _scratch_dir = tempfile.mkdtemp(prefix="goruntu_isleme_")
+        atexit.register(shutil.rmtree, _scratch_dir, True)
+    return _scratch_dir
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        # Windows'ta eşlenmiş dosya hemen silinemeyebilir; çıkışta temizlenir
+        pass
+
+
+def create(shape, dtype=np.uint8):
+    # Geçici dosyaya eşlenmiş boş dizi; dizi serbest kalınca dosya silinir
+    fd, path = tempfile.mkstemp(suffix=".npy", dir=scratch_directory())
+    os.close(fd)
+    array = open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+    weakref.finalize(array, _remove, path)
+    return array
+
+
+def to_memmap(image):
+    out = create(image.shape, image.dtype)
+    for y0 in range(0, image.shape[0], TILE_SIZE):
+        out[y0:y0 + TILE_SIZE] = image[y0:y0 + TILE_SIZE]
+    return out
+
+
+def _tiff_layout(path):
+    # Parça parça okunabilen TIFF ise (genişlik, yükseklik, kanal, açma
+    # fonksiyonu, ön kestirim, [(y0, y1, x0, x1, parça_y, parça_x, konum,
+    # uzunluk), ...]); değilse None. Yalnızca ilk dizin (IFD) okunur; Pillow'un
+    # açılıştaki büyük görüntü (decompression bomb) denetimine takılmaz.
+    from PIL import TiffImagePlugin
+    try:
+        with open(path, "rb") as f:
+            header = f.read(8)
+            if not TiffImagePlugin._accept(header):
+                return None
+            directory = TiffImagePlugin.ImageFileDirectory_v2(header)
+            f.seek(directory.next)
+            directory.load(f)
+            tags = dict(directory)
+    except (OSError, ValueError, SyntaxError):
+        return None
+    width, height = tags.get(256), tags.get(257)
+    samples = tags.get(277, 1)
+    bits = tags.get(258, (8,))
+    bits = bits if isinstance(bits, tuple) else (bits,)
+    compression = tags.get(259, 1)
+    if (compression not in _TIFF_COMPRESSIONS or set(bits) != {8}
+            or samples not in _TIFF_PHOTOMETRICS.get(tags.get(262), ())
+            or tags.get(284, 1) != 1 or tags.get(274, 1) != 1
+            or tags.get(317, 1) not in (1, 2)):
+        return None
+    chunks = []
+    if 324 in tags:
+        tile_w, tile_h = tags[322], tags[323]
+        across = -(-width // tile_w)
+        for i, (offset, count) in enumerate(zip(tags[324], tags[325])):
+            y0, x0 = i // across * tile_h, i % across * tile_w
+            chunks.append((y0, min(y0 + tile_h, height), x0, min(x0 + tile_w, width),
+                           tile_h, tile_w, offset, count))
+    elif 273 in tags:
+        rows = min(tags.get(278, height), height)
+        for i, (offset, count) in enumerate(zip(tags[273], tags[279])):
+            y0 = i * rows
+            strip_h = min(rows, height - y0)
+            chunks.append((y0, y0 + strip_h, 0, width, strip_h, width, offset, count))
+    else:
+        return None
+    return width, height, samples, _TIFF_COMPRESSIONS[compression], tags.get(317, 1), chunks
+
+
+def _chunk_to_rgb(chunk, grayscale):
+    # Şerit/döşeme -> RGB uint8 (gri okumada OpenCV'nin çözücüsünden en fazla
+    # 1 gri düzeyi farklı olabilir)
+    if chunk.shape[2] == 1:
+        return cv2.cvtColor(chunk[:, :, 0], cv2.COLOR_GRAY2RGB)
+    if grayscale:
+        return cv2.cvtColor(cv2.cvtColor(chunk, cv2.COLOR_RGB2GRAY), cv2.COLOR_GRAY2RGB)
+    return chunk
+
+
+def _stream_tiff(path, layout, grayscale):
+    width, height, samples, decompress, predictor, chunks = layout
+    out = create((height, width, 3))
+    with open(path, "rb") as f:
+        for y0, y1, x0, x1, chunk_h, chunk_w, offset, count in chunks:
+            if y0 >= height:
+                break
+            f.seek(offset)
+            data = f.read(count)
+            if decompress is not None:
+                data = decompress(data)
+            chunk = np.frombuffer(data, np.uint8, chunk_h * chunk_w * samples)
+            chunk = chunk.reshape(chunk_h, chunk_w, samples)
+            if predictor == 2:
+                # Yatay fark kestirimi: her satır kanal kanal birikimli toplam
+                chunk = np.cumsum(chunk, axis=1, dtype=np.uint8)
+            out[y0:y1, x0:x1] = _chunk_to_rgb(chunk[:y1 - y0, :x1 - x0], grayscale)
+    return out
+
+
+def _decoded_size(path):
+    # Tam çözülmüş RGB görüntünün boyutu (bayt); öğrenilemezse None
+    from PIL import Image, UnidentifiedImageError
+    try:
+        # Yalnızca başlık okunur; büyük görüntü uyarısı burada anlamsız
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            with Image.open(path) as pil_image:
+                width, height = pil_image.size
+    except Image.DecompressionBombError:
+        # Pillow'un sınırının iki katından büyük; kesin olarak çok büyük
+        return float("inf")
+    except (OSError, UnidentifiedImageError):
+        return None
+    return width * height * 3
+
+
+def load(path, grayscale=False):
+    # .npy dosyaları doğrudan eşlenir. Uygun TIFF'ler parça parça diske
+    # aktarılır. Diğer biçimler bir kez bütün olarak çözülüp diske aktarılır
+    # (çözülen kopya hemen bırakılır); belleğe sığmayacak kadar büyükse hata.
+    if path.lower().endswith(".npy"):
+        image = np.load(path, mmap_mode="r")
+        if image.ndim != 3 or image.shape[2] != 3 or image.dtype != np.uint8:
+            raise ValueError("Döşemeli işleme için .npy dosyası (y, x, 3) uint8 olmalı")
+        return image
+    layout = _tiff_layout(path)
+    if layout is not None and all(c[4] * c[5] * 3 <= DECODE_LIMIT_BYTES for c in layout[5]):
+        return _stream_tiff(path, layout, grayscale)
+    size = _decoded_size(path)
+    if size is not None and size > DECODE_LIMIT_BYTES:
+        raise ValueError(
+            f"Görüntü bütün olarak çözülemeyecek kadar büyük (bellek sınırı "
+            f"{DECODE_LIMIT_BYTES / 1024**3:.1f} GB). Parça parça yalnızca sıkıştırmasız "
+            f"ya da Deflate sıkıştırmalı 8 bitlik TIFF'ler okunabilir; dosyayı bu "
+            f"biçime ya da .npy'ye dönüştürün.")
+    from image_io import read_image
+    return to_memmap(read_image(path, grayscale))
+
+
+def supports(name):
+    return name in HALOS
+
+
+def tiles(height, width, tile_size=TILE_SIZE):
+    for y0 in range(0, height, tile_size):
+        for x0 in range(0, width, tile_size):
+            yield y0, min(y0 + tile_size, height), x0, min(x0 + tile_size, width)
+
+
+def _map_tiles(image, halo, func, tile_size, should_stop):
+    # func(döşeme) her döşeme için kenar payıyla çağrılır; (konum, iç kısım)
+    # üretir. Görüntü kenarında pay kırpılır, OpenCV kendi kenar kuralını uygular.
+    height, width = image.shape[:2]
+    for y0, y1, x0, x1 in tiles(height, width, tile_size):
+        if should_stop is not None and should_stop():
+            raise operations.OperationCancelled()
+        ya, yb = max(0, y0 - halo), min(height, y1 + halo)
+        xa, xb = max(0, x0 - halo), min(width, x1 + halo)
+        result = func(np.ascontiguousarray(image[ya:yb, xa:xb]))
+        yield (y0, y1, x0, x1), result[y0 - ya:y1 - ya, x0 - xa:x1 - xa]
+
+
+def process(image, name, tile_size=TILE_SIZE, should_stop=None, **params):
+    # İşlemi döşeme döşeme uygular; sonuç diske eşlenmiş RGB uint8 dizidir
+    if not supports(name):
+        raise ValueError(f"Döşemeli işlemde desteklenmeyen işlem: {name}")
+    halo = HALOS[name](**params)
+    height, width = image.shape[:2]
+    out = create((height, width, 3))
+
+    response = operations.EDGE_RESPONSES.get(name)
+    if response is None:
+        for (y0, y1, x0, x1), tile in _map_tiles(
+                image, halo, lambda t: operations.apply(t, name, **params),
+                tile_size, should_stop):
+            out[y0:y1, x0:x1] = tile
+        return out
+
+    # 1. geçiş: ham yanıtlar ve global min/maks
+    raw = None
+    lo, hi = np.inf, -np.inf
+    for (y0, y1, x0, x1), tile in _map_tiles(
+            image, halo, lambda t: response(cv2.cvtColor(t, cv2.COLOR_RGB2GRAY), **params),
+            tile_size, should_stop):
+        if raw is None:
+            raw = create((height, width), tile.dtype)
+        raw[y0:y1, x0:x1] = tile
+        lo, hi = min(lo, tile.min()), max(hi, tile.max())
+
+    # 2. geçiş: cv2.normalize(NORM_MINMAX) ile aynı ölçekleme
+    scale = 255.0 / (hi - lo) if hi - lo > np.finfo(np.float64).eps else 0.0
+    shift = -lo * scale
+    for y0, y1, x0, x1 in tiles(height, width, tile_size):
+        tile = raw[y0:y1, x0:x1] * raw.dtype.type(scale) + raw.dtype.type(shift)
+        gray = tile.astype(np.uint8)
+        out[y0:y1, x0:x1] = gray[:, :, None]
+    return out
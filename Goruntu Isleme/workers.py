@@ -0,0 +1,132 @@
+# Arka planda işlem çalıştırma
+#
+# Uzun süren işlemler (k-means, Crimmins, homomorfik filtre...) arayüz
+# iş parçacığını dondurmasın diye bir iş parçacığı havuzunda çalıştırılır.
+# OpenCV ve NumPy hesaplama sırasında GIL'i bıraktığı için iş parçacıkları
+# yeterlidir ve büyük görüntüleri süreçler arasında kopyalamak gerekmez.
+#
+# Her istek artan bir nesil numarası alır. Sonuç arayüz iş parçacığına Qt
+# sinyaliyle iletilir ve yalnızca en son isteğe aitse kullanılır; yeni bir
+# istek ya da iptal, devam eden işin sonucunu geçersiz kılar. İş, bitmeden
+# önce ara sonuç (ör. yüklenen görüntünün önizlemesi) bildirebilir; ara
+# sonuçlar da aynı kuralla eskiyse yok sayılır.
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class Task:
+    def __init__(self, generation, label):
+        self.generation = generation
+        self.label = label
+        self.cancel_event = threading.Event()
+        self.future = None
+        self.on_done = None
+        self.on_error = None
+        self.on_progress = None
+
+    def should_stop(self):
+        return self.cancel_event.is_set()
+
+
+class OperationRunner(QObject):
+    # (görev, sonuç, süre_sn) / (görev, hata)
+    _finished = pyqtSignal(object, object, float)
+    _failed = pyqtSignal(object, object)
+    # (görev, ara sonuç)
+    _progress = pyqtSignal(object, object)
+    # Arayüz için durum bildirimleri
+    started = pyqtSignal(str)
+    idle = pyqtSignal(str)
+
+    def __init__(self, parent=None, max_workers=2):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="islem")
+        self._generation = 0
+        self._current = None
+        self._finished.connect(self._on_finished)
+        self._failed.connect(self._on_failed)
+        self._progress.connect(self._on_progress)
+
+    def is_busy(self):
+        return self._current is not None
+
+    def submit(self, label, func, *args, on_done=None, on_error=None,
+               cancellable=False, on_progress=None, **kwargs):
+        # func(*args, **kwargs) arka planda çalışır; cancellable ise fonksiyona
+        # adımlar arasında kontrol etmesi için should_stop verilir. on_progress
+        # verilirse fonksiyona report verilir; report(değer) arayüz iş
+        # parçacığında on_progress(değer) çağırır.
+        self.cancel()
+        self._generation += 1
+        task = Task(self._generation, label)
+        task.on_done = on_done
+        task.on_error = on_error
+        task.on_progress = on_progress
+        if cancellable:
+            kwargs["should_stop"] = task.should_stop
+        if on_progress is not None:
+            kwargs["report"] = lambda value: self._progress.emit(task, value)
+        self._current = task
+        task.future = self._executor.submit(self._run, task, func, args, kwargs)
+        self.started.emit(label)
+        return task
+
+    def _run(self, task, func, args, kwargs):
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self._failed.emit(task, e)
+        else:
+            self._finished.emit(task, result, time.perf_counter() - start)
+
+    def cancel(self):
+        # Başlamamış iş hiç çalışmaz; çalışan işin sonucu yok sayılır
+        task = self._current
+        if task is None:
+            return
+        task.cancel_event.set()
+        task.future.cancel()
+        self._current = None
+        self.idle.emit(f"{task.label} iptal edildi")
+
+    def _is_stale(self, task):
+        return task is not self._current or task.cancel_event.is_set()
+
+    def _on_finished(self, task, result, elapsed):
+        if self._is_stale(task):
+            return
+        self._current = None
+        self.idle.emit(f"{task.label}: {elapsed * 1000:.0f} ms")
+        if task.on_done is not None:
+            task.on_done(result)
+
+    def _on_progress(self, task, value):
+        if not self._is_stale(task):
+            task.on_progress(value)
+
+    def _on_failed(self, task, error):
+        from operations import OperationCancelled
+        if self._is_stale(task) or isinstance(error, OperationCancelled):
+            return
+        self._current = None
+        self.idle.emit(f"{task.label} başarısız")
+        if task.on_error is not None:
+            task.on_error(error)
+
+    def wait(self):
+        # Test ve kapanış için: çalışan işin bitmesini bekle
+        task = self._current
+        if task is not None and task.future is not None:
+            try:
+                task.future.result()
+            except Exception:
+                pass
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)